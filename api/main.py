@@ -1,25 +1,33 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
-from datetime import datetime, timezone
-import os, json, uuid
+from typing import Annotated, List
+import os, json, re, uuid, io, threading, zipfile
+
+from cachetools import TTLCache
+
+import pandas as pd
+import pyarrow as pa
+
+from api.metrics import METRICS, MetricsMiddleware
+from utils import cockpit
+from utils.answers import WIZARD_DEFAULTS, answers_hash, canonical_answers
+from utils.estimator import COST_MODEL, estimate_batch
+from utils.logreader import tail_events
+from utils.paths import LOG_DREAM, LOG_EVENTS, LOG_MILKBOT
+from utils.qr import FORMATS as QR_FORMATS, get_qr_cache, qr_available, render_qr
+from utils.lookup import lookup
+from utils.rollups import get_engine
 
 app = FastAPI(title="Dream Landing API", version="1.0")
+app.add_middleware(MetricsMiddleware, metrics=METRICS)
 
-LOG_PATH = "data/cockpit/dream_landing.jsonl"
-os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+LOG_PATH = LOG_DREAM
 
 
 def log_event(action: str, payload=None, user: str = "local-dev", session: str | None = None):
-    evt = {
-        "ts": datetime.now(timezone.utc).isoformat(),
-        "user": user,
-        "tool": "dream-landing",
-        "action": action,
-        "payload": payload or {},
-        "session": session or str(uuid.uuid4())
-    }
-    with open(LOG_PATH, "a", encoding="utf-8") as fh:
-        fh.write(json.dumps(evt, ensure_ascii=False) + "\n")
+    cockpit.log_event(LOG_PATH, action, payload, user=user, tool="dream-landing",
+                      session=session or str(uuid.uuid4()))
 
 
 class IdeaRequest(BaseModel):
@@ -27,11 +35,17 @@ class IdeaRequest(BaseModel):
 
 
 @app.get("/health")
-def health_check():
-    log_event("health_check", {"status": "ok"})
+async def health_check():
+    # polled by load balancers: answered from memory, no cockpit write
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Request counts, errors, in-flight and latency histograms (Prometheus text format)."""
+    return PlainTextResponse(METRICS.render() + _estimate_cache_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/spec")
 def generate_spec(req: IdeaRequest):
     log_event("generate_spec", {"idea": req.idea})
@@ -41,3 +55,303 @@ def generate_spec(req: IdeaRequest):
         "outputs": ["spec_json"],
         "notes": "This is a simple hard-coded stub for the trial."
     }
+
+
+# ──────────────────────────────────────────────────────────────
+# Single estimate (cached, ETag-aware)
+#   ESTIMATE_CACHE_SIZE  responses kept (LRU within the TTL)
+#   ESTIMATE_CACHE_TTL   seconds a cached response stays valid
+# ──────────────────────────────────────────────────────────────
+ESTIMATE_CACHE_SIZE = int(os.getenv("ESTIMATE_CACHE_SIZE", "4096"))
+ESTIMATE_CACHE_TTL = float(os.getenv("ESTIMATE_CACHE_TTL", "300"))
+_estimate_cache: TTLCache = TTLCache(maxsize=ESTIMATE_CACHE_SIZE, ttl=ESTIMATE_CACHE_TTL)
+_estimate_lock = threading.Lock()
+_estimate_stats = {"hit": 0, "miss": 0, "not_modified": 0}
+
+
+class EstimateRequest(BaseModel):
+    """The 13 wizard answers; anything omitted takes the Wizard's default."""
+    title: str = ""
+    contact_email: str = ""
+    industry: str = "Manufacturing"
+    goal: str = "Lead Gen"
+    audience: str = "Small <1k"
+    auth_needed: bool = False
+    payments_needed: bool = False
+    ai_features: List[str] = []
+    integrations: List[str] = []
+    content_support: str = "Have copy"
+    branding: str = "Have brand kit"
+    timeline: str = "1 week"
+    budget: str = "Entry"
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _estimate_response(req: EstimateRequest, request: Request) -> Response:
+    answers = canonical_answers(req.model_dump())
+    digest = answers_hash(answers)
+    # the hash covers the answers and the cost/risk rules, so it is a valid ETag
+    headers = {"ETag": f'"{digest[:32]}"', "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        with _estimate_lock:
+            _estimate_stats["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+
+    with _estimate_lock:
+        body = _estimate_cache.get(digest)
+    if body is None:
+        entry = lookup(answers)
+        body = json.dumps({
+            "answers_hash": digest,
+            "model_version": COST_MODEL.version,
+            "answers": answers,
+            "cost": entry.cost,
+            "indicators": entry.indicators,
+        }, ensure_ascii=False).encode("utf-8")
+        headers["X-Cache"] = "miss"
+        with _estimate_lock:
+            # only on a miss: re-inserting a hit would restart its TTL
+            _estimate_cache[digest] = body
+            _estimate_stats["miss"] += 1
+    else:
+        headers["X-Cache"] = "hit"
+        with _estimate_lock:
+            _estimate_stats["hit"] += 1
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@app.post("/estimate")
+async def estimate(req: EstimateRequest, request: Request):
+    """Cost breakdown and indicators for one answer set."""
+    return _estimate_response(req, request)
+
+
+@app.get("/estimate")
+async def estimate_query(req: Annotated[EstimateRequest, Query()], request: Request):
+    """Same as POST /estimate with answers as query parameters
+    (repeat ai_features / integrations for multiple picks), for polling widgets."""
+    return _estimate_response(req, request)
+
+
+def _estimate_cache_metrics() -> str:
+    lines = [
+        "# HELP estimate_cache_requests_total /estimate responses by cache outcome.",
+        "# TYPE estimate_cache_requests_total counter",
+    ]
+    lines += [f'estimate_cache_requests_total{{result="{k}"}} {v}' for k, v in _estimate_stats.items()]
+    lines += [
+        "# HELP estimate_cache_entries Responses currently cached.",
+        "# TYPE estimate_cache_entries gauge",
+        f"estimate_cache_entries {len(_estimate_cache)}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+# ──────────────────────────────────────────────────────────────
+# QR codes (content-addressed, see utils/qr.py)
+# ──────────────────────────────────────────────────────────────
+QR_BULK_LIMIT = 1000
+
+
+class QRItem(BaseModel):
+    id: str | None = None
+    text: str | None = None
+    summary: dict | None = None  # encoded exactly like the Summary page: json.dumps(summary)
+
+
+class QRBulkRequest(BaseModel):
+    items: List[QRItem]
+    format: str = "svg"
+    inline: bool = True  # include the image as a data URI; otherwise fetch it from `url`
+
+
+def _zip_names(images: list) -> List[str]:
+    """Archive member names: ids reduced to [A-Za-z0-9_.-] (the index when
+    nothing is left), made unique with the index."""
+    names, used = [], set()
+    for i, (item_id, qr) in enumerate(images):
+        stem = re.sub(r"[^\w.-]", "_", item_id, flags=re.ASCII).lstrip(".") or str(i)
+        name = f"{stem}.{qr.fmt}"
+        if name in used:
+            name = f"{stem}-{i}.{qr.fmt}"
+        used.add(name)
+        names.append(name)
+    return names
+
+
+@app.post("/qr/bulk")
+def qr_bulk(req: QRBulkRequest, request: Request):
+    """Render many QR codes in one call. Identical payloads are rendered once
+    (also across calls and processes). Send `Accept: application/zip` to get a
+    zip archive of the images instead of JSON."""
+    if req.format not in QR_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {sorted(QR_FORMATS)}")
+    if not qr_available(req.format):
+        raise HTTPException(status_code=503, detail="QR rendering unavailable (install qrcode[pil])")
+    if len(req.items) > QR_BULK_LIMIT:
+        raise HTTPException(status_code=413, detail=f"at most {QR_BULK_LIMIT} items per request")
+
+    images = []
+    for i, item in enumerate(req.items):
+        if (item.text is None) == (item.summary is None):
+            raise HTTPException(status_code=400, detail=f"items[{i}]: give exactly one of text / summary")
+        payload = item.text if item.text is not None else json.dumps(item.summary)
+        images.append((item.id or str(i), render_qr(payload, req.format)))
+
+    if "application/zip" in request.headers.get("accept", ""):
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, (_, qr) in zip(_zip_names(images), images):
+                zf.writestr(name, qr.data)
+        return Response(buf.getvalue(), media_type="application/zip",
+                        headers={"Content-Disposition": 'attachment; filename="qr.zip"'})
+
+    return {
+        "count": len(images),
+        "format": req.format,
+        "items": [
+            {"id": item_id, "key": qr.key, "url": f"/qr/{qr.filename}", **({"data_uri": qr.data_uri()} if req.inline else {})}
+            for item_id, qr in images
+        ],
+    }
+
+
+@app.get("/qr/{filename}")
+def qr_image(filename: str):
+    """A previously rendered QR image by content address ("<sha256>.svg" / "<sha256>.png")."""
+    qr = get_qr_cache().load(filename)
+    if qr is None:
+        raise HTTPException(status_code=404, detail="Unknown QR image")
+    # content-addressed: the bytes behind a name never change
+    return Response(qr.data, media_type=qr.mime,
+                    headers={"Cache-Control": "public, max-age=31536000, immutable", "ETag": f'"{qr.key}"'})
+
+
+# ──────────────────────────────────────────────────────────────
+# Batch estimator
+#   ESTIMATE_BATCH_MAX_ROWS   rows accepted per request (larger batches get 413)
+#   ESTIMATE_BATCH_MAX_BYTES  request body size cap (default 64 MiB; larger bodies get 413)
+# ──────────────────────────────────────────────────────────────
+ESTIMATE_BATCH_MAX_ROWS = int(os.getenv("ESTIMATE_BATCH_MAX_ROWS", "100000"))
+ESTIMATE_BATCH_MAX_BYTES = int(os.getenv("ESTIMATE_BATCH_MAX_BYTES", str(64 * 1024 * 1024)))
+JSONL_TYPES = {"application/x-ndjson", "application/jsonl", "application/json-lines"}
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+ARROW_FILE = "application/vnd.apache.arrow.file"
+
+
+def _read_batch(body: bytes, content_type: str) -> pd.DataFrame:
+    if content_type in JSONL_TYPES:
+        return pd.read_json(io.BytesIO(body), lines=True, dtype=False)
+    if content_type == ARROW_STREAM:
+        return pa.ipc.open_stream(body).read_all().to_pandas()
+    if content_type == ARROW_FILE:
+        return pa.ipc.open_file(pa.BufferReader(body)).read_all().to_pandas()
+    raise HTTPException(status_code=415, detail=f"Unsupported content type: {content_type or 'none'}")
+
+
+async def _raw_body(request: Request) -> bytes:
+    """Request body, refused with 413 past ESTIMATE_BATCH_MAX_BYTES.
+
+    Content-Length is checked before anything is read; chunked or
+    mislabelled bodies are cut off as soon as they cross the cap."""
+    too_large = HTTPException(status_code=413, detail=f"at most {ESTIMATE_BATCH_MAX_BYTES} bytes per request")
+    length = request.headers.get("content-length", "0")
+    if not length.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid Content-Length")
+    if int(length) > ESTIMATE_BATCH_MAX_BYTES:
+        raise too_large
+    chunks, size = [], 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > ESTIMATE_BATCH_MAX_BYTES:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _blank_rows(answers: pd.DataFrame) -> List[int]:
+    """Positions of rows that set none of the wizard fields ({} or only unknown keys)."""
+    known = answers.columns.intersection(list(WIZARD_DEFAULTS))
+    if known.empty:
+        return list(range(len(answers)))
+    return [int(i) for i in (~answers[known].notna().any(axis=1)).to_numpy().nonzero()[0]]
+
+
+@app.post("/estimate/batch")
+def estimate_batch_endpoint(request: Request, body: Annotated[bytes, Depends(_raw_body)]):
+    """Price many wizard answer sets sent as JSONL or Arrow IPC.
+
+    Responds with JSON records, or an Arrow IPC stream when the client sends
+    `Accept: application/vnd.apache.arrow.stream`. A plain `def`, so the
+    pandas work runs in the threadpool instead of blocking the event loop.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if not body:
+        raise HTTPException(status_code=400, detail="Empty request body")
+    try:
+        answers = _read_batch(body, content_type)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not parse batch: {e}")
+    if len(answers) > ESTIMATE_BATCH_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"at most {ESTIMATE_BATCH_MAX_ROWS} rows per request")
+    blank = _blank_rows(answers)
+    if blank:
+        shown = ", ".join(map(str, blank[:10])) + (", ..." if len(blank) > 10 else "")
+        raise HTTPException(status_code=422,
+                            detail=f"{len(blank)} row(s) set no wizard field (rows {shown}); nothing to price")
+
+    result = estimate_batch(answers).reset_index(drop=True)
+    log_event("estimate_batch", {"rows": len(result), "format": content_type})
+
+    if ARROW_STREAM in request.headers.get("accept", ""):
+        table = pa.Table.from_pandas(result, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Response(content=sink.getvalue().to_pybytes(), media_type=ARROW_STREAM)
+    return {"count": len(result), "rows": result.to_dict(orient="records")}
+
+
+# ──────────────────────────────────────────────────────────────
+# Cockpit log reader (active file + rotated segments)
+# ──────────────────────────────────────────────────────────────
+COCKPIT_LOGS = {
+    "events": LOG_EVENTS,
+    "dream_landing": LOG_DREAM,
+    "milkbot_chat": LOG_MILKBOT,
+}
+
+
+@app.get("/cockpit/events")
+def cockpit_events(log: str = "events", limit: int = 25, name: str | None = None, action: str | None = None,
+                   event: str | None = None, since: str | None = None, until: str | None = None):
+    """Recent events in schema v1. `action` and `event` are accepted as aliases of `name`."""
+    if log not in COCKPIT_LOGS:
+        raise HTTPException(status_code=404, detail=f"Unknown log: {log}")
+    limit = max(1, min(limit, 1000))
+    events = tail_events(COCKPIT_LOGS[log], limit, name=name or action or event, since=since, until=until)
+    return {"log": log, "count": len(events), "events": events}
+
+
+# ──────────────────────────────────────────────────────────────
+# Rollups (incremental, checkpointed)
+# ──────────────────────────────────────────────────────────────
+@app.get("/analytics/rollups")
+def analytics_rollups(days: int = 7, hourly: bool = False):
+    """Submission counts, cost percentiles and risk distribution for the last `days`."""
+    days = max(1, min(days, 366))
+    engine = get_engine()
+    engine.refresh()
+    result = engine.summary(days=days)
+    if hourly:
+        frame = engine.hourly_frame(days=days)
+        result["hourly"] = {ts.isoformat(): row for ts, row in frame.to_dict(orient="index").items()}
+    return result
@@ -0,0 +1,154 @@
+"""In-memory request metrics for the FastAPI app, rendered in Prometheus text format.
+
+MetricsMiddleware is plain ASGI (no BaseHTTPMiddleware task/queue overhead):
+per request it takes two perf_counter() readings and a couple of locked
+integer updates. Routes are labelled by their template ("/cockpit/events",
+not the raw URL) so label cardinality stays bounded. The same timing feeds
+the sampled `api <METHOD> <route>` spans (utils/spans.py).
+"""
+import bisect
+import threading
+import time
+from typing import Dict, Tuple
+
+from utils.spans import observe
+
+# seconds; upper bounds of the latency buckets (+Inf is implicit)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED = "<unmatched>"
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+        self.in_flight = 0
+        self.started = time.time()
+
+    def begin(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def end(self, method: str, route: str, status: int, elapsed: float):
+        key = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            hist = self.latency.get(key)
+            if hist is None:
+                hist = self.latency[key] = Histogram()
+            hist.observe(elapsed)
+            rkey = (method, route, status)
+            self.requests[rkey] = self.requests.get(rkey, 0) + 1
+            if status >= 500:
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self.latency.clear()
+            self.requests.clear()
+            self.errors.clear()
+
+    # ── Prometheus exposition ──
+    def render(self) -> str:
+        def labels(method: str, route: str, **extra) -> str:
+            pairs = [("method", method), ("route", route), *extra.items()]
+            return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + "}"
+
+        with self._lock:
+            out = [
+                "# HELP http_requests_total Requests handled, by route and status code.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status), n in sorted(self.requests.items()):
+                out.append(f"http_requests_total{labels(method, route, status=status)} {n}")
+
+            out += [
+                "# HELP http_request_errors_total Requests that ended in a 5xx response or an exception.",
+                "# TYPE http_request_errors_total counter",
+            ]
+            for (method, route), n in sorted(self.errors.items()):
+                out.append(f"http_request_errors_total{labels(method, route)} {n}")
+
+            out += [
+                "# HELP http_requests_in_flight Requests currently being handled.",
+                "# TYPE http_requests_in_flight gauge",
+            ]
+            out.append(f"http_requests_in_flight {self.in_flight}")
+
+            out += [
+                "# HELP http_request_duration_seconds Request latency.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (method, route), hist in sorted(self.latency.items()):
+                cumulative = 0
+                for bound, n in zip((*BUCKETS, "+Inf"), hist.counts):
+                    cumulative += n
+                    out.append(f"http_request_duration_seconds_bucket{labels(method, route, le=bound)} {cumulative}")
+                out.append(f"http_request_duration_seconds_sum{labels(method, route)} {hist.sum:.6f}")
+                out.append(f"http_request_duration_seconds_count{labels(method, route)} {hist.count}")
+
+            out += [
+                "# HELP process_start_time_seconds Start time of the process since unix epoch.",
+                "# TYPE process_start_time_seconds gauge",
+                f"process_start_time_seconds {self.started:.3f}",
+            ]
+        return "\n".join(out) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+METRICS = Metrics()
+
+
+class MetricsMiddleware:
+    """ASGI middleware feeding a Metrics instance. Non-HTTP scopes pass straight through."""
+
+    def __init__(self, app, metrics: Metrics = METRICS):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        self.metrics.begin()
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            status = 500
+            raise
+        finally:
+            # the router stores the matched route on the (shared) scope
+            route = getattr(scope.get("route"), "path", UNMATCHED)
+            elapsed = time.perf_counter() - start
+            self.metrics.end(method, route, status, elapsed)
+            observe(f"api {method} {route}", elapsed)
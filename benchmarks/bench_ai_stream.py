@@ -0,0 +1,87 @@
+"""Perceived latency of chat replies: blocking completion vs. streamed (ChatStream).
+
+Starts tools/fake_openai.py in a subprocess and points the OpenAI client at it.
+"first text" is when the user sees something: the whole reply for the blocking
+call (the old spinner path), the first delta for the streamed one.
+
+Run from the repo root:  python benchmarks/bench_ai_stream.py [--runs 5] [--ttft 0.4] [--tps 40] [--tokens 120]
+"""
+import argparse
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx
+from openai import OpenAI
+
+from utils.ai import ChatStream
+
+MESSAGES = [{"role": "system", "content": "You are Milkbot."},
+            {"role": "user", "content": "Plan a landing page for my bakery."}]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def blocking(client) -> tuple[float, float]:
+    t0 = time.perf_counter()
+    client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES)
+    total = time.perf_counter() - t0
+    return total, total
+
+
+def streamed(client) -> tuple[float, float, float]:
+    stream = ChatStream(MESSAGES, client=client)
+    for _ in stream:
+        pass
+    s = stream.stats
+    return s.ttft_ms / 1e3, s.duration_ms / 1e3, s.tokens_per_s
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--ttft", type=float, default=0.4)
+    parser.add_argument("--tps", type=float, default=40.0)
+    parser.add_argument("--tokens", type=int, default=120)
+    args = parser.parse_args()
+
+    port = free_port()
+    server = subprocess.Popen([sys.executable, "-m", "tools.fake_openai", "--port", str(port), "--ttft", str(args.ttft),
+                               "--tps", str(args.tps), "--tokens", str(args.tokens)], cwd=Path(__file__).resolve().parents[1])
+    base = f"http://127.0.0.1:{port}/v1"
+    try:
+        while True:
+            try:
+                httpx.get(f"{base}/models")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+
+        client = OpenAI(base_url=base, api_key="fake")
+        streamed(client)  # warm up the connection
+        b = [blocking(client) for _ in range(args.runs)]
+        s = [streamed(client) for _ in range(args.runs)]
+
+        med = statistics.median
+        print(f"fake server: ttft {args.ttft}s, {args.tps} tok/s, {args.tokens} tokens; median of {args.runs}")
+        print(f"{'mode':>10} | {'first text s':>12} | {'complete s':>10} | {'tok/s':>6}")
+        print(f"{'blocking':>10} | {med(r[0] for r in b):12.3f} | {med(r[1] for r in b):10.3f} | {'-':>6}")
+        print(f"{'streamed':>10} | {med(r[0] for r in s):12.3f} | {med(r[1] for r in s):10.3f} | "
+              f"{med(r[2] for r in s):6.1f}")
+        print(f"time to first text: {med(r[0] for r in b) / med(r[0] for r in s):.1f}x sooner when streamed")
+    finally:
+        server.terminate()
+        server.wait(5)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Latency of /estimate for cache misses, cache hits and ETag revalidations (304).
+
+Two views, both in-process: end-to-end through httpx's ASGI transport (full
+stack: middleware, body parsing, validation, routing; no network), and the
+handler alone (canonicalise, hash, cache lookup, response).
+
+Run from the repo root:  python benchmarks/bench_api_estimate.py [--requests 2000]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx
+from starlette.requests import Request
+
+from api.main import EstimateRequest, _estimate_response, app
+
+ANSWERS = {
+    "title": "Dream Landing",
+    "contact_email": "owner@example.com",
+    "auth_needed": True,
+    "payments_needed": True,
+    "ai_features": ["OCR", "Chatbot"],
+    "integrations": ["Stripe", "Supabase"],
+    "content_support": "Need copy",
+}
+
+
+async def measure(fn, n: int) -> list[float]:
+    out = []
+    for i in range(n):
+        t0 = time.perf_counter()
+        await fn(i)
+        out.append(time.perf_counter() - t0)
+    return sorted(out)
+
+
+def pct(lat: list[float], q: float) -> float:
+    return lat[min(int(len(lat) * q), len(lat) - 1)] * 1e3
+
+
+def direct_request(etag: str | None = None) -> Request:
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "POST", "path": "/estimate", "headers": headers})
+
+
+async def run(n: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/estimate", json=ANSWERS)  # warm up imports and the lookup table
+        etag = (await client.post("/estimate", json=ANSWERS)).headers["etag"]
+        shuffled = {**ANSWERS, "ai_features": ["Chatbot", "None", "OCR"]}
+
+        async def miss(i):
+            # a distinct title gives a distinct hash, so every call computes
+            r = await client.post("/estimate", json={**ANSWERS, "title": f"Dream Landing {i}"})
+            assert r.headers["x-cache"] == "miss"
+
+        async def hit(i):
+            # same configuration, multiselects shuffled: canonicalisation maps it to the cached entry
+            r = await client.post("/estimate", json=shuffled)
+            assert r.headers["x-cache"] == "hit"
+
+        async def revalidate(i):
+            r = await client.post("/estimate", json=ANSWERS, headers={"If-None-Match": etag})
+            assert r.status_code == 304
+
+        async def handler_miss(i):
+            _estimate_response(EstimateRequest(**{**ANSWERS, "title": f"Direct {i}"}), direct_request())
+
+        async def handler_hit(i):
+            _estimate_response(EstimateRequest(**shuffled), direct_request())
+
+        async def handler_304(i):
+            _estimate_response(EstimateRequest(**ANSWERS), direct_request(etag))
+
+        print(f"{n} requests each")
+        print(f"{'case':>16} | {'p50 ms':>7} | {'p99 ms':>7}")
+        for label, fn in (("miss", miss), ("hit", hit), ("304", revalidate),
+                          ("handler miss", handler_miss), ("handler hit", handler_hit), ("handler 304", handler_304)):
+            await client.post("/estimate", json=ANSWERS)  # re-prime: a long miss run can evict it
+            lat = await measure(fn, n)
+            print(f"{label:>16} | {pct(lat, 0.5):7.3f} | {pct(lat, 0.99):7.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
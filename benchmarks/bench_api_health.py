@@ -0,0 +1,115 @@
+"""Load test for GET /health: in-memory response vs. the old per-call JSONL write.
+
+Starts the API under uvicorn in a subprocess and drives it with httpx.
+"/health-logged" reproduces the previous handler (append a health_check line
+to a log file on every call) so both run behind the same middleware and server.
+
+Run from the repo root:  python benchmarks/bench_api_health.py [--requests 5000] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx
+import uvicorn
+
+from api.main import app
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def add_legacy_route(log_path: Path):
+    def health_logged():
+        entry = {"ts": datetime.now(timezone.utc).isoformat(), "user": "local-dev", "tool": "dream-landing",
+                 "action": "health_check", "payload": {"status": "ok"}, "session": str(uuid.uuid4())}
+        with log_path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        return {"status": "ok"}
+
+    app.add_api_route("/health-logged", health_logged, methods=["GET"])
+
+
+async def hammer(base: str, path: str, total: int, concurrency: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    remaining = total
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base, limits=limits) as client:
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                t0 = time.perf_counter()
+                r = await client.get(path)
+                latencies.append(time.perf_counter() - t0)
+                r.raise_for_status()
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - t0, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--serve", nargs=2, metavar=("PORT", "LOG"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        add_legacy_route(Path(args.serve[1]))
+        uvicorn.run(app, host="127.0.0.1", port=int(args.serve[0]), log_level="warning", access_log=False)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        port = free_port()
+        server = subprocess.Popen([sys.executable, __file__, "--serve", str(port), str(Path(tmp) / "log.jsonl")])
+        base = f"http://127.0.0.1:{port}"
+        while True:
+            try:
+                httpx.get(f"{base}/health")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+
+        try:
+            print(f"{args.requests} requests, concurrency {args.concurrency}")
+            print(f"{'endpoint':>15} | {'req/s':>8} | {'p50 ms':>7} | {'p99 ms':>7}")
+            results = {}
+            for path in ("/health-logged", "/health"):
+                asyncio.run(hammer(base, path, 200, args.concurrency))  # warm up
+                elapsed, lat = asyncio.run(hammer(base, path, args.requests, args.concurrency))
+                lat.sort()
+                results[path] = args.requests / elapsed
+                print(f"{path:>15} | {results[path]:8.0f} | {lat[len(lat) // 2] * 1e3:7.2f} | "
+                      f"{lat[int(len(lat) * 0.99)] * 1e3:7.2f}")
+            print(f"throughput gain: {results['/health'] / results['/health-logged']:.2f}x")
+
+            # server-side view from the middleware itself (excludes client and network time)
+            scrape = httpx.get(f"{base}/metrics").text
+            values = dict(line.rsplit(" ", 1) for line in scrape.splitlines() if not line.startswith("#"))
+            for path in ("/health-logged", "/health"):
+                labels = f'{{method="GET",route="{path}"}}'
+                total = float(values[f"http_request_duration_seconds_sum{labels}"])
+                count = int(values[f"http_request_duration_seconds_count{labels}"])
+                print(f"{path:>15} | server-side mean {total / count * 1e6:7.1f} µs over {count} requests")
+        finally:
+            server.terminate()
+            server.wait(5)
+
+
+if __name__ == "__main__":
+    main()
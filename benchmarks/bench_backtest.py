@@ -0,0 +1,97 @@
+"""Throughput of tools/backtest.py on a synthetic multi-hundred-MB cockpit log.
+
+Writes a log of --mb megabytes in the current schema (indicator snapshots
+and deltas carrying answer_key, submits, plus unrelated events), then times
+a full backtest at each --workers count. For comparison it times the obvious
+approach, json.loads on every line, over the first --naive-mb megabytes and
+extrapolates.
+
+Run from the repo root:  python benchmarks/bench_backtest.py [--mb 512] [--workers 1 2 4]
+"""
+import argparse
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tools import backtest
+from utils.events import make_event
+from utils.lookup import KEY_SPACE, decode_key, lookup
+
+
+def sample_lines(n: int, seed: int = 5) -> list[bytes]:
+    rng = random.Random(seed)
+    lines = []
+    for i in range(n):
+        key = rng.randrange(KEY_SPACE)
+        entry = lookup(decode_key(key))
+        state = {**entry.indicators, "answer_key": key, "seq": i % 20}
+        roll = rng.random()
+        if roll < 0.55:
+            evt = make_event("indicator.delta", {"estimated_cost": state["estimated_cost"], "answer_key": key,
+                                                 "seq": state["seq"]}, session=f"s{i % 500}")
+        elif roll < 0.65:
+            evt = make_event("indicator.update", state, session=f"s{i % 500}", app="dream-landing", version="1.4")
+        elif roll < 0.70:
+            evt = make_event("submit_wizard", {"answers_count": 13, "est_cost": entry.cost["total"],
+                                               "answer_key": key}, app="dream-landing", version="1.4")
+        else:
+            evt = make_event("page_view", {"page": "wizard"}, session=f"s{i % 500}")
+        lines.append(evt.encode().encode() + b"\n")
+    return lines
+
+
+def write_log(path: Path, mb: int):
+    block = b"".join(sample_lines(20_000))
+    with open(path, "wb") as f:
+        while f.tell() < mb * 1024 * 1024:
+            f.write(block)
+
+
+def naive_seconds(path: Path, mb: int) -> float:
+    """json.loads every line of the first `mb` MB; seconds extrapolated to the whole file."""
+    limit, read = mb * 1024 * 1024, 0
+    t0 = time.perf_counter()
+    with open(path, "rb") as f:
+        for line in f:
+            read += len(line)
+            d = json.loads(line)
+            if d.get("event") in backtest.EVENTS and "answer_key" in d.get("payload", {}):
+                d["payload"]["answer_key"]
+            if read >= limit:
+                break
+    return (time.perf_counter() - t0) * path.stat().st_size / read
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=int, default=512)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--naive-mb", type=int, default=32)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log = Path(tmp) / "events.jsonl"
+        write_log(log, args.mb)
+        size_mb = log.stat().st_size / 1e6
+        print(f"{size_mb:,.0f} MB synthetic log; backtest --set ai=12 --set integrations_cap=8")
+        print(f"  json.loads per line (1 process)  {naive_seconds(log, args.naive_mb):7.2f} s  (extrapolated)")
+        for workers in args.workers:
+            t0 = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                backtest.main([str(log), "--set", "ai=12", "--set", "integrations_cap=8",
+                               "--workers", str(workers), "--json", str(Path(tmp) / "summary.json")])
+            elapsed = time.perf_counter() - t0
+            priced = json.loads((Path(tmp) / "summary.json").read_text())["priced"]
+            print(f"  tools.backtest --workers {workers:<7} {elapsed:7.2f} s  "
+                  f"({size_mb / elapsed:,.0f} MB/s, {priced:,} quotes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Rows/second and peak memory of tools/bulk_estimate.py as the input grows.
+
+Generates CSV briefs of increasing size, prices each file in a fresh
+process (JSONL and Parquet output) and reports throughput and peak RSS.
+Peak RSS should stay flat as the row count grows.
+
+Run from the repo root:  python benchmarks/bench_bulk_estimate.py [--rows 20000 200000] [--workers 1 2]
+"""
+import argparse
+import csv
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from utils.answers import WIZARD_DEFAULTS
+from utils.lookup import AI_OPTIONS, INTEGRATION_OPTIONS
+
+# Peak RSS of the run, measured inside the child so earlier runs do not mask it
+RUNNER = """
+import resource, sys
+from tools.bulk_estimate import main
+try:
+    main(sys.argv[1:])
+finally:
+    usage = [resource.getrusage(w).ru_maxrss for w in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+    print("maxrss_kb", *usage, file=sys.stderr)
+"""
+
+
+def write_briefs(path: Path, rows: int, seed: int = 3):
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(WIZARD_DEFAULTS))
+        writer.writeheader()
+        for i in range(rows):
+            writer.writerow({
+                "title": f"Project {i}" if i % 50 else "",  # ~2% fail validation
+                "contact_email": f"client{i}@example.com",
+                "industry": "Retail", "goal": "Lead Gen", "audience": "Small <1k",
+                "auth_needed": rng.choice(["yes", "no"]), "payments_needed": rng.choice(["1", "0"]),
+                "ai_features": ";".join(rng.sample(AI_OPTIONS[:-1], rng.randint(0, 2))),
+                "integrations": ";".join(rng.sample(INTEGRATION_OPTIONS[:-1], rng.randint(0, 3))),
+                "content_support": rng.choice(["Have copy", "Need copy", "Mixed"]),
+                "branding": "Use default", "timeline": "1 week", "budget": "Entry",
+            })
+
+
+def run(src: Path, out: Path, workers: int) -> tuple[float, int, int]:
+    """(seconds, parent peak RSS KB, largest worker peak RSS KB)."""
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", RUNNER, str(src), "-o", str(out), "--workers", str(workers),
+                           "--quiet"], cwd=ROOT, capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - t0
+    line = next(l for l in proc.stderr.splitlines() if l.startswith("maxrss_kb"))
+    parent, children = map(int, line.split()[1:])
+    return elapsed, parent, children
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[20_000, 200_000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'workers':>7} {'output':>8} {'rows/s':>9} {'peak RSS':>10} {'worker RSS':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            src = Path(tmp) / f"briefs_{rows}.csv"
+            write_briefs(src, rows)
+            for workers in args.workers:
+                for suffix in ("jsonl", "parquet"):
+                    out = Path(tmp) / f"priced.{suffix}"
+                    elapsed, parent, child = run(src, out, workers)
+                    print(f"{rows:>9,} {workers:>7} {suffix:>8} {rows / elapsed:>9,.0f} "
+                          f"{parent / 1024:>8.0f}MB {child / 1024:>9.0f}MB")
+                    out.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Events/second: open-append-close per event vs. the buffered cockpit writer.
+
+Run from the repo root:  python benchmarks/bench_cockpit_writer.py [events]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.cockpit import CockpitWriter
+
+
+def make_event(i: int) -> dict:
+    return {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "event": "indicator.update",
+        "payload": {"estimated_cost": 29.0 + i % 20, "risk_level": "Low", "ai_tools_needed": i % 4},
+    }
+
+
+def direct(path: Path, n: int, fsync: bool = False) -> float:
+    t0 = time.perf_counter()
+    for i in range(n):
+        with path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(make_event(i)) + "\n")
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+    return time.perf_counter() - t0
+
+
+def buffered(path: Path, n: int, fsync: str) -> tuple[float, float]:
+    writer = CockpitWriter(flush_interval=0.25, fsync=fsync)
+    t0 = time.perf_counter()
+    for i in range(n):
+        writer.append(path, make_event(i))
+    t_enqueue = time.perf_counter() - t0
+    writer.close()
+    return t_enqueue, time.perf_counter() - t0
+
+
+def main(n: int = 50_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        t_direct = direct(tmp / "direct.jsonl", n)
+        print(f"events: {n:,}")
+        t_direct_fsync = direct(tmp / "direct-fsync.jsonl", n // 10, fsync=True)
+        print(f"open/append/close per event   : {n / t_direct:>12,.0f} events/s")
+        print(f"  ... with fsync per event    : {n // 10 / t_direct_fsync:>12,.0f} events/s")
+        for fsync in ("none", "batch"):
+            out = tmp / f"buffered-{fsync}.jsonl"
+            t_enqueue, t_total = buffered(out, n, fsync)
+            lines = sum(1 for _ in out.open(encoding="utf-8"))
+            assert lines == n, f"lost events: {lines} != {n}"
+            print(f"writer fsync={fsync:<5} caller path: {n / t_enqueue:>12,.0f} events/s "
+                  f"| to disk: {n / t_total:>10,.0f} events/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,88 @@
+"""Cold-start import cost per page (and for the connectors package), current tree vs. a git revision.
+
+Uses tools/startup_profile.py (python -X importtime) in fresh interpreters and
+reports the median over --repeat runs. The second table shows what lazy
+loading moved off the startup path: the one-off cost paid the first time a
+feature is used.
+
+Run from the repo root:  python benchmarks/bench_cold_start.py [--compare HEAD~1] [--repeat 5]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from tools.startup_profile import parse_importtime, profile_page
+
+TARGETS = ["streamlit_app.py", "pages/02_Wizard.py", "pages/03_Summary.py", "pages/04_Indicators.py"]
+CONNECTORS_PROBE = "import connectors; list(connectors.REGISTRY)"
+
+DEFERRED = {
+    "AI Assist toggled (openai)": "import openai",
+    "QR requested (qrcode + PIL)": "import qrcode; qrcode.make('x')",
+    # validate() without a key returns before any HTTP; touch the lazy module the way a real call would
+    "connector used (requests)": "import connectors; connectors.REGISTRY['OpenAI'].__module__; "
+                                 "from utils.clients import get_session; get_session()",
+    "batch estimate (numpy + pandas)": "from utils.estimator import estimate_batch; estimate_batch([{}])",
+}
+
+
+def import_ms(cwd: Path, code: str) -> float:
+    """Top-level import time of `code`, minus what the interpreter imports at startup anyway."""
+    def run(src: str) -> float:
+        out = subprocess.run([sys.executable, "-X", "importtime", "-c", src], cwd=cwd, capture_output=True,
+                             text=True, timeout=300)
+        return sum(r.cumulative_us for r in parse_importtime(out.stderr) if r.depth == 0) / 1e3
+    return max(run(code) - run("pass"), 0.0)
+
+
+def page_ms(cwd: Path, page: str) -> float:
+    _, rows, _ = profile_page(page, cwd=cwd)
+    return sum(r.cumulative_us for r in rows if r.depth == 0) / 1e3
+
+
+def measure(cwd: Path, repeat: int) -> dict:
+    out = {page: statistics.median(page_ms(cwd, page) for _ in range(repeat)) for page in TARGETS}
+    out["connectors (import + list)"] = statistics.median(import_ms(cwd, CONNECTORS_PROBE) for _ in range(repeat))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--compare", metavar="REF", help="git revision to compare against")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    current = measure(ROOT, args.repeat)
+    baseline = None
+    if args.compare:
+        with tempfile.TemporaryDirectory() as tmp:
+            dest = Path(tmp) / "baseline"
+            subprocess.run(["git", "worktree", "add", "--detach", str(dest), args.compare], cwd=ROOT, check=True,
+                           capture_output=True)
+            try:
+                baseline = measure(dest, args.repeat)
+            finally:
+                subprocess.run(["git", "worktree", "remove", "--force", str(dest)], cwd=ROOT, capture_output=True)
+
+    print(f"page-level imports, ms (median of {args.repeat}; streamlit itself excluded)")
+    if baseline:
+        print(f"{'target':<30} {args.compare:>12} {'current':>10} {'speedup':>8}")
+        for name, ms in current.items():
+            print(f"{name:<30} {baseline[name]:12.1f} {ms:10.1f} {baseline[name] / max(ms, 0.1):7.1f}x")
+    else:
+        for name, ms in current.items():
+            print(f"{name:<30} {ms:10.1f}")
+
+    print("\ndeferred to first use, ms")
+    for label, code in DEFERRED.items():
+        print(f"{label:<34} {statistics.median(import_ms(ROOT, code) for _ in range(args.repeat)):8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Memory held for N half-finished Wizards: one dict per session (session_state) vs. utils/drafts.py.
+
+Each simulated session saves a draft a few times and then goes idle. The
+draft store keeps at most --memory-items hot drafts in memory and the rest
+in SQLite; resuming an idle draft reads it back from disk.
+
+Run from the repo root:  python benchmarks/bench_drafts.py [--sessions 5000] [--memory-items 256]
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.drafts import Draft, DraftStore
+from utils.indicators import compute_live_indicators
+from utils.lookup import AI_OPTIONS, INTEGRATION_OPTIONS, lookup
+
+
+def make_draft(rng: random.Random) -> Draft:
+    answers = {
+        "title": f"Project {rng.randint(0, 10**6)}", "contact_email": "name@example.com",
+        "industry": "Retail", "goal": "Lead Gen", "audience": "Small <1k",
+        "auth_needed": rng.random() < 0.5, "payments_needed": rng.random() < 0.5,
+        "ai_features": rng.sample(AI_OPTIONS[:-1], rng.randint(0, 2)),
+        "integrations": rng.sample(INTEGRATION_OPTIONS[:-1], rng.randint(0, 2)),
+        "content_support": "Have copy", "branding": "Use default", "timeline": "1 week", "budget": "Entry",
+    }
+    return Draft(answers, compute_live_indicators(answers), lookup(answers).cost)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--saves", type=int, default=3, help="drafts saved per session")
+    parser.add_argument("--memory-items", type=int, default=256)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    ids = [str(uuid.uuid4()) for _ in range(args.sessions)]
+    drafts = [[make_draft(rng) for _ in range(args.saves)] for _ in ids]
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    per_session = {}
+    for sid, saves in zip(ids, drafts):
+        for d in saves:
+            per_session[sid] = {"answers": dict(d.answers), "indicators": dict(d.indicators), "cost": dict(d.cost)}
+    old_bytes = tracemalloc.get_traced_memory()[0] - base
+    del per_session
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DraftStore(Path(tmp) / "drafts.db", memory_items=args.memory_items)
+        base = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        for sid, saves in zip(ids, drafts):
+            for d in saves:
+                store.put(sid, Draft(dict(d.answers), dict(d.indicators), dict(d.cost)))
+        put_ms = (time.perf_counter() - t0) * 1e3 / (args.sessions * args.saves)
+        new_bytes = tracemalloc.get_traced_memory()[0] - base
+        tracemalloc.stop()
+
+        def timed_get(sid: str) -> float:
+            t = time.perf_counter()
+            assert store.get(sid) is not None
+            return (time.perf_counter() - t) * 1e3
+
+        hot = statistics.median(timed_get(sid) for sid in ids[-50:])
+        cold = statistics.median(timed_get(sid) for sid in ids[:50])
+
+        print(f"{args.sessions} sessions, {args.saves} saves each")
+        print(f"  per-session dicts   {old_bytes / 1024:9.0f} KiB in memory")
+        print(f"  draft store         {new_bytes / 1024:9.0f} KiB in memory "
+              f"({store.in_memory()} hot drafts, {store.count()} in SQLite)")
+        print(f"  put {put_ms:.3f} ms | resume hot {hot:.3f} ms | resume from disk {cold:.3f} ms")
+        print(f"  stats {store.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Rows/second of the vectorized batch estimator vs. the per-call cost function.
+
+Run from the repo root:  python benchmarks/bench_estimator.py [rows]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd
+
+from utils.estimator import compute_feature_cost, encode_answers, estimate_batch
+
+AI_OPTIONS = ["Chatbot", "OCR", "Recommendations", "None"]
+INTEGRATION_OPTIONS = ["Supabase", "Stripe", "Google Sheets", "None"]
+CONTENT_OPTIONS = ["Have copy", "Need copy", "Mixed"]
+
+
+def make_answers(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "auth_needed": rng.random() < 0.5,
+            "payments_needed": rng.random() < 0.5,
+            "ai_features": rng.sample(AI_OPTIONS, rng.randint(0, len(AI_OPTIONS))),
+            "integrations": rng.sample(INTEGRATION_OPTIONS, rng.randint(0, len(INTEGRATION_OPTIONS))),
+            "content_support": rng.choice(CONTENT_OPTIONS),
+        }
+        for _ in range(n)
+    ]
+
+
+def main(n: int = 100_000):
+    records = make_answers(n)
+    df = pd.DataFrame(records)
+
+    t0 = time.perf_counter()
+    scalar = [
+        compute_feature_cost(r["auth_needed"], r["payments_needed"], r["ai_features"],
+                             r["integrations"], r["content_support"])["total"]
+        for r in records
+    ]
+    t_scalar = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = estimate_batch(df)
+    t_batch = time.perf_counter() - t0
+
+    X = encode_answers(df)
+    t0 = time.perf_counter()
+    estimate_batch(X)
+    t_encoded = time.perf_counter() - t0
+
+    assert list(batch["total"]) == scalar, "batch totals diverge from compute_feature_cost"
+
+    print(f"rows: {n:,}")
+    print(f"per-call compute_feature_cost : {n / t_scalar:>14,.0f} rows/s")
+    print(f"estimate_batch (DataFrame)    : {n / t_batch:>14,.0f} rows/s  ({t_scalar / t_batch:.1f}x)")
+    print(f"estimate_batch (encoded)      : {n / t_encoded:>14,.0f} rows/s  ({t_scalar / t_encoded:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
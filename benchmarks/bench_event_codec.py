@@ -0,0 +1,75 @@
+"""Encode/decode throughput of the schema-v1 codec vs. the legacy record shapes.
+
+Run from the repo root:  python benchmarks/bench_event_codec.py [events]
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.events import decode
+
+LEGACY = [
+    {"ts": "2025-10-10T06:26:49.309026+00:00", "user": "local-dev", "tool": "dream-landing",
+     "action": "summary.qr_generated", "payload": {"title": "Tshepo's Project", "estimated_cost_r": 53.0},
+     "session": "bea2ee25-edc5-484b-bd5b-33243954d882"},
+    {"ts": "2025-10-10T10:24:35.712712+00:00", "event": "indicator.update",
+     "payload": {"estimated_cost": 45.0, "risk_level": "Medium", "ai_tools_needed": 1},
+     "app": "MilkBox AI — Dream Landing Page", "version": "1.4"},
+    {"ts": "2025-10-13T07:32:02.669334+00:00", "event": "user.msg", "payload": {"msg": "hi"}},
+]
+
+
+def rate(n: int, seconds: float) -> str:
+    return f"{n / seconds:>12,.0f} events/s"
+
+
+def main(n: int = 300_000):
+    legacy_lines = [json.dumps(LEGACY[i % len(LEGACY)]).encode() for i in range(n)]
+    events = [decode(line) for line in legacy_lines]
+    v1_lines = [e.encode().encode() for e in events]
+
+    t0 = time.perf_counter()
+    for line in legacy_lines:
+        decode(line)
+    t_legacy_dec = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for line in v1_lines:
+        decode(line)
+    t_v1_dec = time.perf_counter() - t0
+
+    # same byte prefilter on both sides; only matching lines are decoded
+    t0 = time.perf_counter()
+    legacy_hits = sum(1 for line in legacy_lines if b"indicator.update" in line and decode(line).event == "indicator.update")
+    t_legacy_filtered = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    v1_hits = sum(1 for line in v1_lines if b"indicator.update" in line and decode(line).event == "indicator.update")
+    t_v1_filtered = time.perf_counter() - t0
+    assert legacy_hits == v1_hits
+
+    t0 = time.perf_counter()
+    for i in range(n):
+        json.dumps(LEGACY[i % len(LEGACY)])
+    t_legacy_enc = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for e in events:
+        e.encode()
+    t_v1_enc = time.perf_counter() - t0
+
+    size_legacy = sum(map(len, legacy_lines))
+    size_v1 = sum(map(len, v1_lines))
+    print(f"events: {n:,}")
+    print(f"{'':32} {'legacy':>19} {'v1':>19}")
+    print(f"{'decode':32} {rate(n, t_legacy_dec)} {rate(n, t_v1_dec)}")
+    print(f"{f'filtered scan ({v1_hits:,} hits)':32} {rate(n, t_legacy_filtered)} {rate(n, t_v1_filtered)}")
+    print(f"{'encode (json.dumps / encode())':32} {rate(n, t_legacy_enc)} {rate(n, t_v1_enc)}")
+    print(f"{'MB on disk':32} {size_legacy / 1024 / 1024:>19.1f} {size_v1 / 1024 / 1024:>19.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300_000)
@@ -0,0 +1,81 @@
+"""Query latency: SQLite event store vs. JSONL scans.
+
+Builds a synthetic events.jsonl, imports it, then asks for "last 10
+indicator.update for session X" (a session whose events sit near the start
+of the file) and "last 25 events".
+
+Run from the repo root:  python benchmarks/bench_event_store.py [events]
+"""
+import json
+import statistics
+import sys
+import tempfile
+import time
+from itertools import islice
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.event_store import EventStore
+from utils.logreader import iter_events_reverse
+
+ACTIONS = ["page_view", "answer_change", "indicator.update", "submit_wizard", "summary.qr_generated"]
+
+
+def make_log(path: Path, n: int, sessions: int = 20_000):
+    with path.open("w", encoding="utf-8") as f:
+        for start in range(0, n, 50_000):
+            lines = []
+            for i in range(start, min(n, start + 50_000)):
+                lines.append(json.dumps({
+                    "ts": f"2025-10-{1 + i * 30 // n:02d}T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}+00:00",
+                    "user": "local-dev",
+                    "tool": "dream-landing",
+                    "action": ACTIONS[i % len(ACTIONS)],
+                    "payload": {"estimated_cost": 29.0 + i % 40, "risk_level": "Low"},
+                    "session": f"s{(i // 7) % sessions:05d}",
+                }))
+            f.write("\n".join(lines) + "\n")
+
+
+def timed(fn, repeat: int = 5):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - t0)
+    return result, statistics.median(samples) * 1000
+
+
+def main(n: int = 1_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        log = Path(tmp) / "events.jsonl"
+        make_log(log, n)
+        store = EventStore(Path(tmp) / "cockpit.db")
+        t0 = time.perf_counter()
+        store.import_jsonl(log)
+        print(f"events: {n:,} ({log.stat().st_size / 1024 / 1024:,.0f} MB), "
+              f"import: {time.perf_counter() - t0:.1f} s")
+
+        session = "s00003"
+
+        def jsonl_scan():
+            evts = (e for e in iter_events_reverse(log, name="indicator.update") if e.get("session") == session)
+            return list(islice(evts, 10))
+
+        def store_query():
+            return store.recent(log="events", name="indicator.update", session=session, limit=10)
+
+        a, t_scan = timed(jsonl_scan, repeat=1)
+        b, t_store = timed(store_query)
+        assert a == b, "store and JSONL scan disagree"
+        print(f"last 10 indicator.update for {session}: JSONL scan {t_scan:>9.1f} ms | SQLite {t_store:>6.2f} ms")
+
+        a, t_scan = timed(lambda: list(islice(iter_events_reverse(log), 25)))
+        b, t_store = timed(lambda: store.recent(log="events", limit=25))
+        assert a == b, "store and JSONL tail disagree"
+        print(f"last 25 events                   : JSONL tail {t_scan:>9.2f} ms | SQLite {t_store:>6.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,143 @@
+"""Per-call latency: a new connection per call (the old code) vs. the pooled clients in utils/clients.py.
+
+Starts tools/fake_openai.py over HTTPS (self-signed certificate made with
+openssl; --plain for HTTP) and times:
+
+- connector ping: requests.get per call vs. get_session().get
+- chat completion, plain and streamed: new OpenAI() per call (old Milkbot)
+  vs. get_openai_client()
+- retries: completions against a server failing --fail-rate of requests
+
+Run from the repo root:  python benchmarks/bench_http_clients.py [--calls 50] [--plain]
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import httpx
+import requests
+from openai import OpenAI
+
+from utils import clients
+from utils.ai import ChatStream
+
+MESSAGES = [{"role": "user", "content": "ping"}]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def make_cert(tmp: Path) -> tuple[str, str]:
+    cert, key = tmp / "cert.pem", tmp / "key.pem"
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=127.0.0.1",
+                    "-addext", "subjectAltName=IP:127.0.0.1", "-keyout", str(key), "-out", str(cert)],
+                   check=True, capture_output=True)
+    return str(cert), str(key)
+
+
+def start_server(port: int, cert=None, key=None, fail_rate: float = 0.0) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "tools.fake_openai", "--port", str(port), "--ttft", "0", "--tps", "1e6",
+           "--tokens", "8", "--fail-rate", str(fail_rate)]
+    if cert:
+        cmd += ["--ssl-certfile", cert, "--ssl-keyfile", key]
+    return subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL)
+
+
+def wait_up(base: str, verify):
+    while True:
+        try:
+            httpx.get(f"{base}/models", verify=verify)
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+
+
+def per_call_ms(fn, calls: int) -> float:
+    fn()  # warm up imports / first pool
+    times = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--plain", action="store_true", help="HTTP instead of HTTPS")
+    parser.add_argument("--fail-rate", type=float, default=0.3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cert = key = None
+        scheme = "http"
+        if not args.plain:
+            cert, key = make_cert(Path(tmp))
+            scheme = "https"
+            os.environ["SSL_CERT_FILE"] = os.environ["REQUESTS_CA_BUNDLE"] = cert  # trust the stub for both stacks
+        port, flaky_port = free_port(), free_port()
+        servers = [start_server(port, cert, key), start_server(flaky_port, cert, key, args.fail_rate)]
+        base, flaky = f"{scheme}://127.0.0.1:{port}/v1", f"{scheme}://127.0.0.1:{flaky_port}/v1"
+        try:
+            wait_up(base, cert or True)
+            wait_up(flaky, cert or True)
+
+            print(f"median per call, ms ({args.calls} calls, {scheme}, stub replies immediately)")
+            print(f"{'call':<22} {'per call':>10} {'pooled':>10} {'saved':>8}")
+            old = per_call_ms(lambda: requests.get(f"{base}/models", timeout=3), args.calls)
+            new = per_call_ms(lambda: clients.get_session().get(f"{base}/models"), args.calls)
+            print(f"{'connector ping':<22} {old:10.2f} {new:10.2f} {old - new:8.2f}")
+
+            def fresh_client():
+                OpenAI(api_key="fake", base_url=base).chat.completions.create(model="gpt-4o-mini", messages=MESSAGES)
+
+            def pooled_client():
+                clients.get_openai_client("fake", base).chat.completions.create(model="gpt-4o-mini", messages=MESSAGES)
+
+            old = per_call_ms(fresh_client, args.calls)
+            new = per_call_ms(pooled_client, args.calls)
+            print(f"{'chat completion':<22} {old:10.2f} {new:10.2f} {old - new:8.2f}")
+
+            def fresh_stream():
+                list(ChatStream(MESSAGES, client=OpenAI(api_key="fake", base_url=base)))
+
+            def pooled_stream():
+                list(ChatStream(MESSAGES, client=clients.get_openai_client("fake", base)))
+
+            old = per_call_ms(fresh_stream, args.calls)
+            new = per_call_ms(pooled_stream, args.calls)
+            print(f"{'streamed completion':<22} {old:10.2f} {new:10.2f} {old - new:8.2f}")
+
+            flaky_client = clients.get_openai_client("fake", flaky)
+            failed = 0
+            for _ in range(args.calls):
+                try:
+                    flaky_client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES)
+                except Exception:
+                    failed += 1
+            print(f"\nflaky server ({args.fail_rate:.0%} 503s): {args.calls - failed}/{args.calls} calls succeeded "
+                  f"with up to {clients.RETRIES} retries")
+            print("\nclient_stats():")
+            for name, stats in clients.client_stats().items():
+                print(f"  {name:<9} {stats}")
+        finally:
+            for server in servers:
+                server.kill()  # a graceful stop would wait on the pooled keep-alive connections
+                server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Indicator logging per Wizard session: the old double full write vs. utils/coalescer.py.
+
+Simulated sessions commit widget changes in bursts (--burst changes
+--gap-ms apart, then a --pause-ms pause). The old update_answers appended a
+full indicator.update record to events.jsonl (from compute_live_indicators)
+and another to dream_landing_log.jsonl on every change. The coalescer writes
+one delta record per burst, or nothing if the indicators did not change.
+Afterwards the log is replayed and every session's last state is checked
+against the simulation.
+
+Run from the repo root:  python benchmarks/bench_indicator_log.py [--sessions 20] [--changes 40]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.coalescer import EventCoalescer, replay
+from utils.cockpit import get_writer, log_event
+from utils.events import CockpitEvent, decode
+from utils.indicators import compute_live_indicators
+from utils.lookup import AI_OPTIONS, CONTENT_OPTIONS, INTEGRATION_OPTIONS
+
+FIELDS = {"app": "dream-landing", "version": "1.4"}
+
+
+def random_change(answers: dict, rng: random.Random):
+    key = rng.choice(["title", "contact_email", "goal", "timeline", "budget", "auth_needed", "payments_needed",
+                      "ai_features", "integrations", "content_support"])
+    if key in ("auth_needed", "payments_needed"):
+        answers[key] = not answers.get(key, False)
+    elif key == "ai_features":
+        answers[key] = rng.sample(AI_OPTIONS[:-1], rng.randint(0, 2))
+    elif key == "integrations":
+        answers[key] = rng.sample(INTEGRATION_OPTIONS[:-1], rng.randint(0, 2))
+    elif key == "content_support":
+        answers[key] = rng.choice(CONTENT_OPTIONS)
+    else:
+        answers[key] = f"{key}-{rng.randint(0, 999)}"
+
+
+def session(sid: str, args, record, seed: int) -> dict:
+    rng = random.Random(seed)
+    answers = {}
+    indicators = {}
+    for i in range(args.changes):
+        random_change(answers, rng)
+        indicators = compute_live_indicators(answers)
+        record(sid, indicators)
+        time.sleep((args.gap_ms if (i + 1) % args.burst else args.pause_ms) / 1e3)
+    return {k: v for k, v in indicators.items() if k != "ts"}
+
+
+def run(args, record) -> dict:
+    finals = {}
+
+    def worker(n: int):
+        finals[f"s{n}"] = session(f"s{n}", args, record, seed=n)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(args.sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return finals
+
+
+def size(*paths: Path) -> tuple[int, int]:
+    lines = nbytes = 0
+    for p in paths:
+        if p.exists():
+            data = p.read_bytes()
+            lines += data.count(b"\n")
+            nbytes += len(data)
+    return lines, nbytes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--changes", type=int, default=40, help="widget commits per session")
+    parser.add_argument("--burst", type=int, default=4, help="changes per burst")
+    parser.add_argument("--gap-ms", type=float, default=30)
+    parser.add_argument("--pause-ms", type=float, default=400)
+    parser.add_argument("--window", type=float, default=0.2, help="coalescer quiet window, seconds")
+    parser.add_argument("--snapshot-every", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        old_events, old_dream, new_events = tmp / "old_events.jsonl", tmp / "old_dream.jsonl", tmp / "events.jsonl"
+
+        def old(sid: str, indicators: dict):
+            get_writer().append_line(old_events, CockpitEvent(indicators["ts"], "indicator.update", indicators).encode())
+            log_event(old_dream, "indicator.update", indicators, **FIELDS)
+
+        run(args, old)
+        get_writer().flush()
+
+        coalescer = EventCoalescer(new_events, window=args.window, max_wait=args.window * 5,
+                                   snapshot_every=args.snapshot_every)
+        finals = run(args, lambda sid, indicators: coalescer.update(sid, indicators, **FIELDS))
+        coalescer.flush()
+        get_writer().flush()
+
+        changes = args.sessions * args.changes
+        old_lines, old_bytes = size(old_events, old_dream)
+        new_lines, new_bytes = size(new_events)
+        print(f"{args.sessions} sessions x {args.changes} widget commits ({changes} changes, bursts of {args.burst})")
+        print(f"{'':<22} {'records':>8} {'bytes':>9} {'bytes/change':>13}")
+        print(f"{'old (two full writes)':<22} {old_lines:8d} {old_bytes:9d} {old_bytes / changes:13.1f}")
+        print(f"{'coalesced deltas':<22} {new_lines:8d} {new_bytes:9d} {new_bytes / changes:13.1f}")
+        print(f"  {old_lines / max(new_lines, 1):.1f}x fewer records, {old_bytes / max(new_bytes, 1):.1f}x fewer bytes; "
+              f"coalescer stats {coalescer.stats}")
+
+        events = (decode(line).to_dict() for line in new_events.read_bytes().splitlines())
+        rebuilt = {}
+        for evt in replay(events):
+            rebuilt[evt["session"]] = evt["payload"]
+        print(f"  replayed final state matches for {sum(rebuilt.get(s) == f for s, f in finals.items())}"
+              f"/{len(finals)} sessions")
+
+
+if __name__ == "__main__":
+    main()
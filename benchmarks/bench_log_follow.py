@@ -0,0 +1,62 @@
+"""Per-render cost of the incremental tailer vs. a fresh tail read, as the log grows.
+
+Run from the repo root:  python benchmarks/bench_log_follow.py
+"""
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.logreader import LogTail, tail_events
+
+
+def append(path: Path, start: int, n: int):
+    with path.open("a", encoding="utf-8") as f:
+        f.write("".join(
+            json.dumps({"ts": "2026-01-01T00:00:00+00:00", "action": "page_view", "payload": {"i": i}}) + "\n"
+            for i in range(start, start + n)
+        ))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "events.jsonl"
+        tail = LogTail(path, capacity=200)
+        written = 0
+        print(f"{'log size':>10} | {'poll, 10 new':>13} | {'poll, 0 new':>12} | {'fresh tail_events':>17}")
+        for size in (10_000, 100_000, 1_000_000):
+            append(path, written, size - written)
+            written = size
+            tail.poll()
+
+            append(path, written, 10)
+            written += 10
+            t0 = time.perf_counter()
+            added = tail.poll()
+            t_new = time.perf_counter() - t0
+            assert added == 10
+
+            t0 = time.perf_counter()
+            tail.poll()
+            t_idle = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            fresh = tail_events(path, 25)
+            t_fresh = time.perf_counter() - t0
+            assert fresh == tail.recent(25), "tailer ring disagrees with tail_events"
+
+            print(f"{path.stat().st_size / 1024 / 1024:>7.1f} MB | {t_new * 1e6:>10.0f} us |"
+                  f" {t_idle * 1e6:>9.0f} us | {t_fresh * 1e6:>14.0f} us")
+
+        path.write_text("")  # truncation
+        append(path, 0, 5)
+        tail.poll()
+        assert [e["payload"]["i"] for e in tail.recent(5)] == [4, 3, 2, 1, 0], "truncation not detected"
+        print(f"truncation detected, reseeds: {tail.reseeds}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Latency and peak memory of readlines() vs. the reverse tail reader on a large log.
+
+Run from the repo root:  python benchmarks/bench_log_tail.py [size_mb]
+"""
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.events import decode
+from utils.logreader import tail_events
+
+
+def make_log(path: Path, size_mb: int):
+    target = size_mb * 1024 * 1024
+    actions = ["page_view", "answer_change", "indicator.update", "submit_wizard", "summary.qr_generated"]
+    with path.open("w", encoding="utf-8") as f:
+        i = 0
+        while f.tell() < target:
+            lines = []
+            for _ in range(10_000):
+                lines.append(json.dumps({
+                    "ts": f"2025-10-10T06:{i // 60 % 60:02d}:{i % 60:02d}+00:00",
+                    "user": "local-dev",
+                    "tool": "dream-landing",
+                    "action": actions[i % len(actions)],
+                    "payload": {"estimated_cost": 29.0 + i % 40, "risk_level": "Low", "ai_tools_needed": i % 4},
+                    "session": f"{i:032x}",
+                }))
+                i += 1
+            f.write("\n".join(lines) + "\n")
+
+
+def readlines_tail(path: Path, limit: int, name: str | None = None):
+    with path.open("r", encoding="utf-8") as f:
+        lines = f.readlines()
+    events = []
+    for line in reversed(lines):
+        evt = decode(line)
+        if name is None or evt.event == name:
+            events.append(evt.to_dict())
+        if len(events) >= limit:
+            break
+    return events
+
+
+def measure(fn, *args, **kwargs):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main(size_mb: int = 200):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "events.jsonl"
+        make_log(path, size_mb)
+        print(f"log size: {path.stat().st_size / 1024 / 1024:,.0f} MB")
+        for label, kwargs in (("last 25", {"limit": 25}),
+                              ("last 10 indicator.update", {"limit": 10, "name": "indicator.update"})):
+            old, t_old, m_old = measure(readlines_tail, path, **kwargs)
+            new, t_new, m_new = measure(tail_events, path, **kwargs)
+            assert old == new, "tail reader disagrees with readlines()"
+            print(f"{label:<26} readlines: {t_old * 1000:>9.1f} ms {m_old / 1024 / 1024:>9.1f} MB peak"
+                  f" | tail: {t_new * 1000:>6.2f} ms {m_new / 1024:>7.0f} KB peak")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
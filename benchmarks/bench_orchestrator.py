@@ -0,0 +1,70 @@
+"""Connector lifecycle: serial loop vs. connectors/orchestrator.py, plus rollback and timeout runs.
+
+Uses connectors/fake.py (every step sleeps --latency seconds). The fleet has
+--n connectors; every third one depends on the one before it, so some
+provisioning has to wait.
+
+Run from the repo root:  python benchmarks/bench_orchestrator.py [--n 8] [--latency 0.1]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from connectors.fake import FakeConnector
+from connectors.orchestrator import Orchestrator
+
+
+def fleet(n: int, latency, **overrides):
+    fakes = {}
+    for i in range(n):
+        name = f"c{i}"
+        kwargs = {"latency": latency, "depends_on": (f"c{i - 1}",) if i % 3 == 2 else ()}
+        kwargs.update(overrides.get(name, {}))
+        fakes[name] = FakeConnector(name, **kwargs)
+    return fakes
+
+
+def serial(fakes, did: str) -> float:
+    """What driving the lifecycle by hand looks like: one connector, one step at a time."""
+    t0 = time.perf_counter()
+    for c in fakes.values():
+        c.validate({})
+        c.estimate_cost({})
+    for name in Orchestrator(fakes, log_path=None).order(fakes):
+        state = fakes[name].provision({}, did).data
+        fakes[name].smoke_test(state, did)
+    return (time.perf_counter() - t0) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    print(f"{args.n} fake connectors, {args.latency * 1e3:.0f} ms per step")
+    serial_ms = serial(fleet(args.n, args.latency), "serial")
+    report = Orchestrator(fleet(args.n, args.latency), log_path=None).run({}, {}, did="bench")
+    print(f"  serial loop     {serial_ms:8.0f} ms")
+    print(f"  orchestrator    {report.wall_ms:8.0f} ms  (ok={report.ok}, busy {report.busy_ms:.0f} ms, "
+          f"{serial_ms / report.wall_ms:.1f}x)")
+
+    fakes = fleet(args.n, args.latency, c4={"fail": {"smoke_test"}})
+    report = Orchestrator(fakes, log_path=None).run({}, {}, did="bench")
+    print(f"\nc4 fails its smoke test: ok={report.ok}, failed={report.failed}, {report.wall_ms:.0f} ms")
+    print(f"  provisioned  {report.provisioned}")
+    print(f"  rolled back  {report.rolled_back}")
+
+    fakes = fleet(args.n, args.latency, c1={"latency": {"provision": 5.0}})
+    report = Orchestrator(fakes, timeouts={"provision": args.latency * 5}, log_path=None).run({}, {}, did="bench")
+    print(f"\nc1 provision hangs (timeout {args.latency * 5:g}s): ok={report.ok}, failed={report.failed}, "
+          f"{report.wall_ms:.0f} ms")
+    print(f"  errors       {[(r.connector, r.step, r.result.error) for r in report.steps if not r.result.ok]}")
+    print(f"  rolled back  {report.rolled_back}")
+
+
+if __name__ == "__main__":
+    main()
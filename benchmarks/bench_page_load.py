@@ -0,0 +1,126 @@
+"""Cold import time and first-render time for every page.
+
+Each measurement runs in a fresh interpreter against a scratch copy of the
+tree (so the cockpit logs under data/ are left alone):
+
+- import:  the page's top-level import statements, after streamlit itself
+- render:  AppTest first run of the page (cold), then a second run (rerun)
+
+Pass --compare <git-ref> to measure an older revision side by side, e.g.
+`--compare HEAD~1` to see what the Wizard paid for importing streamlit_app.
+
+Run from the repo root:  python benchmarks/bench_page_load.py [--compare REF] [--repeat 3]
+"""
+import argparse
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PAGES = ["streamlit_app.py", *sorted(str(p.relative_to(ROOT)) for p in (ROOT / "pages").glob("*.py"))]
+
+IMPORT_PROBE = """
+import ast, json, sys, time
+sys.path.insert(0, ".")
+import streamlit  # shared by every page; not part of the page's own import cost
+tree = ast.parse(open(sys.argv[1], encoding="utf-8").read())
+stmts = [n for n in tree.body
+         if isinstance(n, ast.Import) or isinstance(n, ast.ImportFrom) and n.module != "__future__"]
+before = set(sys.modules)
+t0 = time.perf_counter()
+exec(compile(ast.Module(body=stmts, type_ignores=[]), sys.argv[1], "exec"), {})
+elapsed = time.perf_counter() - t0
+print(json.dumps({"import_ms": elapsed * 1e3, "modules": len(set(sys.modules) - before)}))
+"""
+
+RENDER_PROBE = """
+import json, sys, time
+sys.path.insert(0, ".")
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+t0 = time.perf_counter()
+at.run()
+first = time.perf_counter() - t0
+t0 = time.perf_counter()
+at.run()
+rerun = time.perf_counter() - t0
+print(json.dumps({"first_ms": first * 1e3, "rerun_ms": rerun * 1e3, "error": bool(at.exception)}))
+"""
+
+
+def probe(root: Path, code: str, page: str) -> dict:
+    out = subprocess.run([sys.executable, "-c", code, page], cwd=root, capture_output=True, text=True,
+                         timeout=600)
+    lines = [line for line in out.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        return {"failed": out.stderr.strip().splitlines()[-1:] or ["no output"]}
+    return json.loads(lines[-1])
+
+
+def measure(root: Path, page: str, repeat: int) -> dict:
+    if not (root / page).exists():
+        return {}
+    imports = [probe(root, IMPORT_PROBE, page) for _ in range(repeat)]
+    renders = [probe(root, RENDER_PROBE, page) for _ in range(repeat)]
+    if any("failed" in r for r in imports + renders):
+        return {"failed": True}
+    return {
+        "import_ms": statistics.median(r["import_ms"] for r in imports),
+        "modules": imports[0]["modules"],
+        "first_ms": statistics.median(r["first_ms"] for r in renders),
+        "rerun_ms": statistics.median(r["rerun_ms"] for r in renders),
+        "error": any(r["error"] for r in renders),
+    }
+
+
+def scratch_copy(dest: Path) -> Path:
+    shutil.copytree(ROOT, dest, ignore=shutil.ignore_patterns(".git", "__pycache__", "segments", "*.db*"))
+    return dest
+
+
+def worktree(ref: str, dest: Path) -> Path:
+    subprocess.run(["git", "worktree", "add", "--detach", str(dest), ref], cwd=ROOT, check=True,
+                   capture_output=True)
+    return dest
+
+
+def fmt(m: dict) -> str:
+    if not m:
+        return f"{'—':>38}"
+    if m.get("failed"):
+        return f"{'failed':>38}"
+    flag = "!" if m["error"] else " "
+    cells = f"{m['import_ms']:9.0f} {m['modules']:5d} {m['first_ms']:9.0f}{flag} {m['rerun_ms']:8.0f}"
+    return f"{cells:>38}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--compare", metavar="REF", help="also measure this git revision")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per measurement (median)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trees = {"current": scratch_copy(Path(tmp) / "current")}
+        if args.compare:
+            trees[args.compare] = worktree(args.compare, Path(tmp) / "compare")
+        try:
+            header = f"{'import ms':>9} {'mods':>5} {'first ms':>10} {'rerun ms':>8}"
+            print(f"{'page':<28} | " + " | ".join(f"{name:^38}" for name in trees))
+            print(f"{'':<28} | " + " | ".join(f"{header:>38}" for _ in trees))
+            for page in PAGES:
+                row = [fmt(measure(root, page, args.repeat)) for root in trees.values()]
+                print(f"{page:<28} | " + " | ".join(row))
+            print("(! = the page raised during the AppTest run)")
+        finally:
+            if args.compare:
+                subprocess.run(["git", "worktree", "remove", "--force", str(trees[args.compare])], cwd=ROOT,
+                               capture_output=True)
+
+
+if __name__ == "__main__":
+    main()
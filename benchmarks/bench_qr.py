@@ -0,0 +1,81 @@
+"""QR rendering: the old per-click PNG + base64 path vs. the content-addressed cache.
+
+Run from the repo root:  python benchmarks/bench_qr.py [--n 200]
+"""
+import argparse
+import base64
+import json
+import sys
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import qrcode
+from fastapi.testclient import TestClient
+
+import api.main as api
+from utils.qr import QRCache
+
+
+def old_qr_png_base64(text: str) -> str:
+    img = qrcode.make(text)
+    buf = BytesIO()
+    img.save(buf, format="PNG")
+    return base64.b64encode(buf.getvalue()).decode()
+
+
+def summaries(n: int, distinct: int):
+    return [{"title": f"Project {i % distinct}", "goal": "Lead Gen", "estimated_cost_r": 29.0 + i % distinct}
+            for i in range(n)]
+
+
+def timed(fn, items) -> float:
+    t0 = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - t0) / len(items) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=200)
+    args = parser.parse_args()
+    n = args.n
+    payloads = [json.dumps(s) for s in summaries(n, n)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"per QR, ms (n={n})")
+        print(f"  old: qrcode.make + PNG + base64   {timed(old_qr_png_base64, payloads):8.3f}")
+        for fmt in ("png", "svg"):
+            cache = QRCache(Path(tmp) / fmt)
+            cold = timed(lambda p: cache.render(p, fmt), payloads)
+            memory = timed(lambda p: cache.render(p, fmt), payloads)
+            disk = timed(lambda p: QRCache(Path(tmp) / fmt).render(p, fmt), payloads)  # new process, warm disk
+            size = sum(len(cache.render(p, fmt).data) for p in payloads) / n
+            print(f"  {fmt}: render + store (miss)         {cold:8.3f}")
+            print(f"  {fmt}: memory hit                    {memory:8.3f}")
+            print(f"  {fmt}: disk hit (cold process)       {disk:8.3f}")
+            print(f"  {fmt}: avg size                      {size:8.0f} bytes")
+
+        # bulk API: 1000 summaries, 50 distinct
+        api_cache = QRCache(Path(tmp) / "api")
+        api.get_qr_cache = lambda: api_cache
+        api.render_qr = api_cache.render
+        client = TestClient(api.app)
+        body = {"items": [{"id": str(i), "summary": s} for i, s in enumerate(summaries(1000, 50))], "format": "svg"}
+        t0 = time.perf_counter()
+        r = client.post("/qr/bulk", json=body)
+        first = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        client.post("/qr/bulk", json=body)
+        second = time.perf_counter() - t0
+        r.raise_for_status()
+        print(f"\nPOST /qr/bulk, 1000 summaries (50 distinct), svg: first {first * 1e3:.0f} ms, "
+              f"repeat {second * 1e3:.0f} ms; rendered {api_cache.stats['rendered']}")
+
+
+if __name__ == "__main__":
+    main()
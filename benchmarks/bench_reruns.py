@@ -0,0 +1,278 @@
+"""Rerun latency and peak memory per page under N concurrent sessions, checked against a baseline.
+
+Every session is a separate worker process that drives one page through
+streamlit.testing.v1.AppTest with a scripted interaction (typing and
+toggling in the Wizard, a Milkbot message on the landing page, the Summary
+buttons, the Indicators session filter) for --rounds rounds. All sessions
+of a page start together and share a scratch copy of the tree (drafts,
+cockpit logs, caches), so they contend for the CPU and disk as they would
+on one server. Milkbot and AI Assist talk to tools/fake_openai.py.
+
+Reported per page: rerun latency percentiles over all sessions and the
+peak RSS of the largest session process. The first run is shown
+separately, and a --warmup round (lazy imports such as openai, first
+connections) is run before timing starts.
+
+    python benchmarks/bench_reruns.py                     # compare with the baseline
+    python benchmarks/bench_reruns.py --update-baseline   # record a new baseline
+
+Exits with status 1 when a page is more than --tolerance slower (p50/p95)
+or bigger (peak RSS) than benchmarks/baselines/reruns.json. Baselines are
+machine-specific: record one on the machine that runs the comparison. On
+a busy machine, --repeat 3 takes the median of three measurements.
+
+Run from the repo root:  python benchmarks/bench_reruns.py [--sessions 4] [--rounds 3] [--pages Wizard]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from bench_page_load import scratch_copy
+
+BASELINE = ROOT / "benchmarks" / "baselines" / "reruns.json"
+PAGES = ["streamlit_app.py", "pages/02_Wizard.py", "pages/03_Summary.py", "pages/04_Indicators.py"]
+ABS_FLOOR = {"p50_ms": 5.0, "p95_ms": 10.0, "peak_rss_mb": 10.0}  # ignore regressions smaller than this
+
+
+# ──────────────────────────────────────────────────────────────
+# Scripted interactions (one list of steps per round)
+# ──────────────────────────────────────────────────────────────
+def landing_steps(at, rng: random.Random, n: int):
+    return [
+        lambda: at.run(),
+        lambda: at.chat_input[0].set_value(rng.choice(["What do I need for a booking site?",
+                                                       "How much does a shop cost?"])).run(),
+        lambda: at.run(),
+    ]
+
+
+def wizard_steps(at, rng: random.Random, n: int):
+    return [
+        lambda: at.text_input(key="title_input").input(f"Project {n}").run(),
+        lambda: at.text_input(key="contact_email_input").input(f"user{n}@example.com").run(),
+        lambda: at.checkbox(key="auth_input").set_value(n % 2 == 0).run(),
+        lambda: at.checkbox(key="payments_input").set_value(rng.random() < 0.5).run(),
+        lambda: at.multiselect(key="ai_features_input").set_value(rng.sample(["Chatbot", "OCR"], n % 3)).run(),
+        lambda: at.multiselect(key="integrations_input").set_value(rng.sample(["Stripe", "Supabase"], 1)).run(),
+        lambda: at.selectbox(key="timeline_input").set_value(rng.choice(["1 week", "2–4 weeks", ">1 month"])).run(),
+        lambda: at.selectbox(key="budget_input").set_value(rng.choice(["Entry", "Standard", "Premium"])).run(),
+        lambda: at.sidebar.toggle[0].set_value(True).run(),
+        lambda: at.text_input[-1].input("A booking site for my salon").run(),  # AI Assist prompt
+        lambda: at.sidebar.toggle[0].set_value(False).run(),
+    ]
+
+
+def summary_steps(at, rng: random.Random, n: int):
+    return [
+        lambda: at.run(),
+        lambda: at.button[0].click().run(),  # Copy Summary
+        lambda: at.radio[0].set_value(rng.choice(["svg", "png"])).run(),
+        lambda: at.button[1].click().run(),  # Generate QR Code
+    ]
+
+
+def indicators_steps(at, rng: random.Random, n: int):
+    return [
+        lambda: at.run(),
+        lambda: at.text_input[0].input(f"session-{n}").run(),
+        lambda: at.text_input[0].input("").run(),
+    ]
+
+
+SCENARIOS = {
+    "streamlit_app.py": landing_steps,
+    "pages/02_Wizard.py": wizard_steps,
+    "pages/03_Summary.py": summary_steps,
+    "pages/04_Indicators.py": indicators_steps,
+}
+
+
+def worker(page: str, rounds: int, warmup: int, seed: int):
+    """One session: run the page's scenario and print its timings as JSON."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    at = AppTest.from_file(str(ROOT / page), default_timeout=120)
+    at.secrets["OPENAI_API_KEY"] = "fake"
+    t0 = time.perf_counter()
+    at.run()
+    first_ms = (time.perf_counter() - t0) * 1e3
+    latencies, errors = [], 0
+    for n in range(warmup + rounds):
+        for step in SCENARIOS[page](at, rng, seed * 1000 + n):
+            if n < warmup:
+                step()
+                continue
+            t0 = time.perf_counter()
+            try:
+                step()
+            except Exception:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - t0) * 1e3)
+            errors += bool(at.exception)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+    print(json.dumps({"first_ms": first_ms, "latencies_ms": latencies, "peak_rss_mb": peak_mb, "errors": errors}))
+
+
+# ──────────────────────────────────────────────────────────────
+# Driver
+# ──────────────────────────────────────────────────────────────
+def start_fake_openai() -> tuple[subprocess.Popen, str]:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = subprocess.Popen([sys.executable, "-m", "tools.fake_openai", "--port", str(port), "--ttft", "0.05",
+                               "--tps", "400", "--tokens", "60"], cwd=ROOT, stdout=subprocess.DEVNULL)
+    base = f"http://127.0.0.1:{port}/v1"
+    while True:
+        try:
+            urllib.request.urlopen(f"{base}/models", timeout=1).close()
+            return server, base
+        except OSError:
+            time.sleep(0.1)
+
+
+def percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def measure(tree: Path, page: str, sessions: int, rounds: int, warmup: int, env: dict) -> dict:
+    procs = [subprocess.Popen([sys.executable, str(tree / "benchmarks" / Path(__file__).name), "--worker", page,
+                               "--rounds", str(rounds), "--warmup", str(warmup), "--seed", str(i)],
+                              cwd=tree, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+             for i in range(sessions)]
+    results = []
+    for p in procs:
+        out, _ = p.communicate(timeout=1800)
+        lines = [line for line in out.splitlines() if line.startswith("{")]
+        if lines:
+            results.append(json.loads(lines[-1]))
+    latencies = [ms for r in results for ms in r["latencies_ms"]]
+    if not latencies:
+        return {"failed": True}
+    return {
+        "reruns": len(latencies),
+        "first_ms": round(max(r["first_ms"] for r in results), 1),
+        "p50_ms": round(percentile(latencies, 0.50), 1),
+        "p95_ms": round(percentile(latencies, 0.95), 1),
+        "p99_ms": round(percentile(latencies, 0.99), 1),
+        "max_ms": round(max(latencies), 1),
+        "peak_rss_mb": round(max(r["peak_rss_mb"] for r in results), 1),
+        "errors": sum(r["errors"] for r in results) + sessions - len(results),
+    }
+
+
+def median_of(runs: list) -> dict:
+    runs = [r for r in runs if not r.get("failed")]
+    if not runs:
+        return {"failed": True}
+    return {k: round(statistics.median(r[k] for r in runs), 1) if isinstance(runs[0][k], float)
+            else max(r[k] for r in runs) for k in runs[0]}
+
+
+def regressions(page: str, m: dict, base: dict, tolerance: float) -> list:
+    found = []
+    for metric, floor in ABS_FLOOR.items():
+        old, new = base.get(metric), m.get(metric)
+        if old is None or new is None:
+            continue
+        if new > old * (1 + tolerance) and new - old > floor:
+            found.append(f"{page}: {metric} {old:g} -> {new:g} (+{(new / old - 1) * 100:.0f}%)")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=4, help="concurrent sessions per page")
+    parser.add_argument("--rounds", type=int, default=3, help="timed repetitions of each session's scenario")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed rounds before those")
+    parser.add_argument("--repeat", type=int, default=1, help="measurements per page (median)")
+    parser.add_argument("--pages", nargs="*", help="substring filter, e.g. Wizard Summary")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown / growth")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--seed", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.rounds, args.warmup, args.seed)
+        return
+
+    pages = [p for p in PAGES if not args.pages or any(f in p for f in args.pages)]
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    if baseline and (baseline["meta"]["sessions"], baseline["meta"]["rounds"]) != (args.sessions, args.rounds):
+        print(f"note: baseline was recorded with {baseline['meta']['sessions']} sessions x "
+              f"{baseline['meta']['rounds']} rounds")
+
+    server, base = start_fake_openai()
+    env = {**os.environ, "OPENAI_API_KEY": "fake", "OPENAI_BASE_URL": base}
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tree = scratch_copy(Path(tmp) / "tree")
+            print(f"{args.sessions} concurrent sessions x {args.rounds} rounds per page")
+            print(f"{'page':<24} {'reruns':>6} {'first':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7} "
+                  f"{'peak MB':>8} {'base p95':>9}")
+            for page in pages:
+                runs = [measure(tree, page, args.sessions, args.rounds, args.warmup, env) for _ in range(args.repeat)]
+                m = results[page] = median_of(runs)
+                if m.get("failed"):
+                    print(f"{page:<24} failed")
+                    continue
+                base = (baseline or {}).get("pages", {}).get(page, {})
+                flag = "!" if m["errors"] else " "
+                print(f"{page:<24} {m['reruns']:6d} {m['first_ms']:7.0f} {m['p50_ms']:7.1f} {m['p95_ms']:7.1f} "
+                      f"{m['p99_ms']:7.1f} {m['max_ms']:7.1f} {m['peak_rss_mb']:8.1f} "
+                      f"{base.get('p95_ms', float('nan')):9.1f}{flag}")
+    finally:
+        server.kill()
+        server.wait()
+    print("(ms; ! = a step raised or the page showed an exception)")
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        pages_out = {**((baseline or {}).get("pages", {})),
+                     **{p: m for p, m in results.items() if not m.get("failed")}}
+        args.baseline.write_text(json.dumps({
+            "meta": {"sessions": args.sessions, "rounds": args.rounds, "warmup": args.warmup,
+                     "python": platform.python_version(), "cpus": os.cpu_count(),
+                     "recorded": datetime.now(timezone.utc).isoformat(timespec="seconds")},
+            "pages": pages_out,
+        }, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return
+    if baseline is None:
+        print("no baseline yet; record one with --update-baseline")
+        return
+    found = [r for page, m in results.items() if not m.get("failed")
+             for r in regressions(page, m, baseline["pages"].get(page, {}), args.tolerance)]
+    failed = [page for page, m in results.items() if m.get("failed")]
+    for line in found:
+        print(f"REGRESSION {line}")
+    for page in failed:
+        print(f"FAILED {page}")
+    if found or failed:
+        sys.exit(1)
+    print(f"no regressions beyond {args.tolerance:.0%} of the baseline")
+
+
+if __name__ == "__main__":
+    main()
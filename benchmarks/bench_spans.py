@@ -0,0 +1,50 @@
+"""Overhead of utils/spans.py per call: bare function vs. @span at 0%, 10% and 100% sampling.
+
+Times a trivial function and compute_feature_cost (the cheapest traced
+section) so the fixed cost per span is visible.
+
+Run from the repo root:  python benchmarks/bench_spans.py [calls]
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.estimator import compute_feature_cost
+from utils.spans import Profiler, get_profiler, span, summarize
+import utils.spans as spans
+
+ARGS = (True, False, ["OCR"], ["Stripe"], "Need copy")
+
+
+def noop():
+    return None
+
+
+def per_call_ns(fn, args, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn(*args)
+    return (time.perf_counter() - t0) / n * 1e9
+
+
+def main(n: int = 200_000):
+    spans._profiler = Profiler(path=None)  # keep the measurement out of the cockpit
+    traced_noop = span("bench.noop")(noop)
+    bare_cost = compute_feature_cost.__wrapped__
+    print(f"ns per call ({n:,} calls)")
+    print(f"{'':<22} {'noop':>8} {'compute_feature_cost':>21}")
+    print(f"{'no span':<22} {per_call_ns(noop, (), n):8.0f} {per_call_ns(bare_cost, ARGS, n):21.0f}")
+    for rate in (0.0, 0.1, 1.0):
+        get_profiler().sample_rate = rate
+        print(f"{f'@span, {rate:.0%} sampled':<22} {per_call_ns(traced_noop, (), n):8.0f} "
+              f"{per_call_ns(compute_feature_cost, ARGS, n):21.0f}")
+    print()
+    for row in summarize(get_profiler().snapshot()):
+        print(f"  {row['span']:<32} n={row['count']:<8} p50 {row['p50_ms'] * 1e3:6.2f} µs  "
+              f"p99 {row['p99_ms'] * 1e3:6.2f} µs")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -1,7 +1,16 @@
 # connectors/__init__.py
-from .openai_conn import OpenAIConnector
+from .registry import LazyRegistry
 
-REGISTRY = {
-    "OpenAI": OpenAIConnector(),
+# name -> "module:Class"; connectors (and their SDKs) load on first REGISTRY[name]
+REGISTRY = LazyRegistry({
+    "OpenAI": ".openai_conn:OpenAIConnector",
     # Add more later
-}
+})
+
+
+def __getattr__(name):
+    # keep `from connectors import OpenAIConnector` working without an eager import
+    if name == "OpenAIConnector":
+        from .openai_conn import OpenAIConnector
+        return OpenAIConnector
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
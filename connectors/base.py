@@ -1,17 +1,167 @@
 # connectors/base.py
+import hashlib
+import json
+import os
+import threading
+import time
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
 @dataclass
 class StepResult:
     ok: bool
     data: Dict[str, Any] | None = None
     error: str = ""
+    retryable: bool = False  # transient failure (network, 5xx): counts towards the circuit breaker
 
 class Connector:
     name: str = "base"
+    depends_on: Tuple[str, ...] = ()  # connectors that must be provisioned (and smoke-tested) first
     def validate(self, cfg: Dict[str, Any]) -> StepResult: ...
     def estimate_cost(self, spec: Dict[str, Any]) -> float: ...
     def provision(self, spec: Dict[str, Any], did: str) -> StepResult: ...
     def smoke_test(self, state: Dict[str, Any], did: str) -> StepResult: ...
     def teardown(self, state: Dict[str, Any], did: str) -> StepResult: ...
+
+# ──────────────────────────────────────────────────────────────
+# Step cache + circuit breaker
+# ──────────────────────────────────────────────────────────────
+def fingerprint(value: Any) -> str:
+    """Stable hash of a config/spec; secrets only ever appear hashed."""
+    blob = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+class CircuitBreaker:
+    """closed -> open after `threshold` transient failures in a row; after `cooldown`
+    seconds one probe may run (half-open) and closes it again on success."""
+
+    def __init__(self, threshold: int = 3, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if self.probing else "open"
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            self.probing = False
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()  # (re)open; the cooldown starts over
+
+    def try_probe(self) -> bool:
+        """True for the one caller allowed to probe an open breaker once the cooldown is over."""
+        with self._lock:
+            if self.opened_at is None or self.probing or time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.probing = True
+            return True
+
+class StepCache:
+    """Caches StepResults per (connector, step, argument fingerprint) with a TTL,
+    behind a circuit breaker per (connector, step).
+
+        result = STEP_CACHE.call(REGISTRY["OpenAI"], "validate", cfg)
+
+    Successes are kept `ttl` seconds, failures `failure_ttl`. While a breaker
+    is open, calls return the last cached result for that argument (or a
+    fail-fast StepResult) at once, and after the cooldown a single background
+    probe re-runs the step to close it again.
+    """
+
+    def __init__(self, ttl: float = 300.0, failure_ttl: float = 15.0, threshold: int = 3, cooldown: float = 30.0):
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._entries: Dict[Tuple[str, str, str], Tuple[StepResult, float]] = {}  # key -> (result, stored at)
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "fail_fast": 0, "probes": 0}
+
+    def breaker(self, name: str, step: str) -> CircuitBreaker:
+        with self._lock:
+            return self._breakers.setdefault((name, step), CircuitBreaker(self.threshold, self.cooldown))
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _get(self, key) -> Tuple[Optional[StepResult], Optional[float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None, None
+        result, stored = entry
+        return result, time.monotonic() - stored
+
+    def _run(self, connector: "Connector", step: str, arg: Any, key, breaker: CircuitBreaker) -> StepResult:
+        try:
+            result = getattr(connector, step)(arg)
+        except Exception as e:
+            result = StepResult(False, error=f"{type(e).__name__}: {e}", retryable=True)
+        if result.retryable and not result.ok:
+            breaker.failure()
+        else:
+            breaker.success()  # a definite answer, even a "no", means the service is reachable
+        with self._lock:
+            self._entries[key] = (result, time.monotonic())
+        return result
+
+    def _probe(self, connector: "Connector", step: str, arg: Any, key, breaker: CircuitBreaker):
+        self._count("probes")
+        threading.Thread(target=self._run, args=(connector, step, arg, key, breaker),
+                         name=f"probe-{connector.name}-{step}", daemon=True).start()
+
+    def call(self, connector: "Connector", step: str, arg: Any) -> StepResult:
+        key = (connector.name, step, fingerprint(arg))
+        breaker = self.breaker(connector.name, step)
+        cached, age = self._get(key)
+        if breaker.opened_at is not None:
+            if breaker.try_probe():
+                self._probe(connector, step, arg, key, breaker)
+            self._count("fail_fast")
+            if cached is not None:
+                return cached
+            return StepResult(False, error=f"{connector.name} {step}: circuit open after "
+                                           f"{breaker.failures} failures, failing fast", retryable=True)
+        if cached is not None and age < (self.ttl if cached.ok else self.failure_ttl):
+            self._count("hits")
+            return cached
+        self._count("misses")
+        return self._run(connector, step, arg, key, breaker)
+
+    def validate(self, connector: "Connector", cfg: Dict[str, Any]) -> StepResult:
+        return self.call(connector, "validate", cfg)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cache and breaker state for display (Preflight)."""
+        now = time.monotonic()
+        with self._lock:
+            entries = [{"connector": n, "step": s, "config": fp, "ok": r.ok, "age_s": round(now - t, 1),
+                        "error": r.error} for (n, s, fp), (r, t) in self._entries.items()]
+            breakers = [{"connector": n, "step": s, "state": b.state, "failures": b.failures,
+                         "retry_in_s": round(max(b.cooldown - (now - b.opened_at), 0), 1) if b.opened_at else None}
+                        for (n, s), b in self._breakers.items()]
+            stats = dict(self.stats)
+        return {"stats": stats, "breakers": breakers, "entries": entries}
+
+STEP_CACHE = StepCache(
+    ttl=float(os.getenv("CONNECTOR_CACHE_TTL", "300")),
+    failure_ttl=float(os.getenv("CONNECTOR_CACHE_FAILURE_TTL", "15")),
+    threshold=int(os.getenv("CONNECTOR_BREAKER_THRESHOLD", "3")),
+    cooldown=float(os.getenv("CONNECTOR_BREAKER_COOLDOWN", "30")),
+)
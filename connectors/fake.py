@@ -0,0 +1,53 @@
+# connectors/fake.py
+"""In-process fake connectors with configurable latency and failures.
+
+Used by benchmarks/bench_orchestrator.py and for trying the orchestrator
+without credentials:
+
+    fakes = {c.name: c for c in (FakeConnector("db", latency=0.2),
+                                 FakeConnector("api", latency=0.2, depends_on=("db",)),
+                                 FakeConnector("cdn", latency={"provision": 0.5}, fail={"smoke_test"}))}
+    Orchestrator(fakes).run({}, {}, did="local")
+"""
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+from .base import Connector, StepResult
+
+
+class FakeConnector(Connector):
+    def __init__(self, name: str, latency: float | Mapping[str, float] = 0.1, fail: Iterable[str] = (),
+                 depends_on: Tuple[str, ...] = (), cost: float = 1.0):
+        self.name = name
+        self.latency = latency
+        self.fail = set(fail)
+        self.depends_on = tuple(depends_on)
+        self.cost = cost
+        self.calls: List[Tuple[str, float]] = []  # (step, perf_counter at start)
+        self._lock = threading.Lock()
+
+    def _step(self, step: str, **data: Any) -> StepResult:
+        with self._lock:
+            self.calls.append((step, time.perf_counter()))
+        delay = self.latency.get(step, 0.0) if isinstance(self.latency, Mapping) else self.latency
+        time.sleep(delay)
+        if step in self.fail:
+            return StepResult(False, error=f"{self.name}: injected {step} failure")
+        return StepResult(True, data={"connector": self.name, **data})
+
+    def validate(self, cfg: Dict[str, Any]) -> StepResult:
+        return self._step("validate")
+
+    def estimate_cost(self, spec: Dict[str, Any]) -> float:
+        self._step("estimate_cost")
+        return self.cost
+
+    def provision(self, spec: Dict[str, Any], did: str) -> StepResult:
+        return self._step("provision", resource=f"{self.name}-{did}")
+
+    def smoke_test(self, state: Dict[str, Any], did: str) -> StepResult:
+        return self._step("smoke_test", checked=state.get("resource"))
+
+    def teardown(self, state: Dict[str, Any], did: str) -> StepResult:
+        return self._step("teardown", removed=state.get("resource"))
@@ -1,6 +1,7 @@
 # connectors/openai_conn.py
-import os, requests
+import os
 from .base import Connector, StepResult
+from utils.clients import CONNECT_TIMEOUT, get_session  # requests is imported on the first validate()
 
 OPENAI_PING = "https://api.openai.com/v1/models"
 
@@ -12,12 +13,16 @@ class OpenAIConnector(Connector):
         if not key.startswith("sk-"):
             return StepResult(False, error="Missing or invalid OPENAI_API_KEY")
         try:
-            r = requests.get(OPENAI_PING, headers={"Authorization": f"Bearer {key}"}, timeout=3)
+            # one attempt: validate runs while a page renders, and STEP_CACHE's
+            # circuit breaker already handles repeated transient failures
+            r = get_session().get(OPENAI_PING, headers={"Authorization": f"Bearer {key}"},
+                                  timeout=(CONNECT_TIMEOUT, 3), retries=0)
             if r.status_code in (200, 401):  # 401 still proves auth path
                 return StepResult(True, data={"reachable": True, "status": r.status_code})
-            return StepResult(False, error=f"OpenAI API status {r.status_code}")
+            return StepResult(False, error=f"OpenAI API status {r.status_code}",
+                              retryable=r.status_code == 429 or r.status_code >= 500)
         except Exception as e:
-            return StepResult(False, error=f"OpenAI API unreachable: {e}")
+            return StepResult(False, error=f"OpenAI API unreachable: {e}", retryable=True)
 
     def estimate_cost(self, spec):
         return 0.0
@@ -0,0 +1,225 @@
+# connectors/orchestrator.py
+"""Drives the connector lifecycle concurrently.
+
+    report = Orchestrator(REGISTRY).run(cfg, spec, did="deploy-42")
+
+1. validate + estimate_cost for every connector at once
+2. provision -> smoke_test per connector, each starting as soon as the
+   connectors in its `depends_on` have passed their smoke test
+3. on any failure or timeout: schedule nothing new, let running steps
+   finish, then teardown everything provisioned in reverse order
+   (dependents before what they depend on)
+
+Each step runs in a thread pool under a per-step timeout (STEP_TIMEOUTS; a
+timed-out step is abandoned, not killed, and a timed-out provision is still
+torn down). Results come back as StepResults with `step` and `elapsed_ms`
+added to `data`; every step is logged as a `connector.step` cockpit event
+and the run as `connector.run`.
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from utils.cockpit import log_event
+from utils.paths import LOG_EVENTS
+
+from .base import Connector, StepResult
+
+STEP_TIMEOUTS = {"validate": 10.0, "estimate_cost": 5.0, "provision": 120.0, "smoke_test": 30.0, "teardown": 60.0}
+
+Task = Tuple[str, str, tuple]  # (connector, step, args)
+
+
+@dataclass
+class StepRecord:
+    connector: str
+    step: str
+    result: StepResult
+    started_ms: float  # since the start of the run
+    elapsed_ms: float
+
+
+@dataclass
+class RunReport:
+    did: str
+    ok: bool = False
+    failed: Optional[Tuple[str, str]] = None  # first (connector, step) that failed
+    steps: List[StepRecord] = field(default_factory=list)
+    provisioned: List[str] = field(default_factory=list)  # in completion order
+    rolled_back: List[str] = field(default_factory=list)
+    wall_ms: float = 0.0
+
+    @property
+    def busy_ms(self) -> float:
+        """Sum of step times: roughly what running the same steps serially would take."""
+        return sum(r.elapsed_ms for r in self.steps)
+
+    def results(self, step: str) -> Dict[str, StepResult]:
+        return {r.connector: r.result for r in self.steps if r.step == step}
+
+    def as_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d["busy_ms"] = round(self.busy_ms, 1)
+        return d
+
+
+class Orchestrator:
+    def __init__(self, connectors: Mapping[str, Connector], deps: Optional[Mapping[str, Iterable[str]]] = None,
+                 timeouts: Optional[Mapping[str, float]] = None, max_workers: Optional[int] = None,
+                 log_path: Optional[Path] = LOG_EVENTS):
+        self.connectors = connectors
+        self.deps = dict(deps or {})
+        self.timeouts = {**STEP_TIMEOUTS, **(timeouts or {})}
+        self.max_workers = max_workers
+        self.log_path = log_path
+
+    def depends_on(self, name: str) -> Tuple[str, ...]:
+        if name in self.deps:
+            return tuple(self.deps[name])
+        return tuple(getattr(self.connectors[name], "depends_on", ()))
+
+    def order(self, names: Iterable[str]) -> List[str]:
+        """Dependency order (Kahn); ValueError on unknown dependencies or cycles."""
+        names = list(names)
+        waiting = {n: set(self.depends_on(n)) for n in names}
+        for n, deps in waiting.items():
+            missing = deps - set(names)
+            if missing:
+                raise ValueError(f"{n} depends on {sorted(missing)}, which are not part of this run")
+        ordered: List[str] = []
+        ready = [n for n in names if not waiting[n]]
+        while ready:
+            n = ready.pop(0)
+            ordered.append(n)
+            for m in names:
+                if n in waiting[m]:
+                    waiting[m].discard(n)
+                    if not waiting[m]:
+                        ready.append(m)
+        if len(ordered) != len(names):
+            raise ValueError(f"dependency cycle among {sorted(set(names) - set(ordered))}")
+        return ordered
+
+    # ──────────────────────────────────────────────────────────────
+    # Run
+    # ──────────────────────────────────────────────────────────────
+    def run(self, cfg: Dict[str, Any], spec: Dict[str, Any], did: str,
+            names: Optional[Iterable[str]] = None) -> RunReport:
+        names = self.order(names if names is not None else list(self.connectors))
+        report = RunReport(did)
+        t0 = time.perf_counter()
+        pool = ThreadPoolExecutor(max_workers=self.max_workers or min(32, 2 * len(names) + 4),
+                                  thread_name_prefix="connector")
+        states: Dict[str, Dict[str, Any]] = {}
+        try:
+            checks = [(n, "validate", (cfg,)) for n in names] + [(n, "estimate_cost", (spec,)) for n in names]
+            report.ok = self._drive(pool, report, t0, checks)
+            if report.ok:
+                report.ok = self._deploy(pool, report, t0, names, spec, did, states)
+            if not report.ok:
+                for name in reversed(report.provisioned):
+                    self._drive(pool, report, t0, [(name, "teardown", (states.get(name, {}), did))])
+                    report.rolled_back.append(name)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            report.wall_ms = (time.perf_counter() - t0) * 1e3
+            self._log("connector.run", {
+                "did": did, "ok": report.ok, "connectors": names, "failed": report.failed,
+                "rolled_back": report.rolled_back, "wall_ms": round(report.wall_ms, 1),
+                "busy_ms": round(report.busy_ms, 1),
+            })
+        return report
+
+    def _deploy(self, pool, report: RunReport, t0: float, names: List[str], spec, did: str,
+                states: Dict[str, Dict[str, Any]]) -> bool:
+        waiting_on = {n: self.depends_on(n) for n in names}
+        waiting = {n: set(deps) for n, deps in waiting_on.items()}
+
+        def follow(name: str, step: str, result: StepResult, timed_out: bool) -> List[Task]:
+            if step == "provision" and (result.ok or timed_out):
+                # a timed-out provision may still complete, so it is rolled back too
+                states[name] = {**(result.data or {}), "deps": {d: states.get(d, {}) for d in waiting_on[name]}}
+                report.provisioned.append(name)
+                return [(name, "smoke_test", (states[name], did))] if result.ok else []
+            if step == "smoke_test" and result.ok:
+                ready = []
+                for m, deps in waiting.items():
+                    if name in deps:
+                        deps.discard(name)
+                        if not deps:
+                            ready.append((m, "provision", (spec, did)))
+                return ready
+            return []
+
+        start = [(n, "provision", (spec, did)) for n in names if not waiting[n]]
+        return self._drive(pool, report, t0, start, follow)
+
+    def _drive(self, pool, report: RunReport, t0: float, tasks: List[Task],
+               follow: Optional[Callable[[str, str, StepResult, bool], List[Task]]] = None) -> bool:
+        """Run tasks (and whatever `follow` schedules after each) until none are left; False on any failure."""
+        running: Dict[Any, Tuple[str, str, float]] = {}
+        ok = True
+
+        def submit(name: str, step: str, args: tuple):
+            fn = getattr(self.connectors[name], step)
+            running[pool.submit(_timed, step, fn, args)] = (name, step, time.perf_counter())
+
+        for task in tasks:
+            submit(*task)
+        while running:
+            deadline = min(started + self.timeouts[step] for _, step, started in running.values())
+            done, _ = wait(list(running), timeout=max(deadline - time.perf_counter(), 0), return_when=FIRST_COMPLETED)
+            now = time.perf_counter()
+            expired = [f for f, (_, step, started) in running.items()
+                       if f not in done and now >= started + self.timeouts[step]]
+            for future in list(done) + expired:
+                name, step, started = running.pop(future)
+                timed_out = future not in done
+                if timed_out:
+                    future.cancel()
+                    raw = StepResult(False, error=f"{step} timed out after {self.timeouts[step]:g}s")
+                    elapsed = now - started
+                else:
+                    raw, elapsed = future.result()
+                self._record(report, name, step, raw, started - t0, elapsed)
+                if not raw.ok and ok:
+                    ok = False
+                    if step != "teardown" and report.failed is None:
+                        report.failed = (name, step)
+                follow_up = follow(name, step, raw, timed_out) if follow else []
+                if ok:
+                    for task in follow_up:
+                        submit(*task)
+        return ok
+
+    def _record(self, report: RunReport, name: str, step: str, raw: StepResult, started: float, elapsed: float):
+        data = {**(raw.data or {}), "step": step, "elapsed_ms": round(elapsed * 1e3, 3)}
+        result = StepResult(raw.ok, data, raw.error)
+        report.steps.append(StepRecord(name, step, result, round(started * 1e3, 3), data["elapsed_ms"]))
+        payload = {"did": report.did, "connector": name, "step": step, "ok": raw.ok,
+                   "elapsed_ms": data["elapsed_ms"]}
+        if raw.error:
+            payload["error"] = raw.error
+        self._log("connector.step", payload)
+
+    def _log(self, event: str, payload: Dict[str, Any]):
+        if self.log_path is not None:
+            log_event(self.log_path, event, payload)
+
+
+def _timed(step: str, fn: Callable, args: tuple) -> Tuple[StepResult, float]:
+    """Call a connector step in a worker; normalise its return value and never raise."""
+    t = time.perf_counter()
+    try:
+        value = fn(*args)
+        if step == "estimate_cost":
+            result = StepResult(True, data={"cost": float(value or 0.0)})
+        elif isinstance(value, StepResult):
+            result = value
+        else:
+            result = StepResult(True)  # steps left as `...` on the base class
+    except Exception as e:
+        result = StepResult(False, error=f"{type(e).__name__}: {e}")
+    return result, time.perf_counter() - t
@@ -0,0 +1,50 @@
+# connectors/registry.py
+import importlib
+import threading
+from collections.abc import Mapping
+from typing import Dict, Iterator, List
+
+from .base import Connector
+
+
+class LazyRegistry(Mapping):
+    """Connector name -> instance, importing and instantiating each connector on first use.
+
+    Specs are "module:Class" strings (relative modules resolve against this
+    package), so listing names or checking membership imports nothing.
+    """
+
+    def __init__(self, specs: Dict[str, str]):
+        self._specs = dict(specs)
+        self._instances: Dict[str, Connector] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, spec: str):
+        with self._lock:
+            self._specs[name] = spec
+            self._instances.pop(name, None)
+
+    def __getitem__(self, name: str) -> Connector:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        spec = self._specs[name]  # KeyError for unknown names, as with a dict
+        with self._lock:
+            if name not in self._instances:
+                module_name, _, cls_name = spec.partition(":")
+                module = importlib.import_module(module_name, package=__package__)
+                self._instances[name] = getattr(module, cls_name)()
+            return self._instances[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._specs)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def __contains__(self, name) -> bool:
+        return name in self._specs
+
+    def loaded(self) -> List[str]:
+        """Names of connectors instantiated so far."""
+        return list(self._instances)
@@ -2,17 +2,11 @@ import streamlit as st
 import json, os, uuid, base64
 from datetime import datetime, timezone
 from pathlib import Path
-import openai
-from utils.indicators import compute_live_indicators
-from streamlit_app import _log, LOG_DREAM
-
-try:
-    import qrcode
-    from io import BytesIO
-    import base64
-    HAS_QR = True
-except ImportError:
-    HAS_QR = False
+from utils.core import (APP_SLUG, APP_VERSION, LOG_DREAM, AI_OPTIONS, INTEGRATION_OPTIONS, CONTENT_OPTIONS,
+                        WIZARD_CHOICES, ChatStream, Draft, answer_key, compute_live_indicators, get_drafts,
+                        get_indicator_log, get_prompt_cache, get_table, log_event, lookup, span, validate_answers,
+                        what_if)
+from utils.lazy import available
 
 # ──────────────────────────────────────────────────────────────
 # Global Footer
@@ -25,155 +19,87 @@ def app_footer():
         </p>
     """, unsafe_allow_html=True)
 
-APP_NAME = "dream-landing"
-DATA_DIR = Path("data")
-COCKPIT_DIR = DATA_DIR / "cockpit"
-COCKPIT_DIR.mkdir(parents=True, exist_ok=True)
-LOG_DREAM = COCKPIT_DIR / "dream_landing.jsonl"
 INTERNAL_MARKUP = 0.50
 
 # ──────────────────────────────────────────────────────────────
 # Cockpit logger
 # ──────────────────────────────────────────────────────────────
 def _log(file: Path, event: str, payload: dict):
-    entry = {
-        "ts": datetime.now(timezone.utc).isoformat(),
-        "event": event,
-        "payload": payload or {},
-        "app": APP_NAME,
-        "version": "1.4"
-    }
-    # ensure folder present
-    file.parent.mkdir(parents=True, exist_ok=True)
-    with file.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    log_event(file, event, payload, app=APP_SLUG, version=APP_VERSION)
 
 # ───────────────────────────────────────────────
-# Cost model (3.2 rules)
+# Cost model (3.2 rules) — precomputed lookup table
 # ───────────────────────────────────────────────
-@st.cache_data
-def compute_feature_cost(auth_needed, payments_needed, ai_features, integrations, content_support):
-    base = 29.0
-    cost = base
-    breakdown = {"Base": base}
-
-    if auth_needed:
-        cost += 4.0
-        breakdown["Auth"] = 4.0
-    if payments_needed:
-        cost += 8.0
-        breakdown["Payments"] = 8.0
-    if ai_features and any(a.strip() and a != "None" for a in ai_features):
-        cost += 10.0
-        breakdown["AI"] = 10.0
-    if integrations and any(i != "None" for i in integrations):
-        extra = min(2.0 * len([i for i in integrations if i != "None"]), 6.0)
-        cost += extra
-        breakdown["Integrations"] = extra
-    if content_support == "Need copy":
-        cost += 3.0
-        breakdown["Content Support"] = 3.0
-
-    return {"total": cost, "breakdown": breakdown}
-
-# ───────────────────────────────────────────────
-# QR helper
-# ───────────────────────────────────────────────
-def qr_png_base64(text: str) -> str:
-    if not HAS_QR:
-        st.warning("QR generation unavailable. Install 'qrcode[pil]' and 'pillow' to enable this feature.")
-        return ""
-    img = qrcode.make(text)
-    buf = BytesIO()
-    img.save(buf, format="PNG")
-    return base64.b64encode(buf.getvalue()).decode()
-
-def _validate_email(email: str) -> bool:
-    import re
-    return bool(re.match(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$", email))
+# Built once per process (and again only if the cost/risk rules change);
+# every rerun afterwards is an O(1) lookup keyed by the bit-encoded answers.
+get_table()
 
 # ───────────────────────────────────────────────
-# Session defaults
+# Session defaults + server-side draft
 # ───────────────────────────────────────────────
-if "answers" not in st.session_state:
-    st.session_state.answers = {}
-
-if "total_cost" not in st.session_state:
-    st.session_state.total_cost = 29.0  # base
-
+# answer -> (widget key, default)
+WIDGETS = {
+    "title": ("title_input", ""),
+    "contact_email": ("contact_email_input", ""),
+    "industry": ("industry_input", "Manufacturing"),
+    "goal": ("goal_input", "Lead Gen"),
+    "audience": ("audience_input", "Small <1k"),
+    "auth_needed": ("auth_input", False),
+    "payments_needed": ("payments_input", False),
+    "ai_features": ("ai_features_input", []),
+    "integrations": ("integrations_input", []),
+    "content_support": ("content_input", "Have copy"),
+    "branding": ("branding_input", "Have brand kit"),
+    "timeline": ("timeline_input", "1 week"),
+    "budget": ("budget_input", "Entry"),
+}
+
+# Answers, indicators and cost live in the draft store (utils/drafts.py), not in
+# st.session_state; ?draft=<session_id> resumes a draft in a new tab or after a reconnect.
+drafts = get_drafts()
 if "session_id" not in st.session_state:
-    st.session_state.session_id = str(uuid.uuid4())
+    resume = st.query_params.get("draft")
+    st.session_state.session_id = resume if resume and drafts.get(resume) else str(uuid.uuid4())
+st.query_params["draft"] = st.session_state.session_id
+
+# the saved draft (callbacks have already run), or the defaults before the first change
+draft = drafts.get(st.session_state.session_id)
+if draft is None:
+    draft = Draft({}, compute_live_indicators({}), lookup({}).cost)
+else:
+    # refill widgets on resume, or after Streamlit dropped their state on another page
+    for name, (key, _) in WIDGETS.items():
+        if key not in st.session_state and name in draft.answers:
+            st.session_state[key] = draft.answers[name]
 
 # ───────────────────────────────────────────────
 # Indicators update callback + defaults
 # ───────────────────────────────────────────────
+@span("wizard.update_answers")
 def update_answers():
     """Read all widget keys from st.session_state, normalise into answers,
-    compute indicators, and log to cockpit when changed."""
+    compute indicators and cost once, save the draft and hand the
+    indicators to the debounced cockpit log."""
     A = st.session_state
+    answers = {name: A.get(key, default) for name, (key, default) in WIDGETS.items()}
 
-    answers = {
-        "title": A.get("title_input", ""),
-        "contact_email": A.get("contact_email_input", ""),
-        "industry": A.get("industry_input", "Manufacturing"),
-        "goal": A.get("goal_input", "Lead Gen"),
-        "audience": A.get("audience_input", "Small <1k"),
-        "auth_needed": A.get("auth_input", False),
-        "payments_needed": A.get("payments_input", False),
-        "ai_features": A.get("ai_features_input", []),
-        "integrations": A.get("integrations_input", []),
-        "content_support": A.get("content_input", "Have copy"),
-        "branding": A.get("branding_input", "Have brand kit"),
-        "timeline": A.get("timeline_input", "1 week"),
-        "budget": A.get("budget_input", "Entry"),
-    }
-
-    # persist canonical answers
-    st.session_state["answers"] = answers
-
-    # compute indicators from the canonical answers (ensures same math as cost)
+    # indicators and cost both come from lookup(), which reads the raw widget answers
     indicators = compute_live_indicators(answers)
-
-    # compare with previous indicators to avoid duplicate logs
-    prev = st.session_state.get("indicators_prev")
-    if prev != indicators:
-        st.session_state["indicators"] = indicators
-        st.session_state["indicators_prev"] = indicators
-        # log via existing _log -> LOG_DREAM
-        try:
-            _log(LOG_DREAM, "indicator.update", indicators)
-        except Exception:
-            # fall back quietly if logging is not available
-            pass
-    else:
-        # ensure indicators present even if unchanged
-        st.session_state.setdefault("indicators", indicators)
-
-# Ensure session defaults for indicators exist
-if "indicators" not in st.session_state:
-    st.session_state["indicators"] = compute_live_indicators(st.session_state.get("answers", {}))
-
-if "indicators_prev" not in st.session_state:
-    st.session_state["indicators_prev"] = None
+    drafts.put(A.session_id, Draft(answers, indicators, lookup(answers).cost))
+    # one delta-encoded record per burst of changes, not one per widget commit;
+    # answer_key lets tools/backtest.py re-price the state under another cost model
+    get_indicator_log().update(A.session_id, {**indicators, "answer_key": answer_key(answers)},
+                               app=APP_SLUG, version=APP_VERSION)
 
 # ──────────────────────────────────────────────────────────────
 # Reset Wizard Fields
 # ──────────────────────────────────────────────────────────────
 def reset_wizard_fields():
-    """Clear all wizard-related session state values."""
-    keys_to_clear = [
-        "title_input", "contact_email_input", "industry_input", "goal_input",
-        "audience_input", "auth_input", "payments_input", "ai_features_input",
-        "integrations_input", "content_input", "branding_input",
-        "timeline_input", "budget_input"
-    ]
-    for key in keys_to_clear:
+    """Clear all wizard-related session state values and the saved draft."""
+    for key, _ in WIDGETS.values():
         if key in st.session_state:
             del st.session_state[key]
-
-    # Also clear computed indicators and answers
-    st.session_state["answers"] = {}
-    st.session_state["last_indicators"] = {}
+    drafts.delete(st.session_state.session_id)
 
 # ───────────────────────────────────────────────
 # Layout
@@ -198,13 +124,13 @@ with st.container():
     )
     industry = st.selectbox(
         "Industry",
-        ["Manufacturing", "Retail", "Services", "Education", "Other"],
+        list(WIZARD_CHOICES["industry"]),
         key="industry_input",
         on_change=update_answers
     )
     goal = st.selectbox(
         "Primary goal *",
-        ["Lead Gen", "E-commerce", "Info", "Booking", "Internal Tool"],
+        list(WIZARD_CHOICES["goal"]),
         key="goal_input",
         on_change=update_answers
     )
@@ -212,7 +138,7 @@ with st.container():
     st.markdown("### Step 2 · Features")
     audience = st.selectbox(
         "Audience size",
-        ["Small <1k", "Growing 1–10k", "Large >10k"],
+        list(WIZARD_CHOICES["audience"]),
         key="audience_input",
         on_change=update_answers
     )
@@ -228,19 +154,19 @@ with st.container():
     )
     ai_features = st.multiselect(
         "AI features",
-        ["Chatbot", "OCR", "Recommendations", "None"],
+        list(AI_OPTIONS),
         key="ai_features_input",
         on_change=update_answers
     )
     integrations = st.multiselect(
         "Integrations",
-        ["Supabase", "Stripe", "Google Sheets", "None"],
+        list(INTEGRATION_OPTIONS),
         key="integrations_input",
         on_change=update_answers
     )
     content_support = st.selectbox(
         "Content readiness",
-        ["Have copy", "Need copy", "Mixed"],
+        list(CONTENT_OPTIONS),
         key="content_input",
         on_change=update_answers
     )
@@ -248,31 +174,44 @@ with st.container():
     st.markdown("### Step 3 · Branding & Budget")
     branding = st.selectbox(
         "Branding",
-        ["Have brand kit", "Use default"],
+        list(WIZARD_CHOICES["branding"]),
         key="branding_input",
         on_change=update_answers
     )
     timeline = st.selectbox(
         "Timeline",
-        ["1 week", "2–4 weeks", ">1 month"],
+        list(WIZARD_CHOICES["timeline"]),
         key="timeline_input",
         on_change=update_answers
     )
     budget = st.selectbox(
         "Budget comfort",
-        ["Entry", "Standard", "Premium"],
+        list(WIZARD_CHOICES["budget"]),
         key="budget_input",
         on_change=update_answers
     )
 
-    submitted = st.button("✅ Submit Wizard")
-    if submitted:
-        st.success("Wizard submitted successfully! 🎉")
-        reset_wizard_fields()
-        st.rerun()
+    # validate and log before resetting: st.rerun() ends this run
+    if st.button("✅ Submit Wizard"):
+        errors = validate_answers({"title": project_name, "contact_email": contact_email, "goal": goal})
+        if errors:
+            for e in errors:
+                st.error(f"❌ {e}")
+        else:
+            _log(LOG_DREAM, "submit_wizard", {
+                "answers_count": len(draft.answers),
+                "est_cost": draft.cost["total"],
+                "answer_key": answer_key(draft.answers),
+            })
+            st.session_state["ready_for_summary"] = True
+            st.session_state["wizard_submitted"] = True
+            reset_wizard_fields()
+            st.rerun()
+    if st.session_state.pop("wizard_submitted", False):
+        st.success("Wizard submitted successfully! Answers saved. 🎉")
 
 # ──────────────────────────────────────────────────────────────
-# Live Indicators Sidebar (driven from session_state)
+# Live Indicators Sidebar (driven from the saved draft)
 # ──────────────────────────────────────────────────────────────
 with st.sidebar.expander("ℹ️ About Indicators", expanded=False):
     st.markdown("""
@@ -282,8 +221,7 @@ with st.sidebar.expander("ℹ️ About Indicators", expanded=False):
     - 🤖 *AI Tools Needed*: Number of AI features selected.
     """)
 
-# ensure indicators exist
-indicators = st.session_state.get("indicators", compute_live_indicators(st.session_state.get("answers", {})))
+indicators = draft.indicators
 
 # Display three metrics (use nice formatting)
 st.sidebar.metric("💰 Estimated Cost", f"R {indicators['estimated_cost']:.2f}")
@@ -293,18 +231,10 @@ st.sidebar.metric("🤖 AI Tools Needed", indicators["ai_tools_needed"])
 app_footer()
 
 # ───────────────────────────────────────────────
-# Persisted answers are already kept in st.session_state by the callback.
-# Compute live cost from sanctioned answers so it stays in sync with indicators.
+# Cost was computed with the indicators when the draft was saved.
 # ───────────────────────────────────────────────
-answers = st.session_state.get("answers", {})
-live_cost = compute_feature_cost(
-    answers.get("auth_needed", False),
-    answers.get("payments_needed", False),
-    answers.get("ai_features", []),
-    answers.get("integrations", []),
-    answers.get("content_support", "")
-)
-st.session_state.total_cost = live_cost["total"]
+answers = draft.answers
+live_cost = draft.cost
 
 # ───────────────────────────────────────────────
 # Sidebar live tally
@@ -315,6 +245,16 @@ with st.sidebar:
             st.write(f"- {k}: {v:.2f}")
        st.metric("Estimated Total", f"R {live_cost['total']:.2f}")
 
+# ───────────────────────────────────────────────
+# What-if panel (table lookups only)
+# ───────────────────────────────────────────────
+with st.sidebar.expander("🔀 What-if", expanded=False):
+    st.caption("Cost and risk change from toggling each option.")
+    for row in what_if(answers):
+        verb = "Remove" if row["selected"] else "Add"
+        risk = row["risk_from"] if row["risk_from"] == row["risk_to"] else f"{row['risk_from']} → {row['risk_to']}"
+        st.write(f"- {verb} {row['option']}: {row['cost_delta']:+.2f} · risk {risk}")
+
 # ──────────────────────────────────────────────────────────────
 # AI Assist Mode (ChatGPT Toggle)
 # ──────────────────────────────────────────────────────────────
@@ -326,26 +266,34 @@ use_ai = st.sidebar.toggle(
 )
 
 if use_ai:
-    if "OPENAI_API_KEY" in st.secrets:
-        openai.api_key = st.secrets["OPENAI_API_KEY"]
+    if not available("openai"):
+        st.sidebar.warning("AI Assist needs the `openai` package: `pip install openai`.")
+    elif "OPENAI_API_KEY" in st.secrets:
         st.sidebar.success("AI Assist Mode is ON – powered by OpenAI")
         user_prompt = st.text_input("💡 Describe what you want to build:")
 
         if user_prompt:
-            with st.spinner("DreamBot is thinking..."):
+            st.subheader("AI Suggestion ✨")
+            last = st.session_state.get("ai_suggestion")
+            if last and last["prompt"] == user_prompt:
+                # widget reruns re-show the finished answer instead of asking again
+                st.write(last["text"])
+            else:
+                stream = ChatStream(
+                    [
+                        {"role": "system", "content": "You are DreamBot, an AI builder assistant helping users design landing pages."},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                    surface="ai_assist",
+                    api_key=st.secrets["OPENAI_API_KEY"],
+                    cache=get_prompt_cache(),
+                )
                 try:
-                    response = openai.ChatCompletion.create(
-                        model="gpt-4o-mini",
-                        messages=[
-                            {"role": "system", "content": "You are DreamBot, an AI builder assistant helping users design landing pages."},
-                            {"role": "user", "content": user_prompt},
-                        ]
-                    )
-                    ai_suggestion = response.choices[0].message.content
-                    st.subheader("AI Suggestion ✨")
-                    st.write(ai_suggestion)
+                    st.write_stream(stream)
+                    st.session_state.ai_suggestion = {"prompt": user_prompt, "text": stream.text}
                 except Exception as e:
                     st.error(f"AI Assist Error: {e}")
+                _log(LOG_DREAM, "ai.stream", stream.stats.as_payload())
     else:
         st.sidebar.warning("Missing OpenAI API key. Add it to st.secrets before enabling AI Assist Mode.")
 else:
@@ -364,27 +312,3 @@ All AI outputs are for informational use only and may contain errors.
 © 2025 Milky Roads / MilkBox AI
 </small>
 """, unsafe_allow_html=True)
-
-# ───────────────────────────────────────────────
-# Validation + Logging on submit
-# ───────────────────────────────────────────────
-if submitted:
-    errors = []
-    if not (1 <= len(project_name.strip()) <= 60):
-        errors.append("❌ Project name must be 1–60 characters.")
-    if not _validate_email(contact_email):
-        errors.append("❌ Invalid email format.")
-    if not goal.strip():
-        errors.append("❌ Primary goal is required.")
-
-    if errors:
-        for e in errors:
-            st.error(e)
-    else:
-        _log(LOG_DREAM, "submit_wizard", {
-            "answers_count": len(st.session_state.answers),
-            "est_cost": st.session_state.total_cost,
-        })
-        st.success("Wizard submitted successfully! Answers saved.")
-
-        st.session_state["ready_for_summary"] = True
@@ -1,9 +1,8 @@
 import streamlit as st
-import json, base64, qrcode
-from io import BytesIO
-from pathlib import Path
+import json
 from datetime import datetime, timezone
 import uuid, os
+from utils.core import APP_SLUG, LOG_EVENTS, get_drafts, log_event, qr_available, render_qr
 
 def app_footer():
     st.markdown("""
@@ -13,34 +12,20 @@ def app_footer():
         </p>
     """, unsafe_allow_html=True)
 
-def qr_png_base64(text: str) -> str:
-    img = qrcode.make(text)
-    buf = BytesIO()
-    img.save(buf, format="PNG")
-    return base64.b64encode(buf.getvalue()).decode()
-
-LOG_PATH = Path("data/cockpit/events.jsonl")
-os.makedirs(LOG_PATH.parent, exist_ok=True)
-
 def _log(event, payload=None):
-    evt = {
-        "ts": datetime.now(timezone.utc).isoformat(),
-        "user": "local-dev",
-        "tool": "dream-landing",
-        "action": event,
-        "payload": payload or {},
-        "session": str(uuid.uuid4()),
-    }
-    with LOG_PATH.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(evt) + "\n")
+    log_event(LOG_EVENTS, event, payload, user="local-dev", tool=APP_SLUG, session=str(uuid.uuid4()))
 
 st.title("📋 Project Summary & Export")
 st.markdown("Review your current project summary and export options.")
 
+# the Wizard's saved draft (this tab's, or the one in ?draft=<session_id>)
+session_id = st.session_state.get("session_id") or st.query_params.get("draft")
+draft = get_drafts().get(session_id) if session_id else None
+answers = draft.answers if draft else {}
 summary = {
-    "title": st.session_state.get("answers", {}).get("title", "Untitled"),
-    "goal": st.session_state.get("answers", {}).get("goal", ""),
-    "estimated_cost_r": st.session_state.get("total_cost", 0),
+    "title": answers.get("title", "Untitled"),
+    "goal": answers.get("goal", ""),
+    "estimated_cost_r": draft.cost["total"] if draft else 0,
 }
 
 st.code(json.dumps(summary, indent=2, ensure_ascii=False))
@@ -51,9 +36,15 @@ with col1:
         st.success("Copied to clipboard (simulated).")
         _log("summary.copy", summary)
 with col2:
+    qr_format = st.radio("QR format", ["svg", "png"], horizontal=True, format_func=str.upper)
     if st.button("📱 Generate QR Code"):
-        img_b64 = qr_png_base64(json.dumps(summary))
-        st.image("data:image/png;base64," + img_b64, caption="Scan to view summary")
-        _log("summary.qr_generated", summary)
+        if not qr_available(qr_format):
+            st.warning("QR generation unavailable. Install 'qrcode[pil]' and 'pillow' to enable this feature.")
+            st.stop()
+        # cached by content: the same summary is rendered once, for every session
+        qr = render_qr(json.dumps(summary), qr_format)
+        st.image(qr.data.decode() if qr.fmt == "svg" else qr.data, caption="Scan to view summary")
+        st.download_button("⬇️ Download QR", qr.data, file_name=f"summary-qr.{qr.fmt}", mime=qr.mime)
+        _log("summary.qr_generated", {**summary, "qr_key": qr.key, "qr_format": qr.fmt})
 
 app_footer()
\ No newline at end of file
@@ -1,6 +1,7 @@
 import streamlit as st
 import json
-from pathlib import Path
+from utils.core import LOG_EVENTS, get_store, iter_events_reverse, recent_states, store_enabled
+from utils.coalescer import SNAPSHOT_EVERY, STATE_EVENTS
 
 st.markdown("""
 <style>
@@ -19,35 +20,30 @@ st.set_page_config(page_title="Indicators Debug", page_icon="📊", layout="wide
 st.title("📊 Indicators Debug Panel")
 st.caption("Quick view of the latest indicator updates from Cockpit logs.")
 
-LOG_PATH = Path("data/cockpit/events.jsonl")
+LOG_PATH = LOG_EVENTS
 
 # ──────────────────────────────────────────────────────────────
 # Load and Filter Cockpit Events
 # ──────────────────────────────────────────────────────────────
-def load_indicator_events(limit: int = 10):
-    """Load the most recent indicator.update events."""
-    if not LOG_PATH.exists():
-        return []
-
-    with open(LOG_PATH, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    events = []
-    for line in reversed(lines):
-        try:
-            evt = json.loads(line)
-            if evt.get("action") == "indicator.update":
-                events.append(evt)
-            if len(events) >= limit:
-                break
-        except json.JSONDecodeError:
-            continue
-    return events
+def load_indicator_events(limit: int = 10, session: str | None = None):
+    """The most recent indicator states (optionally for one session).
+
+    The Wizard logs full `indicator.update` snapshots and `indicator.delta`
+    records in between; recent_states() rebuilds the full state of each.
+    """
+    if store_enabled():
+        # enough rows to reach back to the snapshots the newest records build on
+        events = get_store().recent(log=LOG_PATH.stem, name=STATE_EVENTS, session=session,
+                                    limit=limit * (SNAPSHOT_EVERY + 1))
+    else:
+        events = iter_events_reverse(LOG_PATH)
+    return recent_states(events, limit, session=session)
 
 # ──────────────────────────────────────────────────────────────
 # Display Section
 # ──────────────────────────────────────────────────────────────
-events = load_indicator_events()
+session_filter = st.text_input("Session ID (optional)", placeholder="filter by session")
+events = load_indicator_events(session=session_filter.strip() or None)
 
 if not events:
     st.info("No indicator updates found yet. Interact with the Wizard first to generate logs.")
@@ -56,6 +52,8 @@ else:
 
     for evt in events:
         with st.expander(f"🕒 {evt['ts']}", expanded=False):
+            if evt["partial"]:
+                st.caption("Rebuilt from deltas without their snapshot (rotated away?); fields may be missing.")
             st.json(evt["payload"])
 
 
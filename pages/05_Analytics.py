@@ -0,0 +1,60 @@
+import streamlit as st
+import pandas as pd
+from utils.core import get_rollups
+
+# ──────────────────────────────────────────────────────────────
+# Page Config
+# ──────────────────────────────────────────────────────────────
+st.set_page_config(page_title="Analytics", page_icon="📈", layout="wide")
+
+st.title("📈 Cockpit Analytics")
+st.caption("Rollups over the cockpit logs. Each refresh only reads events appended since the last one.")
+
+days = st.sidebar.slider("Window (days)", min_value=1, max_value=90, value=7)
+
+engine = get_rollups()
+added = engine.refresh()
+summary = engine.summary(days=days)
+
+# ──────────────────────────────────────────────────────────────
+# Headline numbers
+# ──────────────────────────────────────────────────────────────
+submit_costs = summary["cost_percentiles"]["submit_wizard"]
+live_costs = summary["cost_percentiles"]["indicator.update"]
+
+
+def rands(value) -> str:
+    """Cost in the Wizard's format ("R 45.00"), or a dash when there is no data."""
+    return f"R {value:.2f}" if value is not None and pd.notna(value) else "—"
+
+
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("Submissions today", summary["submissions_today"])
+c2.metric(f"Submissions ({days}d)", summary["submissions_window"])
+c3.metric(f"Median submitted cost ({days}d)", rands(submit_costs["p50"]))
+c4.metric(f"Median live estimate ({days}d)", rands(live_costs["p50"]))
+
+# ──────────────────────────────────────────────────────────────
+# Charts
+# ──────────────────────────────────────────────────────────────
+st.subheader("Events per hour")
+hourly = engine.hourly_frame(days=days)
+if hourly.empty:
+    st.info("No events in this window yet.")
+else:
+    names = st.multiselect("Events", list(hourly.columns), default=list(hourly.columns))
+    st.line_chart(hourly[names] if names else hourly)
+
+left, right = st.columns(2)
+with left:
+    st.subheader("Cost percentiles")
+    st.dataframe(pd.DataFrame(summary["cost_percentiles"]).T.map(rands))
+with right:
+    st.subheader("Risk level distribution")
+    risk = summary["risk_distribution"]
+    if risk:
+        st.bar_chart(pd.Series(risk, name="updates").reindex(["Low", "Medium", "High"]).dropna())
+    else:
+        st.info("No indicator updates in this window.")
+
+st.caption(f"{summary['events_processed']:,} events processed in total · {added:,} new on this refresh")
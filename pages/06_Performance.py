@@ -0,0 +1,52 @@
+import streamlit as st
+import pandas as pd
+from utils.core import LOG_PERF, get_profiler
+from utils.spans import load_flushed, summarize
+from datetime import datetime, timedelta, timezone
+
+# ──────────────────────────────────────────────────────────────
+# Page Config
+# ──────────────────────────────────────────────────────────────
+st.set_page_config(page_title="Performance", page_icon="⏱️", layout="wide")
+
+st.title("⏱️ Performance")
+st.caption("Sampled timing spans: Wizard callbacks, cost model, Milkbot, log readers, QR rendering, "
+           "OpenAI calls, cockpit writes and API handlers.")
+
+profiler = get_profiler()
+
+# ──────────────────────────────────────────────────────────────
+# Sampling switch (this Streamlit server process; the API reads PERF_SAMPLE_RATE)
+# ──────────────────────────────────────────────────────────────
+RATES = {"Off": 0.0, "1%": 0.01, "10%": 0.1, "100%": 1.0}
+current = next((label for label, rate in RATES.items() if rate == profiler.sample_rate),
+               f"{profiler.sample_rate:.0%}")
+labels = list(RATES) if current in RATES else [current, *RATES]  # keep a custom PERF_SAMPLE_RATE selectable
+choice = st.sidebar.radio("Sampling", labels, index=labels.index(current),
+                          help="Share of spans recorded. Spans inside a sampled span are always recorded.")
+if choice in RATES and RATES[choice] != profiler.sample_rate:
+    profiler.sample_rate = RATES[choice]
+if st.sidebar.button("Flush to cockpit now"):
+    st.sidebar.success(f"{profiler.flush()} spans written to {LOG_PERF}")
+
+# ──────────────────────────────────────────────────────────────
+# Span percentiles
+# ──────────────────────────────────────────────────────────────
+source = st.radio("Source", ["This server (live)", "Cockpit log (all processes)"], horizontal=True)
+if source.startswith("This server"):
+    hists = profiler.snapshot()
+else:
+    hours = st.slider("Window (hours)", min_value=1, max_value=168, value=24)
+    hists = load_flushed(LOG_PERF, since=datetime.now(timezone.utc) - timedelta(hours=hours))
+
+rows = summarize(hists)
+if not rows:
+    st.info("No spans recorded yet. Use the app (or raise the sampling rate) and come back.")
+else:
+    df = pd.DataFrame(rows).set_index("span")
+    st.dataframe(df)
+    st.subheader("p95 by span (ms)")
+    st.bar_chart(df["p95_ms"])
+
+st.caption(f"Sampling {profiler.sample_rate:.0%} · flushed every {profiler.flush_interval:g}s to {LOG_PERF}. "
+           "Percentiles come from log-spaced buckets (about ±9%).")
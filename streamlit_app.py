@@ -7,12 +7,16 @@ import os
 from pathlib import Path
 from typing import Dict, Any
 import streamlit as st
-import json, os
+import json, os, uuid
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Dict, Any, List
 from dotenv import load_dotenv
-from utils.cockpit import write_cockpit_event
+from utils.core import (DATA_DIR, COCKPIT_DIR, UPLOADS_DIR, LOG_DREAM, LOG_EVENTS, LOG_MILKBOT,
+                        ChatStream, client_stats, follow, get_prompt_cache, get_store, log_event, span,
+                        store_enabled, write_cockpit_event)
+from utils.lazy import available
+from utils.milkbot import GREETING, MODEL as MILKBOT_MODEL, OFFLINE_REPLY, SYSTEM_PROMPT, TEMPERATURE
 
 # Inject custom CSS
 def local_css(file_name: str):
@@ -64,14 +68,12 @@ def app_footer():
         </p>
     """, unsafe_allow_html=True)
 
-@st.cache_data(ttl=60)
+@span("app.load_recent_logs")
 def load_recent_logs(path: Path, limit: int = 25):
-    """Load the most recent cockpit events from JSONL."""
-    if not path.exists():
-        return []
-    with path.open("r", encoding="utf-8") as f:
-        lines = f.readlines()[-limit:]
-    return [json.loads(line) for line in lines if line.strip()]
+    """Load the most recent cockpit events (oldest of them first)."""
+    if store_enabled():
+        return get_store().recent(log=path.stem, limit=limit)[::-1]
+    return follow(path, limit)[::-1]
 
 # ──────────────────────────────────────────────────────────────
 # Hero Section + Navigation Buttons + Cockpit Logs
@@ -100,56 +102,35 @@ st.markdown("""
 # App constants & storage
 # ──────────────────────────────────────────────────────────────
 APP_NAME = "MilkBox AI — Dream Landing Page"
-DATA_DIR = Path("data")
-COCKPIT_DIR = DATA_DIR / "cockpit"
-UPLOADS_DIR = DATA_DIR / "uploads"
 for p in (DATA_DIR, COCKPIT_DIR, UPLOADS_DIR):
     p.mkdir(parents=True, exist_ok=True)
 
-LOG_DREAM = COCKPIT_DIR / "dream_landing.jsonl"
-LOG_MILKBOT = COCKPIT_DIR / "milkbot_chat.jsonl"
-
 # ──────────────────────────────────────────────────────────────
 # Milkbot (built-in chat)
 # ──────────────────────────────────────────────────────────────
-SYSTEM_PROMPT = (
-    "You are Milkbot: blunt but kind, forward-thinking, Gen-Z witty. "
-    "Compliance-first: receipts-first, human-in-the-loop, no hallucinations. "
-    "Use clear, step-by-step instructions when asked. Keep answers tight."
-)
-
-def _log(logfile: Path, event: str, payload: dict):
+def _log(logfile: Path, event: str, payload: dict, **fields):
     """Append a log entry to a JSONL file."""
-    entry = {
-        "ts": datetime.now(timezone.utc).isoformat(),
-        "event": event,
-        "payload": payload,
-    }
-    logfile.parent.mkdir(parents=True, exist_ok=True)
-    with logfile.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(entry) + "\n")
+    log_event(logfile, event, payload, **fields)
 
+@span("app.milkbot_tab")
 def milkbot_tab():
     from typing import List, Dict
-    # OpenAI client (lazy import so app runs even without package)
-    client = None
-    model_name = "gpt-4o-mini"
-    try:
-        from openai import OpenAI
-        if st.secrets.get("OPENAI_API_KEY"):
-            client = OpenAI()
-    except Exception:
-        client = None
+    # OpenAI is only imported once a message is actually sent
+    can_chat = available("openai") and bool(OPENAI_API_KEY)
+    model_name = MILKBOT_MODEL
 
     st.subheader("💬 Milkbot")
-    if not client:
+    if not can_chat:
         st.info("Set `OPENAI_API_KEY` and install `openai` to chat. `pip install openai`", icon="ℹ️")
 
     if "milkbot_messages" not in st.session_state:
         st.session_state.milkbot_messages = [
             {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "assistant", "content": "Hey! I’m Milkbot. What do you need built?"}
+            {"role": "assistant", "content": GREETING}
         ]
+        # lets the prompt-cache warm-up rebuild each conversation from the log
+        st.session_state.milkbot_session = str(uuid.uuid4())
+    session = st.session_state.get("milkbot_session")
 
     # Show history (skip system)
     for msg in st.session_state.milkbot_messages:
@@ -164,24 +145,33 @@ def milkbot_tab():
 
     # Log + append user
     st.session_state.milkbot_messages.append({"role": "user", "content": user_msg})
-    _log(LOG_MILKBOT, "user.msg", {"msg": user_msg})
+    _log(LOG_MILKBOT, "user.msg", {"msg": user_msg}, session=session)
 
-    # Respond (if client available), else echo fallback
+    # Respond (streamed, if available), else echo fallback
+    with st.chat_message("user"):
+        st.markdown(user_msg)
     with st.chat_message("assistant"):
-        if client:
-            with st.spinner("Thinking…"):
-                resp = client.chat.completions.create(
-                    model=model_name,
-                    messages=st.session_state.milkbot_messages,
-                    temperature=0.4,
-                )
-                answer = resp.choices[0].message.content or "…"
+        if can_chat:
+            stream = ChatStream(
+                st.session_state.milkbot_messages,
+                model=model_name,
+                surface="milkbot",
+                api_key=OPENAI_API_KEY,
+                cache=get_prompt_cache(),
+                temperature=TEMPERATURE,
+            )
+            try:
+                st.write_stream(stream)
+            except Exception as e:
+                st.error(f"Milkbot error: {e}")
+            answer = stream.text or "…"
+            _log(LOG_MILKBOT, "ai.stream", stream.stats.as_payload(), session=session)
         else:
-            answer = "Milkbot offline (no API key). Add OPENAI_API_KEY and `pip install openai`."
-        st.markdown(answer)
+            answer = OFFLINE_REPLY
+            st.markdown(answer)
 
     st.session_state.milkbot_messages.append({"role": "assistant", "content": answer})
-    _log(LOG_MILKBOT, "assistant.msg", {"msg": answer})
+    _log(LOG_MILKBOT, "assistant.msg", {"msg": answer}, session=session)
 
 st.divider()
 
@@ -226,9 +216,27 @@ with tab_preflight:
     st.subheader("System Information")
     st.json(results)
 
+    st.subheader("HTTP clients")
+    st.caption("Shared keep-alive clients in this process: requests sent, new connections opened, reuse and retries.")
+    st.json(client_stats() or {"info": "no outbound calls yet"})
+
+    st.subheader("Connectors")
+    st.caption("Validation results are cached per connector and config; repeated network failures open a "
+               "circuit breaker that fails fast and re-probes in the background.")
+    from connectors import REGISTRY
+    from connectors.base import STEP_CACHE
+    if st.button("Validate connectors"):
+        cfg = {"OPENAI_API_KEY": OPENAI_API_KEY}
+        for name in REGISTRY:
+            res = STEP_CACHE.validate(REGISTRY[name], cfg)
+            if res.ok:
+                st.success(f"✅ {name}: {res.data}")
+            else:
+                st.warning(f"⚠️ {name}: {res.error}")
+    st.json(STEP_CACHE.snapshot())
+
 # Hidden cockpit logs for internal viewing
-LOG_FILE = Path("data/cockpit/events.jsonl")
-LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+LOG_FILE = LOG_EVENTS
 
 with st.expander("📊 Cockpit (internal logs)", expanded=False):
     logs = load_recent_logs(LOG_FILE)
@@ -0,0 +1,156 @@
+"""Orchestrator lifecycle with in-process fake connectors.
+
+Run from the repo root:  python -m pytest -q
+"""
+import pytest
+
+from connectors.fake import FakeConnector
+from connectors.orchestrator import Orchestrator
+
+
+def make(*connectors, **kwargs) -> Orchestrator:
+    # log_path=None keeps test runs out of the cockpit
+    return Orchestrator({c.name: c for c in connectors}, log_path=None, **kwargs)
+
+
+def steps(report, step: str):
+    return {r.connector: r for r in report.steps if r.step == step}
+
+
+def finished_ms(record) -> float:
+    return record.started_ms + record.elapsed_ms
+
+
+class RaisingConnector(FakeConnector):
+    def provision(self, spec, did):
+        raise RuntimeError("quota exceeded")
+
+
+# ──────────────────────────────────────────────────────────────
+# Dependency ordering
+# ──────────────────────────────────────────────────────────────
+def test_order_puts_dependencies_first():
+    orch = make(FakeConnector("web", depends_on=("api",)), FakeConnector("api", depends_on=("db",)),
+                FakeConnector("db"), FakeConnector("cdn"))
+    order = orch.order(["web", "api", "db", "cdn"])
+    assert order.index("db") < order.index("api") < order.index("web")
+    assert sorted(order) == ["api", "cdn", "db", "web"]
+
+
+def test_order_rejects_cycles_and_missing_dependencies():
+    orch = make(FakeConnector("a", depends_on=("b",)), FakeConnector("b", depends_on=("a",)),
+                FakeConnector("c", depends_on=("ghost",)))
+    with pytest.raises(ValueError, match="cycle"):
+        orch.order(["a", "b"])
+    with pytest.raises(ValueError, match="ghost"):
+        orch.order(["c"])
+
+
+def test_deps_argument_overrides_connector_attribute():
+    orch = make(FakeConnector("api"), FakeConnector("db"), deps={"db": ("api",)})
+    assert orch.order(["db", "api"]) == ["api", "db"]
+
+
+def test_provision_waits_for_dependency_smoke_test():
+    db = FakeConnector("db", latency=0.05)
+    api = FakeConnector("api", latency=0.05, depends_on=("db",))
+    web = FakeConnector("web", latency=0.05, depends_on=("api",))
+    report = make(web, api, db).run({}, {}, did="t1")
+
+    assert report.ok and report.failed is None
+    provision, smoke = steps(report, "provision"), steps(report, "smoke_test")
+    assert provision["api"].started_ms >= finished_ms(smoke["db"])
+    assert provision["web"].started_ms >= finished_ms(smoke["api"])
+    assert report.provisioned == ["db", "api", "web"]
+    assert report.rolled_back == []
+    assert report.results("smoke_test")["api"].data["checked"] == "api-t1"
+
+
+def test_independent_connectors_run_concurrently():
+    fakes = [FakeConnector(name, latency=0.1) for name in ("a", "b", "c", "d")]
+    report = make(*fakes).run({}, {}, did="t2")
+
+    assert report.ok
+    # 4 connectors x 4 steps x 0.1 s serially; concurrently it is one chain of 4 steps
+    assert report.wall_ms < report.busy_ms / 2
+
+
+# ──────────────────────────────────────────────────────────────
+# Timeouts and failures
+# ──────────────────────────────────────────────────────────────
+def test_step_timeout_fails_the_run_and_rolls_back_the_provision():
+    slow = FakeConnector("slow", latency={"provision": 0.5})
+    report = make(slow, timeouts={"provision": 0.1}).run({}, {}, did="t3")
+
+    assert not report.ok
+    assert report.failed == ("slow", "provision")
+    record = steps(report, "provision")["slow"]
+    assert not record.result.ok and "timed out after 0.1s" in record.result.error
+    assert record.elapsed_ms < 400
+    # a timed-out provision may still complete, so it is torn down anyway
+    assert report.rolled_back == ["slow"]
+    assert "smoke_test" not in [step for step, _ in slow.calls]
+
+
+def test_validate_failure_provisions_nothing():
+    good = FakeConnector("good", latency=0.01)
+    bad = FakeConnector("bad", latency=0.01, fail={"validate"})
+    report = make(good, bad).run({}, {}, did="t4")
+
+    assert not report.ok
+    assert report.failed == ("bad", "validate")
+    assert report.provisioned == [] and report.rolled_back == []
+    assert {step for step, _ in good.calls} == {"validate", "estimate_cost"}
+
+
+def test_step_exception_is_a_failed_result():
+    report = make(RaisingConnector("boom", latency=0.01)).run({}, {}, did="t5")
+
+    assert not report.ok
+    assert report.failed == ("boom", "provision")
+    assert report.results("provision")["boom"].error == "RuntimeError: quota exceeded"
+    assert report.provisioned == []
+
+
+def test_failure_stops_scheduling_dependents():
+    db = FakeConnector("db", latency=0.02, fail={"smoke_test"})
+    api = FakeConnector("api", latency=0.02, depends_on=("db",))
+    report = make(db, api).run({}, {}, did="t6")
+
+    assert not report.ok
+    assert report.failed == ("db", "smoke_test")
+    assert "provision" not in [step for step, _ in api.calls]
+    assert report.rolled_back == ["db"]
+
+
+# ──────────────────────────────────────────────────────────────
+# Teardown
+# ──────────────────────────────────────────────────────────────
+def test_teardown_runs_in_reverse_provision_order():
+    db = FakeConnector("db", latency=0.02)
+    cache = FakeConnector("cache", latency=0.02, depends_on=("db",))
+    api = FakeConnector("api", latency=0.02, depends_on=("cache",))
+    cdn = FakeConnector("cdn", latency={"provision": 0.3}, fail={"smoke_test"})
+    report = make(db, cache, api, cdn).run({}, {}, did="t7")
+
+    assert not report.ok
+    assert report.failed == ("cdn", "smoke_test")
+    assert set(report.provisioned) == {"db", "cache", "api", "cdn"}
+    assert report.rolled_back == list(reversed(report.provisioned))
+    # dependents are removed before what they depend on, one at a time
+    teardown = steps(report, "teardown")
+    assert finished_ms(teardown["api"]) <= teardown["cache"].started_ms
+    assert finished_ms(teardown["cache"]) <= teardown["db"].started_ms
+    assert teardown["db"].result.data["removed"] == "db-t7"
+
+
+def test_failed_teardown_is_recorded_but_not_the_run_failure():
+    db = FakeConnector("db", latency=0.01, fail={"teardown"})
+    api = FakeConnector("api", latency=0.01, depends_on=("db",), fail={"smoke_test"})
+    report = make(db, api).run({}, {}, did="t8")
+
+    assert report.failed == ("api", "smoke_test")
+    assert report.rolled_back == ["api", "db"]
+    teardown = report.results("teardown")
+    assert teardown["api"].ok
+    assert not teardown["db"].ok and teardown["db"].error == "db: injected teardown failure"
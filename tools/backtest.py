@@ -0,0 +1,339 @@
+"""Re-price past quotes from the cockpit logs under another cost-model version.
+
+Scans the `submit_wizard`, `indicator.update` and `indicator.delta` records
+in data/cockpit/*.jsonl (and their rotated segments). Each record is priced
+under two cost models, `--against` (default: the live one) and `--model`,
+and the per-record and aggregate differences in totals and risk levels are
+reported. Models come from utils.estimator.COST_MODELS; `--set` derives an
+unregistered variant for a what-if:
+
+    python -m tools.backtest --set ai=12 --set integrations_cap=8
+    python -m tools.backtest --model 3.3 --records changed.jsonl --json summary.json
+    python -m tools.backtest data/cockpit/events.jsonl --workers 4 --chunk-mb 128
+
+Only records that carry the price-relevant answers can be re-priced: the
+11-bit `answer_key` the Wizard logs with every quote, or the full answers
+of old `submit_wizard` records. Records that only kept a price are counted
+as "no answers".
+
+Files are split into --chunk-mb byte ranges at line boundaries. The ranges
+are scanned in a process pool with byte-level regexes, and JSON is parsed
+only for legacy records and the records written out. A worker returns
+counts per answer key. Every answer key is priced once per model from the
+lookup table, so the cost of a record does not depend on the cost model.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.answers import WIZARD_DEFAULTS
+from utils.coalescer import DELTA_EVENT, SNAPSHOT_EVENT
+from utils.estimator import COST_MODEL, COST_MODELS, CostModel, get_cost_model
+from utils.lookup import KEY_SPACE, answer_key, get_table, lookup
+from utils.paths import COCKPIT_DIR, LOG_EVENTS
+from utils.rotation import load_manifest, read_segment, segments_dir
+from utils.spans import get_profiler
+
+EVENTS = ("submit_wizard", SNAPSHOT_EVENT, DELTA_EVENT)
+# old submit_wizard payloads (the "action" record shape) used short keys
+LEGACY_KEYS = {"project_name": "title", "email": "contact_email", "auth": "auth_needed",
+               "payments": "payments_needed", "ai": "ai_features", "content": "content_support"}
+
+# answer_key is only ever written by the schema-v1 writer, so one compact layout is enough
+KEYED_RE = re.compile(rb'"event":"(submit_wizard|indicator\.(?:update|delta))","payload":\{[^\n]*?"answer_key":(\d+)')
+EVENT_COUNT_NEEDLES = tuple(b'"' + name.encode() + b'"' for name in EVENTS)
+
+
+# ──────────────────────────────────────────────────────────────
+# Scanning (runs in the worker processes)
+# ──────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class Task:
+    path: str
+    start: int = 0
+    end: int = 0
+    segment: Optional[Dict[str, Any]] = None  # a rotated gzip segment, read whole
+
+    @property
+    def size(self) -> int:
+        return self.segment.get("bytes", 0) if self.segment else self.end - self.start
+
+
+@dataclass
+class ScanResult:
+    counts: Counter = field(default_factory=Counter)           # (event, answer_key) -> records
+    loose: List[Dict[str, Any]] = field(default_factory=list)  # legacy records without a key
+    rows: List[Dict[str, Any]] = field(default_factory=list)   # per-record output (keyed records)
+    seen: Counter = field(default_factory=Counter)             # event -> records, priced or not
+
+
+def read_range(path: str, start: int, end: int) -> bytes:
+    """The lines that start inside [start, end) of a file."""
+    with open(path, "rb") as f:
+        if start:
+            f.seek(start - 1)
+            f.readline()  # the line straddling `start` belongs to the previous range
+        begin = f.tell()
+        if begin >= end:
+            return b""
+        data = f.read(end - begin)
+        if data and not data.endswith(b"\n"):
+            data += f.readline()
+    return data
+
+
+def _line_bounds(data: bytes, pos: int) -> Tuple[int, int]:
+    end = data.find(b"\n", pos)
+    return data.rfind(b"\n", 0, pos) + 1, end if end != -1 else len(data)
+
+
+def _row(task: Task, line: bytes, event: str) -> Dict[str, Any]:
+    try:
+        d = json.loads(line)
+    except ValueError:
+        d = {}
+    return {"file": Path(task.path).name, "ts": d.get("ts"), "event": event, "session": d.get("session")}
+
+
+def legacy_answers(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {LEGACY_KEYS.get(k, k): v for k, v in payload.items() if LEGACY_KEYS.get(k, k) in WIZARD_DEFAULTS}
+
+
+def scan(task: Task, wanted: Optional[frozenset] = None) -> ScanResult:
+    """Count re-priceable records per answer key; collect rows whose key is in `wanted`."""
+    data = b"\n".join(read_segment(task.path, task.segment)) if task.segment else \
+        read_range(task.path, task.start, task.end)
+    result = ScanResult()
+    for name, needle in zip(EVENTS, EVENT_COUNT_NEEDLES):
+        result.seen[name] = data.count(needle)
+
+    if wanted is None:
+        # findall + Counter keep the per-record work in C
+        for (event, key), n in Counter(KEYED_RE.findall(data)).items():
+            result.counts[event.decode(), int(key)] += n
+    else:
+        for m in KEYED_RE.finditer(data):
+            event, key = m.group(1).decode(), int(m.group(2))
+            result.counts[event, key] += 1
+            if key in wanted:
+                start, end = _line_bounds(data, m.start())
+                result.rows.append({**_row(task, data[start:end], event), "answer_key": key})
+
+    # legacy submits carry the answers themselves; they are rare, so parse them one by one
+    pos = data.find(b'"submit_wizard"')
+    while pos != -1:
+        start, end = _line_bounds(data, pos)
+        line, pos = data[start:end], data.find(b'"submit_wizard"', end)
+        if b'"answer_key"' in line or (b'"auth"' not in line and b'"ai"' not in line):
+            continue
+        try:
+            payload = json.loads(line).get("payload") or {}
+        except ValueError:
+            continue
+        answers = legacy_answers(payload)
+        key = answer_key(answers)
+        if key is not None:
+            result.counts["submit_wizard", key] += 1
+            if wanted is not None and key in wanted:
+                result.rows.append({**_row(task, line, "submit_wizard"), "answer_key": key})
+        else:
+            result.loose.append({**_row(task, line, "submit_wizard"), "answers": answers})
+    return result
+
+
+def _scan_all(tasks: List[Task], wanted: Optional[frozenset], workers: int) -> Iterator[ScanResult]:
+    """Results in task order, with at most 2 x workers tasks submitted ahead."""
+    if workers <= 1:
+        for task in tasks:
+            yield scan(task, wanted)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(scan, task, wanted))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def default_logs() -> List[Path]:
+    """data/cockpit/*.jsonl, plus logs that currently exist only as rotated segments."""
+    logs = set(COCKPIT_DIR.glob("*.jsonl"))
+    logs |= {COCKPIT_DIR / mf.name.replace(".manifest.json", ".jsonl")
+             for mf in segments_dir(LOG_EVENTS).glob("*.manifest.json")}
+    return sorted(logs)
+
+
+def plan(paths: Iterable[Path], chunk_bytes: int) -> List[Task]:
+    """Byte-range tasks for each log, plus one task per rotated segment (oldest first)."""
+    tasks = []
+    for path in paths:
+        tasks += [Task(str(path), segment=seg) for seg in load_manifest(path)]
+        size = path.stat().st_size if path.exists() else 0
+        tasks += [Task(str(path), start, min(start + chunk_bytes, size)) for start in range(0, size, chunk_bytes)]
+    return tasks
+
+
+# ──────────────────────────────────────────────────────────────
+# Pricing + aggregation
+# ──────────────────────────────────────────────────────────────
+def price_keys(model: CostModel) -> Tuple[List[float], List[str]]:
+    """Total and risk level for every answer key under `model`."""
+    table = get_table(model)
+    return [e.cost["total"] for e in table], [e.indicators["risk_level"] for e in table]
+
+
+def derive_model(base: CostModel, overrides: List[str]) -> CostModel:
+    """`base` with FIELD=VALUE overrides; the version records them (e.g. "3.2+ai=12")."""
+    if not overrides:
+        return base
+    known = {f.name for f in fields(CostModel)} - {"version"}
+    changes = {}
+    for item in overrides:
+        name, _, value = item.partition("=")
+        if name not in known or not value:
+            raise ValueError(f"--set expects FIELD=NUMBER with FIELD one of {', '.join(sorted(known))}: {item!r}")
+        changes[name] = float(value)
+    label = ",".join(f"{k}={v:g}" for k, v in changes.items())
+    return replace(base, version=f"{base.version}+{label}", **changes)
+
+
+class Backtest:
+    """Aggregate diff of `against` -> `model` over scanned records."""
+
+    def __init__(self, model: CostModel, against: CostModel):
+        self.model, self.against = model, against
+        self.new_total, self.new_risk = price_keys(model)
+        self.old_total, self.old_risk = price_keys(against)
+        self.changed_keys = frozenset(k for k in range(KEY_SPACE) if self.old_total[k] != self.new_total[k]
+                                      or self.old_risk[k] != self.new_risk[k])
+        self.by_event = {name: Counter() for name in EVENTS}
+        self.risk_moves: Counter = Counter()
+        self.deltas: Counter = Counter()
+        self.old_sum = self.new_sum = 0.0
+
+    def _add(self, event: str, n: int, old: float, new: float, old_risk: str, new_risk: str):
+        stats = self.by_event[event]
+        stats["priced"] += n
+        stats["changed"] += n if (old != new or old_risk != new_risk) else 0
+        self.old_sum += n * old
+        self.new_sum += n * new
+        self.risk_moves[old_risk, new_risk] += n
+        self.deltas[round(new - old, 2)] += n
+
+    def add(self, result: ScanResult) -> List[Dict[str, Any]]:
+        """Fold in one scan; returns its per-record diff rows."""
+        for name, n in result.seen.items():
+            self.by_event[name]["seen"] += n
+        for (event, key), n in result.counts.items():
+            self._add(event, n, self.old_total[key], self.new_total[key], self.old_risk[key], self.new_risk[key])
+        rows = [self._diff(row, self.old_total[k], self.new_total[k], self.old_risk[k], self.new_risk[k])
+                for row in result.rows for k in (row["answer_key"],)]
+        for row in result.loose:
+            old, new = lookup(row["answers"], self.against), lookup(row["answers"], self.model)
+            old_risk, new_risk = old.indicators["risk_level"], new.indicators["risk_level"]
+            self._add(row["event"], 1, old.cost["total"], new.cost["total"], old_risk, new_risk)
+            rows.append(self._diff(row, old.cost["total"], new.cost["total"], old_risk, new_risk))
+        return rows
+
+    @staticmethod
+    def _diff(row: Dict[str, Any], old: float, new: float, old_risk: str, new_risk: str) -> Dict[str, Any]:
+        return {**row, "old_total": old, "new_total": new, "delta": round(new - old, 2),
+                "old_risk": old_risk, "new_risk": new_risk}
+
+    def summary(self) -> Dict[str, Any]:
+        priced = sum(s["priced"] for s in self.by_event.values())
+        changed = sum(s["changed"] for s in self.by_event.values())
+        return {
+            "model": self.model.as_dict(), "against": self.against.as_dict(),
+            "events": {name: {"seen": s["seen"], "priced": s["priced"], "changed": s["changed"],
+                              "no_answers": max(s["seen"] - s["priced"], 0)} for name, s in self.by_event.items()},
+            "priced": priced, "changed": changed,
+            "old_total": round(self.old_sum, 2), "new_total": round(self.new_sum, 2),
+            "delta_total": round(self.new_sum - self.old_sum, 2),
+            "delta_mean": round((self.new_sum - self.old_sum) / priced, 4) if priced else None,
+            "risk_moves": {f"{a}->{b}": n for (a, b), n in sorted(self.risk_moves.items())},
+            "deltas": {f"{d:+g}": n for d, n in sorted(self.deltas.items())},
+        }
+
+
+# ──────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────
+def print_report(s: Dict[str, Any], scanned: int, tasks: int, elapsed: float):
+    print(f"cost model {s['against']['version']} -> {s['model']['version']}")
+    print(f"scanned {scanned / 1e6:,.1f} MB in {tasks} chunks in {elapsed:.2f} s "
+          f"({scanned / 1e6 / max(elapsed, 1e-9):,.0f} MB/s)")
+    print(f"  {'event':<18} {'seen':>10} {'re-priced':>10} {'changed':>10} {'no answers':>11}")
+    for name, e in s["events"].items():
+        print(f"  {name:<18} {e['seen']:>10,} {e['priced']:>10,} {e['changed']:>10,} {e['no_answers']:>11,}")
+    if not s["priced"]:
+        print("no re-priceable records (quotes logged before answer_key was recorded only kept the price)")
+        return
+    print(f"  totals {s['old_total']:,.2f} -> {s['new_total']:,.2f} ({s['delta_total']:+,.2f}, "
+          f"{s['delta_mean']:+.2f} per quote); {s['changed']:,} of {s['priced']:,} quotes change")
+    moves = {k: n for k, n in s["risk_moves"].items() if k.split("->")[0] != k.split("->")[1]}
+    print(f"  risk level changes: {', '.join(f'{k} {n:,}' for k, n in moves.items()) or 'none'}")
+    top = sorted(s["deltas"].items(), key=lambda kv: -kv[1])[:8]
+    print(f"  price deltas: {', '.join(f'{d} x{n:,}' for d, n in top)}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m tools.backtest")
+    parser.add_argument("logs", nargs="*", type=Path, help="JSONL logs (default: data/cockpit/*.jsonl)")
+    parser.add_argument("--model", default=COST_MODEL.version, help=f"version to test (known: {', '.join(COST_MODELS)})")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="FIELD=VALUE",
+                        help="change one rule of --model, e.g. ai=12 or integrations_cap=8 (repeatable)")
+    parser.add_argument("--against", default=COST_MODEL.version, help="baseline version (default: live model)")
+    parser.add_argument("--records", type=Path, help="write per-record diffs (JSONL) of changed records here")
+    parser.add_argument("--all", action="store_true", help="with --records, write unchanged records too")
+    parser.add_argument("--json", type=Path, help="write the aggregate diff here")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-mb", type=float, default=64)
+    args = parser.parse_args(argv)
+    get_profiler().sample_rate = 0  # keep backtests out of the app's span log
+
+    try:
+        model = derive_model(get_cost_model(args.model), args.overrides)
+        against = get_cost_model(args.against)
+    except (KeyError, ValueError) as e:
+        parser.error(str(e.args[0]))
+
+    logs = args.logs or default_logs()
+    tasks = plan(logs, max(int(args.chunk_mb * 1024 * 1024), 1))
+    backtest = Backtest(model, against)
+    wanted = None
+    if args.records:
+        wanted = frozenset(range(KEY_SPACE)) if args.all else backtest.changed_keys
+
+    t0 = time.perf_counter()
+    out = open(args.records, "w", encoding="utf-8") if args.records else None
+    try:
+        for result in _scan_all(tasks, wanted, args.workers):
+            rows = backtest.add(result)
+            if out is not None:
+                out.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in rows
+                               if args.all or r["delta"] or r["old_risk"] != r["new_risk"])
+    finally:
+        if out is not None:
+            out.close()
+    elapsed = time.perf_counter() - t0
+
+    summary = backtest.summary()
+    print_report(summary, sum(t.size for t in tasks), len(tasks), elapsed)
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""Price a CSV or JSONL file of project briefs from the command line.
+
+Each row holds the Wizard's 13 answers (title, contact_email, industry, goal,
+audience, auth_needed, payments_needed, ai_features, integrations,
+content_support, branding, timeline, budget); missing fields take the
+Wizard's defaults. Rows are checked with the Wizard's submit rules, priced
+through the lookup table and given the Wizard's indicators; rows with a
+choice the Wizard does not offer are reported, not priced. One output
+record per input row, in input order, as JSONL or Parquet (pyarrow).
+
+    python -m tools.bulk_estimate briefs.csv -o priced.jsonl
+    python -m tools.bulk_estimate briefs.jsonl -o priced.parquet --workers 4 --chunk-size 2000
+    cat briefs.csv | python -m tools.bulk_estimate - --input-format csv -o - > priced.jsonl
+
+The input is read as a stream and handed to a process pool in chunks. At
+most 2 x workers chunks are in flight, so memory stays flat whatever the
+file size. In CSV files multiselects are separated by ";" (or written as a
+JSON list) and flags accept true/false, yes/no and 1/0. Progress and rows per
+second go to stderr.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.answers import (BOOL_FIELDS, MULTISELECT_FIELDS, WIZARD_DEFAULTS, canonical_answers, option_errors,
+                           validate_answers)
+from utils.estimator import BREAKDOWN_COLUMNS, COST_MODEL
+from utils.lazy import available
+from utils.lookup import lookup
+
+TRUE_STRINGS = {"1", "true", "t", "yes", "y", "x"}
+FALSE_STRINGS = {"", "0", "false", "f", "no", "n"}
+SUFFIX_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+
+# (row number, CSV dict or raw JSONL line)
+Row = Tuple[int, Any]
+
+
+# ──────────────────────────────────────────────────────────────
+# Reading (streamed)
+# ──────────────────────────────────────────────────────────────
+def read_rows(stream: io.TextIOBase, fmt: str) -> Iterator[Row]:
+    """Yield (row number, raw row); rows are numbered from 1, blank JSONL lines skipped."""
+    if fmt == "csv":
+        for n, record in enumerate(csv.DictReader(stream), start=1):
+            yield n, record
+    else:
+        for n, line in enumerate(stream, start=1):
+            if line.strip():
+                yield n, line
+
+
+def chunked(rows: Iterable[Row], size: int) -> Iterator[List[Row]]:
+    it = iter(rows)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _parse_flag(value: Any) -> bool:
+    if isinstance(value, bool) or value is None:
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in TRUE_STRINGS:
+        return True
+    if text in FALSE_STRINGS:
+        return False
+    raise ValueError(f"not a yes/no value: {value!r}")
+
+
+def _parse_multiselect(value: Any) -> List[str]:
+    if value is None or isinstance(value, list):
+        return value or []
+    text = str(value).strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return text.split(";")
+
+
+def parse_row(raw: Any) -> Dict[str, Any]:
+    """Raw CSV dict / JSONL line -> Wizard answers (only the 13 known fields)."""
+    record = json.loads(raw) if isinstance(raw, str) else raw
+    if not isinstance(record, dict):
+        raise ValueError("expected a JSON object")
+    answers = {}
+    for key in WIZARD_DEFAULTS:
+        value = record.get(key)
+        if value is None or value == "":
+            continue  # canonical_answers fills the Wizard default
+        if key in BOOL_FIELDS:
+            value = _parse_flag(value)
+        elif key in MULTISELECT_FIELDS:
+            value = _parse_multiselect(value)
+        answers[key] = value
+    return answers
+
+
+# ──────────────────────────────────────────────────────────────
+# Pricing (runs in the worker processes)
+# ──────────────────────────────────────────────────────────────
+def _init_worker():
+    from utils.spans import get_profiler
+    get_profiler().sample_rate = 0  # keep bulk runs out of the app's span log
+
+
+def price_row(n: int, raw: Any) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"row": n}
+    try:
+        answers = canonical_answers(parse_row(raw))
+    except (ValueError, TypeError) as e:  # json.JSONDecodeError is a ValueError
+        out.update(valid=False, errors=[f"Unreadable row: {e}"])
+        return out
+    unknown = option_errors(answers)
+    if unknown:
+        # the Wizard could not produce these answers, so they are not priced
+        out.update(valid=False, errors=unknown + validate_answers(answers), **answers)
+        return out
+    entry = lookup(answers)
+    errors = validate_answers(answers)
+    out.update(valid=not errors, errors=errors, **answers)
+    out.update(
+        cost_model=COST_MODEL.version,
+        total=entry.cost["total"],
+        breakdown={line: float(entry.cost["breakdown"].get(line, 0.0)) for line in BREAKDOWN_COLUMNS},
+        risk_level=entry.indicators["risk_level"],
+        ai_tools_needed=entry.indicators["ai_tools_needed"],
+    )
+    return out
+
+
+def price_chunk(chunk: List[Row]) -> List[Dict[str, Any]]:
+    return [price_row(n, raw) for n, raw in chunk]
+
+
+def price_stream(chunks: Iterable[List[Row]], workers: int) -> Iterator[List[Dict[str, Any]]]:
+    """Priced chunks in input order, with at most 2 x workers chunks submitted ahead."""
+    if workers <= 1:
+        _init_worker()
+        yield from map(price_chunk, chunks)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(price_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# ──────────────────────────────────────────────────────────────
+# Writing
+# ──────────────────────────────────────────────────────────────
+class JsonlSink:
+    def __init__(self, stream: io.TextIOBase):
+        self.stream = stream
+
+    def write(self, records: List[Dict[str, Any]]):
+        self.stream.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+
+    def close(self):
+        self.stream.flush()
+
+
+class ParquetSink:
+    """Converts each chunk to an Arrow batch at once; batches are written as row groups of `row_group_size` rows."""
+
+    def __init__(self, path: Path, row_group_size: int = 50_000):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        string, flag = pa.string(), pa.bool_()
+        fields = [("row", pa.int64()), ("valid", flag), ("errors", pa.list_(string))]
+        for key in WIZARD_DEFAULTS:
+            kind = flag if key in BOOL_FIELDS else pa.list_(string) if key in MULTISELECT_FIELDS else string
+            fields.append((key, kind))
+        fields += [("cost_model", string), ("total", pa.float64()),
+                   ("breakdown", pa.struct([(line, pa.float64()) for line in BREAKDOWN_COLUMNS])),
+                   ("risk_level", string), ("ai_tools_needed", pa.int64())]
+        self.schema = pa.schema(fields)
+        self.writer = pq.ParquetWriter(str(path), self.schema)
+        self.row_group_size = row_group_size
+        self.batches = []
+        self.buffered = 0
+
+    def write(self, records: List[Dict[str, Any]]):
+        self.batches.append(self.pa.RecordBatch.from_pylist(records, schema=self.schema))
+        self.buffered += len(records)
+        if self.buffered >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if self.batches:
+            self.writer.write_table(self.pa.Table.from_batches(self.batches, schema=self.schema))
+            self.batches, self.buffered = [], 0
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+
+# ──────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────
+class Progress:
+    """One self-overwriting stderr line, redrawn at most every `every` seconds."""
+
+    def __init__(self, enabled: bool, every: float = 0.5):
+        self.enabled = enabled
+        self.every = every
+        self.started = self.drawn = time.perf_counter()
+        self.rows = self.invalid = 0
+
+    def update(self, records: List[Dict[str, Any]]):
+        self.rows += len(records)
+        self.invalid += sum(1 for r in records if not r["valid"])
+        now = time.perf_counter()
+        if self.enabled and now - self.drawn >= self.every:
+            self.drawn = now
+            print(f"\r{self.rows:,} rows  {self.rate():,.0f} rows/s  {self.invalid:,} invalid",
+                  end="", file=sys.stderr, flush=True)
+
+    def rate(self) -> float:
+        return self.rows / max(time.perf_counter() - self.started, 1e-9)
+
+
+def _format(path: str, given: Optional[str], choices: Tuple[str, ...]) -> Optional[str]:
+    fmt = given or SUFFIX_FORMATS.get(Path(path).suffix.lower(), "jsonl")
+    return fmt if fmt in choices else None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m tools.bulk_estimate")
+    parser.add_argument("input", help="CSV or JSONL briefs ('-' for stdin)")
+    parser.add_argument("-o", "--output", required=True, help=".jsonl or .parquet file ('-' for JSONL on stdout)")
+    parser.add_argument("--input-format", choices=("csv", "jsonl"))
+    parser.add_argument("--output-format", choices=("jsonl", "parquet"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes (1 prices inline)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="rows per task")
+    parser.add_argument("--skip-invalid", action="store_true", help="leave rows that fail validation out")
+    parser.add_argument("--quiet", action="store_true", help="no progress line")
+    args = parser.parse_args(argv)
+
+    in_fmt = _format(args.input, args.input_format, ("csv", "jsonl"))
+    out_fmt = _format(args.output, args.output_format, ("jsonl", "parquet"))
+    if in_fmt is None or out_fmt is None:
+        parser.error("cannot read Parquet input or write CSV output")
+    if out_fmt == "parquet":
+        if args.output == "-":
+            parser.error("Parquet output needs a file path")
+        if not available("pyarrow"):
+            parser.error("Parquet output needs pyarrow (pip install pyarrow)")
+
+    source = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8-sig")
+    if out_fmt == "parquet":
+        sink = ParquetSink(Path(args.output))
+    else:
+        sink = JsonlSink(sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8"))
+
+    progress = Progress(enabled=not args.quiet and sys.stderr.isatty())
+    written = 0
+    try:
+        chunks = chunked(read_rows(source, in_fmt), max(args.chunk_size, 1))
+        for records in price_stream(chunks, args.workers):
+            progress.update(records)
+            if args.skip_invalid:
+                records = [r for r in records if r["valid"]]
+            sink.write(records)
+            written += len(records)
+    finally:
+        sink.close()
+        if source is not sys.stdin:
+            source.close()
+        if isinstance(sink, JsonlSink) and sink.stream is not sys.stdout:
+            sink.stream.close()
+
+    elapsed = time.perf_counter() - progress.started
+    if progress.enabled:
+        print(file=sys.stderr)
+    print(f"{progress.rows:,} rows priced in {elapsed:.1f} s ({progress.rate():,.0f} rows/s), "
+          f"{progress.invalid:,} invalid, {written:,} written to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
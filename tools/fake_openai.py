@@ -0,0 +1,123 @@
+"""Local fake of the OpenAI chat completions API, for tests and latency benchmarks.
+
+Streams a canned reply as server-sent events with a configurable
+time-to-first-token and token rate, so the streamed UI paths can be exercised
+(and timed) without a key or network:
+
+    python -m tools.fake_openai --port 8765 --ttft 0.4 --tps 40 --tokens 120
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=fake streamlit run streamlit_app.py
+
+Supports POST /v1/chat/completions (stream true/false, stream_options.include_usage)
+and GET /v1/models. Each "token" is one word of the reply; --fail-rate makes a
+share of completion requests fail with 503.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+LOREM = (
+    "Here is a lean plan for your landing page. Start with a single hero section and one clear call to action. "
+    "Add a short benefits list, social proof and a lead form wired to your CRM. Keep the copy tight and test two "
+    "headlines. Ship the first version this week and iterate on real numbers rather than guesses."
+).split()
+
+
+@dataclass
+class FakeSettings:
+    ttft: float = 0.4      # seconds before the first token
+    tps: float = 40.0      # tokens per second after that
+    tokens: int = 120      # reply length in tokens (words)
+    fail_rate: float = 0.0  # share of chat requests answered with 503 (exercises client retries)
+
+
+def reply_tokens(n: int):
+    return [(w if i == 0 else " " + w) for i, w in enumerate(LOREM[j % len(LOREM)] for j in range(n))]
+
+
+def create_app(settings: FakeSettings = None) -> FastAPI:
+    settings = settings or FakeSettings()
+    app = FastAPI(title="fake-openai")
+    app.state.settings = settings
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "gpt-4o-mini", "object": "model", "owned_by": "fake"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        s = app.state.settings
+        if s.fail_rate and random.random() < s.fail_rate:
+            return JSONResponse({"error": {"message": "fake overload", "type": "server_error"}}, status_code=503)
+        model = body.get("model", "gpt-4o-mini")
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in body.get("messages", []))
+        tokens = reply_tokens(int(body.get("max_tokens") or s.tokens))
+        cid, created = f"chatcmpl-{uuid.uuid4().hex[:24]}", int(time.time())
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(tokens),
+                 "total_tokens": prompt_tokens + len(tokens)}
+
+        if not body.get("stream"):
+            await asyncio.sleep(s.ttft + max(len(tokens) - 1, 0) / s.tps)
+            return JSONResponse({
+                "id": cid, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": "".join(tokens)}}],
+                "usage": usage,
+            })
+
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+        def chunk(delta: dict, finish_reason=None, with_usage=False) -> str:
+            payload = {"id": cid, "object": "chat.completion.chunk", "created": created, "model": model,
+                       "choices": [] if with_usage else [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+            if include_usage:
+                payload["usage"] = usage if with_usage else None
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def events():
+            yield chunk({"role": "assistant", "content": ""})
+            await asyncio.sleep(s.ttft)
+            start = time.perf_counter()
+            for i, token in enumerate(tokens):
+                # pace against the clock so sleep overshoot does not accumulate
+                delay = start + i / s.tps - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                yield chunk({"content": token})
+            yield chunk({}, finish_reason="stop")
+            if include_usage:
+                yield chunk({}, with_usage=True)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ttft", type=float, default=FakeSettings.ttft, help="seconds to first token")
+    parser.add_argument("--tps", type=float, default=FakeSettings.tps, help="tokens per second")
+    parser.add_argument("--tokens", type=int, default=FakeSettings.tokens, help="reply length in tokens")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of chat requests that get a 503")
+    parser.add_argument("--ssl-certfile", help="serve HTTPS (with --ssl-keyfile)")
+    parser.add_argument("--ssl-keyfile")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    app = create_app(FakeSettings(ttft=args.ttft, tps=args.tps, tokens=args.tokens, fail_rate=args.fail_rate))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning",
+                ssl_certfile=args.ssl_certfile, ssl_keyfile=args.ssl_keyfile)
+
+
+if __name__ == "__main__":
+    main()
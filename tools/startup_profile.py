@@ -0,0 +1,97 @@
+"""Per-page import-time profile (python -X importtime, summarised).
+
+For each page, a fresh interpreter imports streamlit (shared by every page,
+reported separately) and then runs only the page's top-level import
+statements under -X importtime. The report lists what the page itself pays
+for at cold start: total time, module count, the heaviest top-level imports
+(cumulative) and the heaviest individual modules (self time).
+
+    python -m tools.startup_profile                      # every page
+    python -m tools.startup_profile pages/02_Wizard.py --top 10
+    python -m tools.startup_profile --raw pages/03_Summary.py > summary.importtime
+"""
+import argparse
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+MARKER = "--- page imports ---"
+
+PROBE = f"""
+import ast, sys
+sys.path.insert(0, ".")
+import streamlit
+print({MARKER!r}, file=sys.stderr, flush=True)
+tree = ast.parse(open(sys.argv[1], encoding="utf-8").read())
+stmts = [n for n in tree.body
+         if isinstance(n, ast.Import) or isinstance(n, ast.ImportFrom) and n.module != "__future__"]
+exec(compile(ast.Module(body=stmts, type_ignores=[]), sys.argv[1], "exec"), {{}})
+"""
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+@dataclass
+class ImportRow:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(text: str) -> List[ImportRow]:
+    rows = []
+    for line in text.splitlines():
+        m = LINE.match(line)
+        if m:
+            rows.append(ImportRow(m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+    return rows
+
+
+def profile_page(page: str, cwd: Path = ROOT) -> tuple[List[ImportRow], List[ImportRow], str]:
+    """(streamlit rows, page rows, stderr) for one page."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", PROBE, page], cwd=cwd,
+                         capture_output=True, text=True, timeout=300)
+    before, found, after = out.stderr.partition(MARKER)
+    if not found or out.returncode != 0:
+        raise RuntimeError(f"{page}: {out.stderr.strip().splitlines()[-1:] or ['probe failed']}")
+    return parse_importtime(before), parse_importtime(after), out.stderr
+
+
+def report(page: str, shared: List[ImportRow], rows: List[ImportRow], top: int):
+    roots = [r for r in rows if r.depth == 0]
+    total_ms = sum(r.cumulative_us for r in roots) / 1e3
+    shared_ms = sum(r.cumulative_us for r in shared if r.depth == 0) / 1e3
+    print(f"\n{page}: {total_ms:,.0f} ms, {len(rows)} modules (streamlit baseline {shared_ms:,.0f} ms, not counted)")
+    if not rows:
+        return
+    print(f"  {'top-level imports (cumulative)':<44} {'ms':>8}")
+    for r in sorted(roots, key=lambda r: r.cumulative_us, reverse=True)[:top]:
+        print(f"  {r.module:<44} {r.cumulative_us / 1e3:8.1f}")
+    print(f"  {'heaviest modules (self)':<44} {'ms':>8}")
+    for r in sorted(rows, key=lambda r: r.self_us, reverse=True)[:top]:
+        print(f"  {r.module:<44} {r.self_us / 1e3:8.1f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m tools.startup_profile")
+    parser.add_argument("pages", nargs="*", help="page files (default: streamlit_app.py and pages/*.py)")
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--raw", action="store_true", help="print the raw -X importtime output instead")
+    args = parser.parse_args(argv)
+
+    pages = args.pages or ["streamlit_app.py", *sorted(str(p.relative_to(ROOT)) for p in (ROOT / "pages").glob("*.py"))]
+    for page in pages:
+        shared, rows, raw = profile_page(page)
+        if args.raw:
+            print(raw, end="")
+        else:
+            report(page, shared, rows, args.top)
+
+
+if __name__ == "__main__":
+    main()
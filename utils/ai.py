@@ -0,0 +1,150 @@
+"""Streamed chat completions with latency accounting (UI-free).
+
+    stream = ChatStream(messages, model="gpt-4o-mini", api_key=key)
+    text = st.write_stream(stream)          # renders tokens as they arrive
+    log_event(LOG_MILKBOT, "ai.stream", stream.stats.as_payload())
+
+Requests go through the shared, pooled client from utils.clients (keep-alive,
+timeouts, retries). It honours OPENAI_BASE_URL, so pointing it at the local
+fake server (python -m tools.fake_openai) exercises the same path without a
+real key.
+"""
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from utils.clients import get_openai_client
+from utils.spans import observe
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+
+@dataclass
+class StreamStats:
+    model: str
+    surface: str = ""
+    started: float = 0.0
+    first_token_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    chunks: int = 0
+    chars: int = 0
+    completion_tokens: Optional[int] = None  # from the final usage chunk, when the server sends one
+    cache: Optional[str] = None  # "memory" | "disk" | "miss" when a prompt cache is attached
+    cache_hit_rate: Optional[float] = None
+    error: str = ""
+
+    @property
+    def ttft_ms(self) -> Optional[float]:
+        return (self.first_token_at - self.started) * 1e3 if self.first_token_at else None
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return (self.finished_at - self.started) * 1e3 if self.finished_at else None
+
+    @property
+    def tokens(self) -> int:
+        return self.completion_tokens if self.completion_tokens is not None else self.chunks
+
+    @property
+    def tokens_per_s(self) -> Optional[float]:
+        """Generation rate after the first token (the part streaming makes visible)."""
+        if not (self.first_token_at and self.finished_at) or self.tokens < 2:
+            return None
+        span = self.finished_at - self.first_token_at
+        return (self.tokens - 1) / span if span > 0 else None
+
+    def as_payload(self) -> Dict[str, Any]:
+        payload = {
+            "surface": self.surface,
+            "model": self.model,
+            "ttft_ms": round(self.ttft_ms, 1) if self.ttft_ms is not None else None,
+            "duration_ms": round(self.duration_ms, 1) if self.duration_ms is not None else None,
+            "tokens": self.tokens,
+            "tokens_estimated": self.completion_tokens is None,
+            "tokens_per_s": round(self.tokens_per_s, 1) if self.tokens_per_s is not None else None,
+            "chars": self.chars,
+        }
+        if self.cache:
+            payload["cache"] = self.cache
+            payload["cache_hit_rate"] = round(self.cache_hit_rate, 3) if self.cache_hit_rate is not None else None
+        if self.error:
+            payload["error"] = self.error
+        return payload
+
+
+class ChatStream:
+    """Iterable of text deltas from one streamed chat completion.
+
+    Iterate it once (st.write_stream does); afterwards `text` holds the full
+    reply and `stats` the timings. Without a usage chunk from the server,
+    content chunks stand in for tokens (`tokens_estimated` in the payload).
+    With a `cache` (utils.prompt_cache.PromptCache), a hit replays the stored
+    reply without calling the API and completed replies are stored.
+    """
+
+    def __init__(self, messages: List[Dict[str, str]], model: str = DEFAULT_MODEL, surface: str = "",
+                 client=None, api_key: Optional[str] = None, cache=None, **params):
+        self.messages = messages
+        self.model = model
+        self.params = params
+        self.cache = cache
+        self._client = client
+        self._api_key = api_key
+        self.text = ""
+        self.stats = StreamStats(model=model, surface=surface)
+
+    def _create(self):
+        client = self._client or get_openai_client(self._api_key)
+        self.stats.started = time.perf_counter()  # after the (one-off) openai import and client setup
+        return client.chat.completions.create(
+            model=self.model,
+            messages=self.messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            **self.params,
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        stats = self.stats
+        stats.started = time.perf_counter()
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(self.messages, self.model, **self.params)
+            hit = self.cache.get(key)
+            stats.cache = hit.tier if hit else "miss"
+            stats.cache_hit_rate = self.cache.hit_rate
+            if hit:
+                stats.first_token_at = stats.finished_at = time.perf_counter()
+                stats.completion_tokens = 0  # nothing generated
+                stats.chars = len(hit.text)
+                self.text = hit.text
+                yield hit.text
+                return
+        parts = []
+        try:
+            for chunk in self._create():
+                if chunk.usage is not None:
+                    stats.completion_tokens = chunk.usage.completion_tokens
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                if stats.first_token_at is None:
+                    stats.first_token_at = time.perf_counter()
+                stats.chunks += 1
+                stats.chars += len(delta)
+                parts.append(delta)
+                yield delta
+            if key is not None and parts:
+                user = next((m["content"] for m in reversed(self.messages) if m.get("role") == "user"), "")
+                self.cache.put(key, "".join(parts), self.model, user)
+        except Exception as e:
+            stats.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            stats.finished_at = time.perf_counter()
+            self.text = "".join(parts)
+            observe("openai.stream", stats.finished_at - stats.started)
+            if stats.first_token_at is not None:
+                observe("openai.ttft", stats.first_token_at - stats.started)
@@ -0,0 +1,104 @@
+"""Canonical form of the 13 wizard answers.
+
+Two answer sets that price the same and read the same (multiselects in a
+different order, a stray "None" next to real picks, whitespace around text)
+canonicalise to the same dict and therefore the same hash.
+"""
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+from utils.estimator import COST_MODEL, CostModel
+from utils.indicators import RISK_RULES, RiskRules
+from utils.lookup import AI_OPTIONS, CONTENT_OPTIONS, INTEGRATION_OPTIONS
+
+# Same keys and defaults as the Wizard page (pages/02_Wizard.py update_answers)
+WIZARD_DEFAULTS: Dict[str, Any] = {
+    "title": "",
+    "contact_email": "",
+    "industry": "Manufacturing",
+    "goal": "Lead Gen",
+    "audience": "Small <1k",
+    "auth_needed": False,
+    "payments_needed": False,
+    "ai_features": [],
+    "integrations": [],
+    "content_support": "Have copy",
+    "branding": "Have brand kit",
+    "timeline": "1 week",
+    "budget": "Entry",
+}
+# What the Wizard's selectboxes and multiselects offer
+WIZARD_CHOICES: Dict[str, Tuple[str, ...]] = {
+    "industry": ("Manufacturing", "Retail", "Services", "Education", "Other"),
+    "goal": ("Lead Gen", "E-commerce", "Info", "Booking", "Internal Tool"),
+    "audience": ("Small <1k", "Growing 1–10k", "Large >10k"),
+    "ai_features": AI_OPTIONS,
+    "integrations": INTEGRATION_OPTIONS,
+    "content_support": CONTENT_OPTIONS,
+    "branding": ("Have brand kit", "Use default"),
+    "timeline": ("1 week", "2–4 weeks", ">1 month"),
+    "budget": ("Entry", "Standard", "Premium"),
+}
+MULTISELECT_FIELDS = ("ai_features", "integrations")
+BOOL_FIELDS = ("auth_needed", "payments_needed")
+TITLE_MAX = 60
+EMAIL_RE = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
+
+
+def canonical_answers(answers: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill defaults, coerce flags, strip text and sort/dedupe multiselects without "None"."""
+    out = {}
+    for key, default in WIZARD_DEFAULTS.items():
+        value = answers.get(key)
+        if value is None:
+            value = default
+        if key in MULTISELECT_FIELDS:
+            if isinstance(value, str):
+                value = [value]
+            value = sorted({str(v).strip() for v in value} - {"", "None"})
+        elif key in BOOL_FIELDS:
+            value = bool(value)
+        else:
+            value = str(value).strip()
+        out[key] = value
+    return out
+
+
+def answers_hash(answers: Dict[str, Any], model: CostModel = COST_MODEL, rules: RiskRules = RISK_RULES) -> str:
+    """Stable SHA-256 of the canonical answers plus the cost/risk rules they are priced with."""
+    canonical = canonical_answers(answers)
+    blob = json.dumps([canonical, model.as_dict(), [rules.medium_cost, rules.high_cost]],
+                      sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def valid_email(email: str) -> bool:
+    return bool(EMAIL_RE.match(email or ""))
+
+
+def validate_answers(answers: Dict[str, Any]) -> List[str]:
+    """The Wizard's submit rules; returns the error messages (empty when valid)."""
+    errors = []
+    if not (1 <= len(str(answers.get("title") or "").strip()) <= TITLE_MAX):
+        errors.append(f"Project name must be 1–{TITLE_MAX} characters.")
+    if not valid_email(str(answers.get("contact_email") or "")):
+        errors.append("Invalid email format.")
+    if not str(answers.get("goal") or "").strip():
+        errors.append("Primary goal is required.")
+    return errors
+
+
+def option_errors(answers: Dict[str, Any]) -> List[str]:
+    """Choices the Wizard does not offer (answers as canonical_answers returns them)."""
+    errors = []
+    for key, choices in WIZARD_CHOICES.items():
+        value = answers.get(key)
+        if key in MULTISELECT_FIELDS:
+            unknown = [v for v in value or [] if v not in choices]
+            if unknown:
+                errors.append(f"Unknown {key} option(s): {', '.join(map(str, unknown))}.")
+        elif value not in choices:
+            errors.append(f"Unknown {key}: {value!r}.")
+    return errors
@@ -0,0 +1,269 @@
+"""Process-wide HTTP clients: keep-alive pools, explicit timeouts, one retry policy.
+
+    get_session().get(url)                   # requests, for connectors
+    client = get_openai_client(api_key)      # openai.OpenAI over a pooled httpx.Client
+    client.chat.completions.create(...)      # retried like the session calls
+
+Clients are module singletons (one per API key / base URL for OpenAI), so
+Streamlit reruns and connector calls reuse open TLS connections instead of
+dialling per call. Retries are bounded and jittered (tenacity) and apply to
+connection errors, timeouts, 429 and 5xx; the OpenAI SDK's own retries are
+turned off so this is the only policy. Tunables:
+
+- HTTP_CONNECT_TIMEOUT / HTTP_READ_TIMEOUT – seconds (default 3.05 / 60)
+- HTTP_RETRIES – attempts after the first (default 2)
+- HTTP_POOL_SIZE – keep-alive connections per host (default 10)
+
+client_stats() reports requests, new connections, reuse and retries per client.
+"""
+import functools
+import os
+import sys
+import threading
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Optional
+
+from utils.lazy import lazy_import
+
+httpx = lazy_import("httpx")
+openai = lazy_import("openai")
+requests = lazy_import("requests")
+tenacity = lazy_import("tenacity")
+
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class ClientStats:
+    """Counters for one pooled client (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.retries = 0
+
+    def add(self, field: str, n: int = 1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + n)
+
+    def as_dict(self) -> Dict[str, Any]:
+        reused = max(self.requests - self.connections, 0)
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "reused": reused,
+            "reuse_rate": round(reused / self.requests, 3) if self.requests else None,
+            "retries": self.retries,
+        }
+
+
+_stats: Dict[str, ClientStats] = {}
+_stats_lock = threading.Lock()
+_lock = threading.Lock()  # client construction
+
+
+def _stats_for(name: str) -> ClientStats:
+    with _stats_lock:
+        return _stats.setdefault(name, ClientStats())
+
+
+def client_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: s.as_dict() for name, s in sorted(_stats.items())}
+
+
+# ──────────────────────────────────────────────────────────────
+# Retry policy
+# ──────────────────────────────────────────────────────────────
+def is_retryable(exc: BaseException) -> bool:
+    """Transient failures only; checks only the client libraries already imported."""
+    req = sys.modules.get("requests")
+    if req and isinstance(exc, (req.ConnectionError, req.Timeout)):
+        return True
+    hx = sys.modules.get("httpx")
+    if hx and isinstance(exc, (hx.ConnectError, hx.TimeoutException, hx.RemoteProtocolError)):
+        return True
+    oa = sys.modules.get("openai")
+    if oa and isinstance(exc, (oa.APIConnectionError, oa.RateLimitError, oa.InternalServerError)):
+        return True  # APIConnectionError includes APITimeoutError
+    return False
+
+
+def _retry_status(result) -> bool:
+    return getattr(result, "status_code", None) in RETRY_STATUSES
+
+
+def with_retries(fn: Callable, *args, stats: Optional[ClientStats] = None, retries: int = RETRIES, **kwargs):
+    """Call fn, retrying transient errors (and 429/5xx responses) with jittered exponential backoff.
+
+    When the last attempt still returns a retryable status, that response is
+    returned rather than raised, so callers keep their own status handling.
+    """
+    def count(state):
+        if stats is not None:
+            stats.add("retries")
+
+    retrying = tenacity.Retrying(
+        stop=tenacity.stop_after_attempt(retries + 1),
+        wait=tenacity.wait_random_exponential(multiplier=0.25, max=4),
+        retry=tenacity.retry_if_exception(is_retryable) | tenacity.retry_if_result(_retry_status),
+        before_sleep=count,
+        retry_error_callback=lambda state: state.outcome.result(),
+        reraise=True,
+    )
+    return retrying(fn, *args, **kwargs)
+
+
+# ──────────────────────────────────────────────────────────────
+# requests (connectors)
+# ──────────────────────────────────────────────────────────────
+class PooledSession:
+    """requests.Session with a sized keep-alive pool, default timeouts and retries."""
+
+    def __init__(self, name: str = "requests", timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), pool_size: int = POOL_SIZE):
+        self.timeout = timeout
+        self.stats = _stats_for(name)
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._adapter = adapter
+
+    def _connections(self) -> int:
+        pools = self._adapter.poolmanager.pools
+        return sum(pools[key].num_connections for key in pools.keys())
+
+    def request(self, method: str, url: str, retries: int = RETRIES, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+
+        def once():
+            self.stats.add("requests")
+            before = self._connections()
+            try:
+                return self.session.request(method, url, **kwargs)
+            finally:
+                self.stats.add("connections", self._connections() - before)
+
+        return with_retries(once, stats=self.stats, retries=retries)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+
+_session: Optional[PooledSession] = None
+
+
+def get_session() -> PooledSession:
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = PooledSession()
+    return _session
+
+
+# ──────────────────────────────────────────────────────────────
+# OpenAI (httpx)
+# ──────────────────────────────────────────────────────────────
+@functools.lru_cache(maxsize=None)
+def _keepalive_transport_cls():
+    class DrainingStream(httpx.SyncByteStream):
+        """Reads the last few bytes of a finished SSE stream before closing.
+
+        The OpenAI SDK closes a stream as soon as it sees `data: [DONE]`, one
+        read before the chunked-encoding terminator; httpcore then drops the
+        connection instead of pooling it. Streams closed before [DONE]
+        (a reader giving up mid-reply) are closed without draining.
+        """
+
+        def __init__(self, inner):
+            self._inner = inner
+            self._parts = iter(inner)
+            self._tail = b""
+
+        def __iter__(self):
+            for part in self._parts:
+                self._tail = (self._tail + part)[-32:]
+                yield part
+
+        def close(self):
+            try:
+                if self._tail.rstrip().endswith(b"[DONE]"):
+                    for _ in self._parts:
+                        pass
+            except Exception:
+                pass  # nothing to save; the connection is just not reused
+            finally:
+                self._inner.close()
+
+    class KeepAliveTransport(httpx.HTTPTransport):
+        def handle_request(self, request):
+            response = super().handle_request(request)
+            response.stream = DrainingStream(response.stream)
+            return response
+
+    return KeepAliveTransport
+
+
+def pooled_httpx_client(stats: ClientStats, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                        pool_size: int = POOL_SIZE):
+    """httpx.Client with keep-alive limits, split timeouts and request/connection counters."""
+    def trace(event: str, info: dict):
+        if event == "connection.connect_tcp.complete":
+            stats.add("connections")
+
+    def on_request(request):
+        stats.add("requests")
+        request.extensions["trace"] = trace
+
+    connect, read = timeout
+    limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+    return httpx.Client(
+        timeout=httpx.Timeout(read, connect=connect),
+        transport=_keepalive_transport_cls()(limits=limits),
+        event_hooks={"request": [on_request]},
+    )
+
+
+class RetryingOpenAI:
+    """openai.OpenAI whose chat.completions.create goes through with_retries.
+
+    For stream=True the call returns once response headers arrive, so retries
+    never replay a partially delivered stream. Other attributes pass through.
+    """
+
+    def __init__(self, client, stats: ClientStats):
+        self._client = client
+        self.stats = stats
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        return with_retries(self._client.chat.completions.create, stats=self.stats, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+_openai_clients: Dict[tuple, RetryingOpenAI] = {}
+
+
+def get_openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> RetryingOpenAI:
+    """Shared OpenAI client per (key, base URL); OPENAI_BASE_URL applies when base_url is None."""
+    base_url = base_url or os.getenv("OPENAI_BASE_URL") or None
+    cache_key = (api_key, base_url)
+    client = _openai_clients.get(cache_key)
+    if client is None:
+        with _lock:
+            client = _openai_clients.get(cache_key)
+            if client is None:
+                stats = _stats_for("openai")
+                raw = openai.OpenAI(api_key=api_key, base_url=base_url, max_retries=0,
+                                    http_client=pooled_httpx_client(stats))
+                client = _openai_clients[cache_key] = RetryingOpenAI(raw, stats)
+    return client
@@ -0,0 +1,243 @@
+"""Debounced, delta-encoded per-session state logging.
+
+The Wizard recomputes its indicators on every widget change. Instead of
+appending the full record each time, it hands the new state to a coalescer:
+
+    get_indicator_log().update(session_id, indicators, app=APP_SLUG, version=APP_VERSION)
+
+Changes are held per session until `window` seconds pass without another
+one (or `max_wait` seconds after the first one of the burst), then a single
+record is written with only the fields that differ from the session's last
+logged state:
+
+    {"event":"indicator.delta","payload":{"estimated_cost":61.0,"seq":4},"session":"..."}
+
+The first record of a session, and every `snapshot_every`-th after it, is a
+full `indicator.update` snapshot, so a reader never has to go back further
+than that. A burst that ends where it started writes nothing. replay() and
+recent_states() turn the records back into full states.
+
+Tunables:
+    INDICATOR_LOG_WINDOW          quiet period that ends a burst (default 2 s)
+    INDICATOR_LOG_MAX_WAIT        longest a change is held (default 10 s)
+    INDICATOR_LOG_SNAPSHOT_EVERY  records per session between full snapshots (default 20)
+"""
+import atexit
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from utils.cockpit import get_writer, log_event
+from utils.paths import LOG_EVENTS
+
+WINDOW = float(os.getenv("INDICATOR_LOG_WINDOW", "2"))
+MAX_WAIT = float(os.getenv("INDICATOR_LOG_MAX_WAIT", "10"))
+SNAPSHOT_EVERY = int(os.getenv("INDICATOR_LOG_SNAPSHOT_EVERY", "20"))
+IDLE_TTL = 3600.0  # forget a quiet session's last state after this long (its next record is a snapshot)
+
+SNAPSHOT_EVENT = "indicator.update"
+DELTA_EVENT = "indicator.delta"
+STATE_EVENTS = (SNAPSHOT_EVENT, DELTA_EVENT)
+
+
+def apply_delta(state: Optional[Dict[str, Any]], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """`state` with a delta payload applied (None removes a field; `seq` is bookkeeping)."""
+    merged = dict(state or {})
+    for key, value in delta.items():
+        if key == "seq":
+            continue
+        if value is None:
+            merged.pop(key, None)
+        else:
+            merged[key] = value
+    return merged
+
+
+@dataclass
+class _Session:
+    last: Optional[Dict[str, Any]] = None     # state as of the last record written
+    pending: Optional[Dict[str, Any]] = None  # newest state not written yet
+    first_change: float = 0.0                 # monotonic time of the burst's first change
+    last_change: float = 0.0
+    seq: int = 0
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+
+class EventCoalescer:
+    """Per-session debounce + delta encoding in front of log_event.
+
+    update() only stores the newest state; one background thread writes each
+    session's record once its burst is over. Pending records are flushed at
+    interpreter exit.
+    """
+
+    def __init__(self, path: Path | str = LOG_EVENTS, window: float = WINDOW, max_wait: float = MAX_WAIT,
+                 snapshot_every: int = SNAPSHOT_EVERY, snapshot_event: str = SNAPSHOT_EVENT,
+                 delta_event: str = DELTA_EVENT, ignore: Iterable[str] = ("ts",), idle_ttl: float = IDLE_TTL):
+        self.path = path
+        self.window = window
+        self.max_wait = max(max_wait, window)
+        self.snapshot_every = max(snapshot_every, 1)
+        self.snapshot_event = snapshot_event
+        self.delta_event = delta_event
+        self.ignore = frozenset(ignore)  # volatile keys (the record has its own ts)
+        self.idle_ttl = idle_ttl
+        self.stats = {"updates": 0, "snapshots": 0, "deltas": 0, "unchanged": 0}
+        self._sessions: Dict[str, _Session] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        get_writer()  # make sure the writer's exit hook is registered first, so ours runs before it
+        atexit.register(self.close)
+
+    def update(self, session: str, state: Dict[str, Any], **fields):
+        """Record the session's current state; extra fields (app, version, ...) go on the event."""
+        now = time.monotonic()
+        state = {k: v for k, v in state.items() if k not in self.ignore}
+        with self._cond:
+            s = self._sessions.get(session)
+            if s is None:
+                s = self._sessions[session] = _Session()
+            if s.pending is None:
+                s.first_change = now
+            s.pending, s.last_change, s.fields = state, now, fields
+            self.stats["updates"] += 1
+            if self._closed:
+                self._emit(session, s)
+                return
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="indicator-log", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self):
+        """Write every pending record now."""
+        with self._cond:
+            for session, s in self._sessions.items():
+                if s.pending is not None:
+                    self._emit(session, s)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self.flush()
+
+    # ── background thread ──
+    def _due(self, s: _Session) -> float:
+        return min(s.last_change + self.window, s.first_change + self.max_wait)
+
+    def _run(self):
+        with self._cond:
+            while not self._closed:
+                now = time.monotonic()
+                for session, s in list(self._sessions.items()):
+                    if s.pending is not None and self._due(s) <= now:
+                        self._emit(session, s)
+                    elif s.pending is None and now - s.last_change > self.idle_ttl:
+                        del self._sessions[session]
+                deadlines = [self._due(s) for s in self._sessions.values() if s.pending is not None]
+                self._cond.wait(max(min(deadlines) - time.monotonic(), 0) if deadlines else None)
+
+    def _emit(self, session: str, s: _Session):
+        """Write the session's pending state (caller holds the lock)."""
+        state, s.pending = s.pending, None
+        if s.last is not None and s.seq % self.snapshot_every:
+            delta = {k: v for k, v in state.items() if s.last.get(k) != v}
+            delta.update({k: None for k in s.last if k not in state})
+            if not delta:
+                self.stats["unchanged"] += 1
+                return
+            event, payload = self.delta_event, delta
+            self.stats["deltas"] += 1
+        else:
+            event, payload = self.snapshot_event, dict(state)
+            self.stats["snapshots"] += 1
+        payload["seq"] = s.seq
+        log_event(self.path, event, payload, session=session, **s.fields)
+        s.last = state
+        s.seq += 1
+
+
+_coalescer: Optional[EventCoalescer] = None
+_coalescer_lock = threading.Lock()
+
+
+def get_indicator_log() -> EventCoalescer:
+    """Process-wide coalescer for the Wizard's live indicators (events.jsonl)."""
+    global _coalescer
+    if _coalescer is None:
+        with _coalescer_lock:
+            if _coalescer is None:
+                _coalescer = EventCoalescer()
+    return _coalescer
+
+
+# ──────────────────────────────────────────────────────────────
+# Readers
+# ──────────────────────────────────────────────────────────────
+def replay(events: Iterable[dict], snapshot_event: str = SNAPSHOT_EVENT,
+           delta_event: str = DELTA_EVENT) -> Iterator[dict]:
+    """Full states from schema-v1 event dicts in chronological order.
+
+    Every snapshot or delta comes back as a snapshot-shaped event whose
+    payload is the session's complete state at that point. `partial` is True
+    when a delta's base was not seen (e.g. rotated away) or a record is missing.
+    """
+    states: Dict[Any, Dict[str, Any]] = {}
+    seqs: Dict[Any, int] = {}
+    for evt in events:
+        name, session = evt.get("event"), evt.get("session")
+        payload = evt.get("payload") or {}
+        seq = payload.get("seq")
+        if name == snapshot_event:
+            state, partial = apply_delta(None, payload), False
+        elif name == delta_event:
+            prev = seqs.get(session)
+            partial = session not in states or (seq is not None and prev is not None and seq != prev + 1)
+            state = apply_delta(states.get(session), payload)
+        else:
+            continue
+        states[session] = state
+        if seq is not None:
+            seqs[session] = seq
+        yield {**evt, "event": snapshot_event, "payload": dict(state), "partial": partial}
+
+
+def recent_states(events: Iterable[dict], limit: int, session: Optional[str] = None,
+                  max_scan: int = 10_000) -> List[dict]:
+    """The `limit` most recent full states, newest-first, from events given newest-first.
+
+    Reads on past the `limit`-th record only as far as the snapshots those
+    records build on (at most `max_scan` more events).
+    """
+    taken: List[dict] = []
+    open_sessions = set()  # sessions whose oldest taken record still needs an older snapshot
+    targets = 0
+    scanned = 0
+    for evt in events:
+        if targets >= limit:
+            if not open_sessions:
+                break
+            # every event read from here on counts, whatever its session or name
+            scanned += 1
+            if scanned > max_scan:
+                break
+        name, sid = evt.get("event"), evt.get("session")
+        if name not in STATE_EVENTS or (session is not None and sid != session):
+            continue
+        if targets < limit:
+            targets += 1
+        elif sid not in open_sessions:
+            continue
+        taken.append(evt)
+        if name == DELTA_EVENT:
+            open_sessions.add(sid)
+        else:
+            open_sessions.discard(sid)
+    states = list(replay(reversed(taken)))
+    states.reverse()
+    return states[:targets]
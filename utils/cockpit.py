@@ -1,17 +1,178 @@
+import atexit
 import json
-from datetime import datetime, timezone
+import os
+import queue
+import threading
+import time
 from pathlib import Path
 
-LOG_PATH = Path("data/cockpit/events.jsonl")
-LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+from utils.event_store import get_store, store_enabled
+from utils.events import CockpitEvent, make_event
+from utils.paths import LOG_EVENTS as LOG_PATH
+from utils.rotation import append_lock, maybe_rotate
+from utils.spans import span
+
+# ──────────────────────────────────────────────────────────────
+# Buffered background writer
+#   COCKPIT_FLUSH_INTERVAL  seconds a batch may wait before hitting disk
+#   COCKPIT_FSYNC           "none" (OS decides), "batch" (after every batch)
+#                           or "exit" (only on flush()/close())
+# ──────────────────────────────────────────────────────────────
+FLUSH_INTERVAL = float(os.getenv("COCKPIT_FLUSH_INTERVAL", "0.25"))
+FSYNC_POLICY = os.getenv("COCKPIT_FSYNC", "none")
+FSYNC_POLICIES = ("none", "batch", "exit")
+
+
+class _Flush:
+    def __init__(self, fsync: bool):
+        self.fsync = fsync
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class CockpitWriter:
+    """Single writer thread that batches JSONL appends for every cockpit file.
+
+    Callers only serialise and enqueue; the thread groups queued lines per
+    file and appends each group with one open/write/close.
+    """
+
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL, fsync: str = FSYNC_POLICY,
+                 max_batch: int = 5000):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_batch = max_batch
+        self.written = 0
+        self.batches = 0
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="cockpit-writer", daemon=True)
+                    self._thread.start()
+
+    def append(self, path: Path | str, entry: dict, ensure_ascii: bool = True):
+        """Queue one record for `path`. Serialised now so later mutation of `entry` is harmless."""
+        self.append_line(path, json.dumps(entry, ensure_ascii=ensure_ascii))
+
+    def append_line(self, path: Path | str, line: str):
+        """Queue one already-encoded JSONL line (without trailing newline)."""
+        line += "\n"
+        if self._closed:
+            self._write({Path(path): [line]}, fsync=self.fsync != "none")
+            return
+        self._ensure_started()
+        self._queue.put((Path(path), line))
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Block until everything queued so far is on disk."""
+        if self._thread is None:
+            return True
+        marker = _Flush(fsync=self.fsync != "none")
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: float | None = 5.0):
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    # ── writer thread ──
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            pending: dict[Path, list[str]] = {}
+            markers: list[_Flush] = []
+            stop = False
+            count = 0
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                if isinstance(item, _Flush):
+                    markers.append(item)
+                    break
+                path, line = item
+                pending.setdefault(path, []).append(line)
+                count += 1
+                if count >= self.max_batch:
+                    break
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if pending:
+                fsync = self.fsync == "batch" or any(m.fsync for m in markers)
+                self._write(pending, fsync=fsync)
+            for m in markers:
+                m.done.set()
+            if stop:
+                return
+
+    @span("cockpit.write")
+    def _write(self, pending: dict, fsync: bool):
+        for path, lines in pending.items():
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with append_lock(path), path.open("a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+                    if fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+                self.written += len(lines)
+                maybe_rotate(path)
+                if store_enabled():
+                    # incremental: the bytes appended since the last import, plus the
+                    # rest of any segment rotated out since (other processes append too)
+                    get_store().import_jsonl(path)
+            except Exception:
+                # logging must never take the app down, nor stop this thread
+                continue
+        self.batches += 1
+
+
+_writer: CockpitWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> CockpitWriter:
+    """Process-wide writer, flushed and stopped at interpreter exit."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = CockpitWriter()
+                atexit.register(_writer.close)
+    return _writer
+
+
+def append_jsonl(path: Path | str, entry: dict, ensure_ascii: bool = True):
+    """Queue a JSONL record for any cockpit file."""
+    get_writer().append(path, entry, ensure_ascii=ensure_ascii)
+
+
+def log_event(path: Path | str, event: str, payload=None, **fields) -> CockpitEvent:
+    """Queue a schema-v1 cockpit event (see utils.events) for `path`."""
+    evt = make_event(event, payload, **fields)
+    get_writer().append_line(path, evt.encode())
+    return evt
+
 
 def write_cockpit_event(action: str, payload=None, user="local-dev"):
-    evt = {
-        "ts": datetime.now(timezone.utc).isoformat(),
-        "user": user,
-        "tool": "dream-landing",
-        "action": action,
-        "payload": payload or {},
-    }
-    with LOG_PATH.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(evt) + "\n")
+    log_event(LOG_PATH, action, payload, user=user, tool="dream-landing")
@@ -0,0 +1,86 @@
+"""UI-free core of the Dream Landing app.
+
+Everything a page needs besides Streamlit itself: data paths, the cost model
+and lookup table, indicators, cockpit logging and log readers. Importing it
+renders nothing, reads no secrets and writes nothing, so pages (and the API)
+can import it without executing the landing page in streamlit_app.py.
+
+Names are resolved on first access, so `from utils.core import LOG_EVENTS,
+log_event` loads the cockpit writer but not pandas or the lookup table.
+"""
+import importlib
+
+from utils.paths import COCKPIT_DIR, DATA_DIR, LOG_DREAM, LOG_EVENTS, LOG_MILKBOT, LOG_PERF, UPLOADS_DIR
+
+APP_SLUG = "dream-landing"
+APP_VERSION = "1.4"
+
+# name -> (module, attribute)
+_EXPORTS = {
+    # cost model
+    "COST_MODEL": ("utils.estimator", "COST_MODEL"),
+    "CostModel": ("utils.estimator", "CostModel"),
+    "get_cost_model": ("utils.estimator", "get_cost_model"),
+    "compute_feature_cost": ("utils.estimator", "compute_feature_cost"),
+    # lookup table / wizard options
+    "AI_OPTIONS": ("utils.lookup", "AI_OPTIONS"),
+    "INTEGRATION_OPTIONS": ("utils.lookup", "INTEGRATION_OPTIONS"),
+    "CONTENT_OPTIONS": ("utils.lookup", "CONTENT_OPTIONS"),
+    "answer_key": ("utils.lookup", "answer_key"),
+    "get_table": ("utils.lookup", "get_table"),
+    "lookup": ("utils.lookup", "lookup"),
+    "what_if": ("utils.lookup", "what_if"),
+    # indicators
+    "RISK_RULES": ("utils.indicators", "RISK_RULES"),
+    "RiskRules": ("utils.indicators", "RiskRules"),
+    "derive_indicators": ("utils.indicators", "derive_indicators"),
+    "compute_live_indicators": ("utils.indicators", "compute_live_indicators"),
+    # wizard answers / drafts
+    "canonical_answers": ("utils.answers", "canonical_answers"),
+    "validate_answers": ("utils.answers", "validate_answers"),
+    "WIZARD_CHOICES": ("utils.answers", "WIZARD_CHOICES"),
+    "Draft": ("utils.drafts", "Draft"),
+    "get_drafts": ("utils.drafts", "get_drafts"),
+    # cockpit logging
+    "log_event": ("utils.cockpit", "log_event"),
+    "write_cockpit_event": ("utils.cockpit", "write_cockpit_event"),
+    # timing spans
+    "span": ("utils.spans", "span"),
+    "get_profiler": ("utils.spans", "get_profiler"),
+    "get_indicator_log": ("utils.coalescer", "get_indicator_log"),
+    # cockpit reading
+    "follow": ("utils.logreader", "follow"),
+    "iter_events_reverse": ("utils.logreader", "iter_events_reverse"),
+    "tail_events": ("utils.logreader", "tail_events"),
+    "recent_states": ("utils.coalescer", "recent_states"),
+    "get_store": ("utils.event_store", "get_store"),
+    "store_enabled": ("utils.event_store", "store_enabled"),
+    "get_rollups": ("utils.rollups", "get_engine"),
+    # QR codes
+    "render_qr": ("utils.qr", "render_qr"),
+    "qr_available": ("utils.qr", "qr_available"),
+    # streamed chat completions (openai is imported on the first request)
+    "ChatStream": ("utils.ai", "ChatStream"),
+    "get_prompt_cache": ("utils.prompt_cache", "get_prompt_cache"),
+    "client_stats": ("utils.clients", "client_stats"),
+}
+
+__all__ = [
+    "APP_SLUG", "APP_VERSION",
+    "DATA_DIR", "COCKPIT_DIR", "UPLOADS_DIR", "LOG_EVENTS", "LOG_DREAM", "LOG_MILKBOT", "LOG_PERF",
+    *_EXPORTS,
+]
+
+
+def __getattr__(name: str):
+    try:
+        module, attr = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module), attr)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(__all__)
@@ -0,0 +1,186 @@
+"""Server-side Wizard drafts, keyed by the Wizard's session_id.
+
+    drafts = get_drafts()
+    drafts.put(session_id, Draft(answers, indicators, cost))
+    draft = drafts.get(session_id)      # None if unknown
+
+A draft holds the answers as the Wizard's widgets returned them (not the
+utils.answers canonical form, since they refill those widgets on resume)
+together with the indicators and cost computed from them, so a resumed
+session (?draft=<session_id>) renders without recomputing anything.
+
+- tier 1: in-process LRU of hot drafts (DRAFTS_MEMORY_ITEMS, default 256);
+  drafts untouched for DRAFTS_IDLE_TTL seconds (default 900) leave memory
+- tier 2: SQLite at DRAFTS_DB (default data/drafts.db), written through on
+  every put; drafts not edited for DRAFTS_MAX_AGE seconds (default 30 days)
+  are deleted
+
+Memory therefore stays bounded however many half-finished Wizards are open.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from utils.paths import DRAFTS_DB
+
+DRAFTS_PATH = Path(os.getenv("DRAFTS_DB", str(DRAFTS_DB)))
+MEMORY_ITEMS = int(os.getenv("DRAFTS_MEMORY_ITEMS", "256"))
+IDLE_TTL = float(os.getenv("DRAFTS_IDLE_TTL", "900"))
+MAX_AGE = float(os.getenv("DRAFTS_MAX_AGE", str(30 * 24 * 3600)))
+PURGE_EVERY = 100  # puts between purge passes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS drafts (
+    session_id TEXT PRIMARY KEY,
+    draft      TEXT NOT NULL,
+    updated    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_drafts_updated ON drafts (updated);
+"""
+
+
+@dataclass
+class Draft:
+    answers: Dict[str, Any] = field(default_factory=dict)
+    indicators: Dict[str, Any] = field(default_factory=dict)
+    cost: Dict[str, Any] = field(default_factory=dict)  # {"total", "breakdown"} as from utils.lookup
+
+    def encode(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def decode(cls, raw: str) -> "Draft":
+        return cls(**json.loads(raw))
+
+
+class DraftStore:
+    def __init__(self, path: Path | str | None = DRAFTS_PATH, memory_items: int = MEMORY_ITEMS,
+                 idle_ttl: float = IDLE_TTL, max_age: float = MAX_AGE):
+        self.path = Path(path) if path else None
+        self.memory_items = memory_items
+        self.idle_ttl = idle_ttl
+        self.max_age = max_age
+        self._memory: "OrderedDict[str, tuple[Draft, float]]" = OrderedDict()  # id -> (draft, last touched)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._puts = 0
+        self.stats: Dict[str, int] = {"memory": 0, "disk": 0, "miss": 0, "saved": 0, "idle_evicted": 0,
+                                      "lru_evicted": 0, "purged": 0}
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._conn() as conn:
+                conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ── reads ──
+    def get(self, session_id: str) -> Optional[Draft]:
+        now = time.time()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._memory.get(session_id)
+            if entry is not None:
+                self._memory[session_id] = (entry[0], now)
+                self._memory.move_to_end(session_id)
+                self.stats["memory"] += 1
+                return entry[0]
+        row = None
+        if self.path:
+            with self._conn() as conn:
+                row = conn.execute("SELECT draft FROM drafts WHERE session_id = ? AND updated > ?",
+                                   (session_id, now - self.max_age)).fetchone()
+        with self._lock:
+            if row is None:
+                self.stats["miss"] += 1
+                return None
+            self.stats["disk"] += 1
+        draft = Draft.decode(row[0])
+        self._remember(session_id, draft, now)
+        return draft
+
+    # ── writes ──
+    def put(self, session_id: str, draft: Draft):
+        now = time.time()
+        self._remember(session_id, draft, now)
+        with self._lock:
+            self.stats["saved"] += 1
+            self._puts += 1
+            purge = self._puts % PURGE_EVERY == 0
+        if self.path:
+            with self._conn() as conn:
+                conn.execute("INSERT OR REPLACE INTO drafts (session_id, draft, updated) VALUES (?, ?, ?)",
+                             (session_id, draft.encode(), now))
+            if purge:
+                self.purge(now)
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._memory.pop(session_id, None)
+        if self.path:
+            with self._conn() as conn:
+                conn.execute("DELETE FROM drafts WHERE session_id = ?", (session_id,))
+
+    def _remember(self, session_id: str, draft: Draft, now: float):
+        with self._lock:
+            self._memory[session_id] = (draft, now)
+            self._memory.move_to_end(session_id)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+                self.stats["lru_evicted"] += 1
+            self._evict_idle(now)
+
+    def _evict_idle(self, now: float):
+        """Drop idle drafts from memory (caller holds the lock); they stay in SQLite."""
+        while self._memory:
+            oldest = next(iter(self._memory))
+            if now - self._memory[oldest][1] < self.idle_ttl:
+                break
+            del self._memory[oldest]
+            self.stats["idle_evicted"] += 1
+
+    def purge(self, now: Optional[float] = None) -> int:
+        """Delete drafts not edited for max_age seconds."""
+        if not self.path:
+            return 0
+        now = now or time.time()
+        with self._conn() as conn:
+            n = conn.execute("DELETE FROM drafts WHERE updated <= ?", (now - self.max_age,)).rowcount
+        with self._lock:
+            self.stats["purged"] += n
+        return n
+
+    def in_memory(self) -> int:
+        with self._lock:
+            return len(self._memory)
+
+    def count(self) -> int:
+        if not self.path:
+            return self.in_memory()
+        return self._conn().execute("SELECT COUNT(*) FROM drafts").fetchone()[0]
+
+
+_store: Optional[DraftStore] = None
+_store_lock = threading.Lock()
+
+
+def get_drafts() -> DraftStore:
+    """Process-wide draft store."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = DraftStore()
+    return _store
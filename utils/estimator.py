@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable
+
+from utils.lazy import lazy_import
+from utils.spans import span
+
+# only the batch estimator needs these; the scalar path (Wizard, lookup table) stays pure Python
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# ──────────────────────────────────────────────────────────────
+# Cost model (3.2 rules)
+# ──────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class CostModel:
+    version: str = "3.2"
+    base: float = 29.0
+    auth: float = 4.0
+    payments: float = 8.0
+    ai: float = 10.0
+    per_integration: float = 2.0
+    integrations_cap: float = 6.0
+    content_need_copy: float = 3.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+COST_MODEL = CostModel()
+
+# Named cost-model versions, for re-pricing past quotes (tools/backtest.py).
+# Add a version here before it goes live so old quotes can be compared with it.
+COST_MODELS: Dict[str, CostModel] = {COST_MODEL.version: COST_MODEL}
+
+
+def get_cost_model(version: str) -> CostModel:
+    """A registered cost model by version, e.g. get_cost_model("3.2")."""
+    try:
+        return COST_MODELS[version]
+    except KeyError:
+        raise KeyError(f"unknown cost model {version!r} (known: {', '.join(COST_MODELS)})") from None
+
+# Columns of the encoded answer matrix consumed by estimate_batch
+ENCODED_COLUMNS = ("auth", "payments", "ai", "integrations", "need_copy")
+# Per-line breakdown columns, same labels as the scalar breakdown dict
+BREAKDOWN_COLUMNS = ("Base", "Auth", "Payments", "AI", "Integrations", "Content Support")
+
+
+@span("estimator.compute_feature_cost")
+def compute_feature_cost(auth_needed, payments_needed, ai_features, integrations, content_support,
+                         model: CostModel = COST_MODEL) -> Dict[str, Any]:
+    """Price a single answer set. Returns {"total": float, "breakdown": {line: amount}}."""
+    base = model.base
+    cost = base
+    breakdown = {"Base": base}
+
+    if auth_needed:
+        cost += model.auth
+        breakdown["Auth"] = model.auth
+    if payments_needed:
+        cost += model.payments
+        breakdown["Payments"] = model.payments
+    if ai_features and any(a.strip() and a != "None" for a in ai_features):
+        cost += model.ai
+        breakdown["AI"] = model.ai
+    if integrations and any(i != "None" for i in integrations):
+        extra = min(model.per_integration * len([i for i in integrations if i != "None"]), model.integrations_cap)
+        cost += extra
+        breakdown["Integrations"] = extra
+    if content_support == "Need copy":
+        cost += model.content_need_copy
+        breakdown["Content Support"] = model.content_need_copy
+
+    return {"total": cost, "breakdown": breakdown}
+
+
+# ──────────────────────────────────────────────────────────────
+# Batch (vectorized) estimator
+# ──────────────────────────────────────────────────────────────
+def _bool_column(df: pd.DataFrame, name: str) -> np.ndarray:
+    if name not in df:
+        return np.zeros(len(df), dtype=bool)
+    return df[name].fillna(False).astype(bool).to_numpy()
+
+
+def _count_selected(df: pd.DataFrame, name: str, strip_blank: bool = False) -> np.ndarray:
+    """Count multiselect entries other than "None" per row, without a Python loop per row."""
+    if name not in df or len(df) == 0:
+        return np.zeros(len(df), dtype=np.int64)
+    items = df[name].reset_index(drop=True).explode()
+    mask = items.notna() & items.ne("None")
+    if strip_blank:
+        mask &= items.astype(str).str.strip().ne("")
+    return np.bincount(items.index.to_numpy()[mask.to_numpy()], minlength=len(df)).astype(np.int64)
+
+
+def encode_answers(answers: pd.DataFrame | Iterable[Dict[str, Any]]) -> np.ndarray:
+    """Encode wizard answer sets into an (n, 5) matrix laid out as ENCODED_COLUMNS."""
+    df = answers if isinstance(answers, pd.DataFrame) else pd.DataFrame(list(answers))
+    content = df["content_support"] if "content_support" in df else pd.Series([""] * len(df))
+    return np.column_stack([
+        _bool_column(df, "auth_needed"),
+        _bool_column(df, "payments_needed"),
+        _count_selected(df, "ai_features", strip_blank=True),
+        _count_selected(df, "integrations"),
+        content.eq("Need copy").to_numpy(),
+    ]).astype(np.int64)
+
+
+def estimate_batch(answers: np.ndarray | pd.DataFrame | Iterable[Dict[str, Any]],
+                   model: CostModel = COST_MODEL) -> pd.DataFrame:
+    """Price many answer sets in one vectorized pass.
+
+    Accepts a raw DataFrame/records of wizard answers or a pre-encoded matrix
+    (see encode_answers). Returns one row per answer set with a column per
+    breakdown line plus "total".
+    """
+    X = answers if isinstance(answers, np.ndarray) else encode_answers(answers)
+    if X.ndim != 2 or X.shape[1] != len(ENCODED_COLUMNS):
+        raise ValueError(f"expected an (n, {len(ENCODED_COLUMNS)}) matrix, got shape {X.shape}")
+
+    n = X.shape[0]
+    lines = {
+        "Base": np.full(n, model.base),
+        "Auth": np.where(X[:, 0] > 0, model.auth, 0.0),
+        "Payments": np.where(X[:, 1] > 0, model.payments, 0.0),
+        "AI": np.where(X[:, 2] > 0, model.ai, 0.0),
+        "Integrations": np.minimum(model.per_integration * X[:, 3], model.integrations_cap),
+        "Content Support": np.where(X[:, 4] > 0, model.content_need_copy, 0.0),
+    }
+    out = pd.DataFrame(lines)
+    out["total"] = out[list(BREAKDOWN_COLUMNS)].sum(axis=1)
+    if isinstance(answers, pd.DataFrame):
+        out.index = answers.index
+    return out
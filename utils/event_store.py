@@ -0,0 +1,229 @@
+"""Optional SQLite-backed cockpit event store.
+
+Enable with COCKPIT_STORE=sqlite (database path: COCKPIT_DB, default
+data/cockpit/cockpit.db). The background writer then mirrors every JSONL
+batch into the store, and the Cockpit expander / Indicators page query it
+instead of scanning files. Existing logs are loaded with:
+
+    python -m utils.event_store import data/cockpit/*.jsonl
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from utils.events import decode
+from utils.paths import COCKPIT_DIR
+from utils.rotation import load_manifest, parse_ts, read_segment, rotation_in_progress
+
+STORE_PATH = Path(os.getenv("COCKPIT_DB", str(COCKPIT_DIR / "cockpit.db")))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id          INTEGER PRIMARY KEY,
+    log         TEXT NOT NULL,
+    ts          TEXT,
+    ts_epoch    REAL,
+    name        TEXT,
+    session     TEXT,
+    app_version TEXT,
+    raw         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_log_ts ON events (log, ts_epoch);
+CREATE INDEX IF NOT EXISTS idx_events_name_ts ON events (name, ts_epoch);
+CREATE INDEX IF NOT EXISTS idx_events_session_ts ON events (session, ts_epoch);
+CREATE INDEX IF NOT EXISTS idx_events_version ON events (app_version);
+CREATE TABLE IF NOT EXISTS imports (
+    source TEXT PRIMARY KEY,
+    inode  INTEGER,
+    offset INTEGER NOT NULL,
+    lines  INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def store_enabled() -> bool:
+    return os.getenv("COCKPIT_STORE", "").lower() == "sqlite"
+
+
+def _row(log: str, raw: str) -> Optional[tuple]:
+    evt = decode(raw)
+    if evt is None:
+        return None
+    ts = parse_ts(evt.ts) if evt.ts else None
+    return (
+        log,
+        evt.ts,
+        ts.timestamp() if ts else None,
+        evt.event,
+        evt.session,
+        f"{evt.app or ''}@{evt.version}" if evt.version else None,
+        evt.encode(),
+    )
+
+
+def _insert(conn: sqlite3.Connection, log: str, lines: Iterable[str | bytes]) -> int:
+    rows = []
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        row = _row(log, line) if line.strip() else None
+        if row:
+            rows.append(row)
+    if rows:
+        conn.executemany(
+            "INSERT INTO events (log, ts, ts_epoch, name, session, app_version, raw) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+def _mark_imported(conn: sqlite3.Connection, seg: dict):
+    conn.execute("INSERT OR REPLACE INTO imports VALUES (?, NULL, 0, 0)", (f"segment:{seg['file']}",))
+
+
+class EventStore:
+    """Indexed event table (WAL mode, one connection per thread)."""
+
+    def __init__(self, path: Path | str = STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ── writes ──
+    def insert_lines(self, log: str, lines: Iterable[str | bytes]) -> int:
+        with self._conn() as conn:
+            return _insert(conn, log, lines)
+
+    def import_jsonl(self, path: Path | str, batch_size: int = 20_000) -> int:
+        """Load a log (its rotated segments, then the active file) into the store.
+
+        Progress is remembered per source, so re-running only imports what was
+        appended since the last run. The whole import is one BEGIN IMMEDIATE
+        transaction, so concurrent importers (API and app) never insert the
+        same lines twice.
+        """
+        path = Path(path)
+        if rotation_in_progress(path):
+            return 0
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            total = self._import(conn, path, batch_size)
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+        return total
+
+    def _import(self, conn: sqlite3.Connection, path: Path, batch_size: int) -> int:
+        log = path.stem
+        total = 0
+        source = f"file:{path.resolve()}"
+        row = conn.execute("SELECT inode, offset, lines FROM imports WHERE source = ?", (source,)).fetchone()
+        inode, offset, done = row if row else (None, 0, 0)
+
+        new_segments = [
+            seg for seg in load_manifest(path)
+            if not conn.execute("SELECT 1 FROM imports WHERE source = ?", (f"segment:{seg['file']}",)).fetchone()
+        ]
+        # the active file we imported from has since been rotated: its lines
+        # open the first new segment (the new active file may reuse the inode)
+        skip = done if new_segments else 0
+        if new_segments:
+            inode, offset, done = None, 0, 0
+        for seg in new_segments:
+            total += _insert(conn, log, read_segment(path, seg)[skip:])
+            skip = 0
+            _mark_imported(conn, seg)
+
+        if not path.exists():
+            return total
+        st = path.stat()
+        if inode != st.st_ino or offset > st.st_size:
+            offset, done = 0, 0
+        with path.open("rb") as f:
+            f.seek(offset)
+            while True:
+                lines = f.readlines(batch_size * 256)
+                if not lines:
+                    break
+                if not lines[-1].endswith(b"\n"):
+                    # leave a half-written last line for the next import
+                    f.seek(-len(lines[-1]), os.SEEK_CUR)
+                    lines.pop()
+                    if not lines:
+                        break
+                total += _insert(conn, log, lines)
+                offset = f.tell()
+                done += sum(1 for line in lines if line.strip())
+        conn.execute("INSERT OR REPLACE INTO imports VALUES (?, ?, ?, ?)", (source, st.st_ino, offset, done))
+        return total
+
+    # ── reads ──
+    def recent(self, log: Optional[str] = None, name: Optional[str | Tuple[str, ...]] = None,
+               session: Optional[str] = None, app_version: Optional[str] = None, limit: int = 25) -> List[dict]:
+        """Most recent matching events (schema v1 dicts), newest-first. `name` may be a tuple of names."""
+        clauses, params = [], []
+        for column, value in (("log", log), ("name", name), ("session", session), ("app_version", app_version)):
+            if isinstance(value, tuple):
+                clauses.append(f"{column} IN ({', '.join('?' * len(value))})")
+                params.extend(value)
+            elif value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn().execute(
+            f"SELECT raw FROM events {where} ORDER BY ts_epoch DESC, id DESC LIMIT ?", (*params, limit)
+        ).fetchall()
+        return [json.loads(raw) for (raw,) in rows]
+
+    def count(self, log: Optional[str] = None) -> int:
+        if log is None:
+            return self._conn().execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        return self._conn().execute("SELECT COUNT(*) FROM events WHERE log = ?", (log,)).fetchone()[0]
+
+
+_store: Optional[EventStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> EventStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = EventStore()
+    return _store
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m utils.event_store")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    imp = sub.add_parser("import", help="bulk import cockpit JSONL logs")
+    imp.add_argument("paths", nargs="+")
+    imp.add_argument("--db", default=str(STORE_PATH))
+    args = parser.parse_args(argv)
+
+    store = EventStore(args.db)
+    for p in args.paths:
+        n = store.import_jsonl(p)
+        print(f"{p}: {n:,} events imported")
+    print(f"{store.path}: {store.count():,} events total")
+
+
+if __name__ == "__main__":
+    main()
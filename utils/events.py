@@ -0,0 +1,174 @@
+"""Cockpit event record (schema v1) and codec.
+
+Every cockpit writer emits the same compact record:
+
+    {"v":1,"ts":"...","event":"submit_wizard","payload":{...},"session":"..."}
+
+Optional keys (session, app, version, user, tool) are omitted when unset.
+decode() also reads the three legacy shapes found in older logs
+({"event", "app", "version"}, {"action", "user", "tool", "session"} and bare
+{"event", "payload"}), so readers only ever see one shape.
+
+Rewrite old files in place with:
+
+    python -m utils.events convert data/cockpit/*.jsonl
+"""
+import argparse
+import json
+import json.encoder
+import json.scanner
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SCHEMA_VERSION = 1
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+_V1_PREFIX = b'{"v":1,'
+
+# Fast path: the C scanner/encoder behind json.loads/dumps, called directly to
+# skip their per-call wrapping (the encoder does no circular-reference check).
+_scan_once = json.scanner.make_scanner(json.JSONDecoder())
+_c_encode = json.encoder.c_make_encoder and json.encoder.c_make_encoder(
+    None, _encoder.default, json.encoder.encode_basestring, None, ":", ",", False, False, True)
+
+
+@dataclass(slots=True)
+class CockpitEvent:
+    ts: str
+    event: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    session: Optional[str] = None
+    app: Optional[str] = None
+    version: Optional[str] = None
+    user: Optional[str] = None
+    tool: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {"v": SCHEMA_VERSION, "ts": self.ts, "event": self.event, "payload": self.payload}
+        if self.session is not None:
+            d["session"] = self.session
+        if self.app is not None:
+            d["app"] = self.app
+        if self.version is not None:
+            d["version"] = self.version
+        if self.user is not None:
+            d["user"] = self.user
+        if self.tool is not None:
+            d["tool"] = self.tool
+        return d
+
+    def encode(self) -> str:
+        """One JSONL line (no trailing newline)."""
+        if _c_encode is None:
+            return _encoder.encode(self.to_dict())
+        return "".join(_c_encode(self.to_dict(), 0))
+
+
+def make_event(event: str, payload: Optional[Dict[str, Any]] = None, **fields) -> CockpitEvent:
+    """New event stamped with the current UTC time."""
+    return CockpitEvent(datetime.now(timezone.utc).isoformat(), event, payload or {}, **fields)
+
+
+def from_dict(d: Dict[str, Any]) -> Optional[CockpitEvent]:
+    """Adapt any known record shape (v1 or legacy) to a CockpitEvent."""
+    if d.get("v") == SCHEMA_VERSION:
+        return CockpitEvent(d["ts"], d["event"], d.get("payload") or {}, d.get("session"), d.get("app"),
+                            d.get("version"), d.get("user"), d.get("tool"))
+    name = d.get("event") or d.get("action")
+    if not name:
+        return None
+    payload = d.get("payload")
+    return CockpitEvent(
+        str(d.get("ts", "")),
+        name,
+        payload if isinstance(payload, dict) else {"value": payload} if payload is not None else {},
+        d.get("session"),
+        d.get("app"),
+        str(d["version"]) if d.get("version") is not None else None,
+        d.get("user"),
+        d.get("tool"),
+    )
+
+
+def _decode_v1(line: bytes) -> Optional[CockpitEvent]:
+    try:
+        text = line.decode("utf-8")
+        d, end = _scan_once(text, 0)
+        if end != len(text) and text[end:].strip():
+            return None  # trailing garbage: let json.loads reject it
+        get = d.get
+        return CockpitEvent(d["ts"], d["event"], get("payload") or {}, get("session"), get("app"),
+                            get("version"), get("user"), get("tool"))
+    except (ValueError, KeyError, StopIteration):  # ValueError covers JSON and UTF-8 errors
+        return None
+
+
+def decode(line: bytes | str) -> Optional[CockpitEvent]:
+    """Decode one JSONL line; None for blank, corrupt or unrecognised lines.
+
+    v1 lines written by encode() take a fast path that skips json.loads'
+    wrapping and the legacy shape adapters."""
+    if isinstance(line, bytes) and line.startswith(_V1_PREFIX):
+        evt = _decode_v1(line)
+        if evt is not None:
+            return evt
+    try:
+        d = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if not isinstance(d, dict):
+        return None
+    try:
+        return from_dict(d)
+    except KeyError:
+        return None
+
+
+def is_v1(line: bytes) -> bool:
+    return line.startswith(_V1_PREFIX)
+
+
+# ──────────────────────────────────────────────────────────────
+# Converter
+# ──────────────────────────────────────────────────────────────
+def convert_file(path: Path | str) -> Dict[str, int]:
+    """Rewrite a JSONL log in schema v1 (atomic replace). Stop the app first."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".converting")
+    stats = {"converted": 0, "unchanged": 0, "dropped": 0}
+    with path.open("rb") as fin, tmp.open("w", encoding="utf-8") as fout:
+        for line in fin:
+            line = line.strip()
+            if not line:
+                continue
+            if is_v1(line):
+                fout.write(line.decode("utf-8") + "\n")
+                stats["unchanged"] += 1
+                continue
+            evt = decode(line)
+            if evt is None:
+                stats["dropped"] += 1
+                continue
+            fout.write(evt.encode() + "\n")
+            stats["converted"] += 1
+    os.replace(tmp, path)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m utils.events")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    conv = sub.add_parser("convert", help="rewrite cockpit JSONL logs in schema v1")
+    conv.add_argument("paths", nargs="+")
+    args = parser.parse_args(argv)
+
+    for p in args.paths:
+        stats = convert_file(p)
+        print(f"{p}: {stats['converted']} converted, {stats['unchanged']} already v1, {stats['dropped']} unreadable")
+
+
+if __name__ == "__main__":
+    main()
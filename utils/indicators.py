@@ -1,44 +1,52 @@
+from dataclasses import dataclass
 from datetime import datetime, timezone
-import json
-from pathlib import Path
 
-LOG_FILE = Path("data/cockpit/events.jsonl")
-LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
 
-def compute_live_indicators(answers: dict, feature_cost: dict) -> dict:
-    """Compute live project indicators for cost, risk, and AI use."""
+
+@dataclass(frozen=True)
+class RiskRules:
+    medium_cost: float = 50.0
+    high_cost: float = 80.0
+
+
+RISK_RULES = RiskRules()
+
+
+def derive_indicators(answers: dict, feature_cost: dict, rules: RiskRules = RISK_RULES) -> dict:
+    """Pure indicator math (no timestamp, no logging)."""
     total_cost = feature_cost.get("total", 0)
-    ai_features = answers.get("ai_features", [])
+    # "None" is a menu choice, not a feature: ignored here as in the cost model
+    ai_features = [a for a in answers.get("ai_features") or [] if str(a).strip() and a != "None"]
     payments_needed = answers.get("payments_needed")
     auth_needed = answers.get("auth_needed")
 
     # Risk calculation heuristic
     risk_level = "Low"
-    if total_cost > 50 or payments_needed or auth_needed:
+    if total_cost > rules.medium_cost or payments_needed or auth_needed:
         risk_level = "Medium"
-    if total_cost > 80 or (payments_needed and ai_features):
+    if total_cost > rules.high_cost or (payments_needed and ai_features):
         risk_level = "High"
 
-    ai_tools_needed = len(ai_features) if ai_features else 0
+    ai_tools_needed = len(ai_features)
 
-    indicators = {
+    return {
         "estimated_cost": total_cost,
         "risk_level": risk_level,
         "ai_tools_needed": ai_tools_needed,
-        "ts": datetime.now(timezone.utc).isoformat()
     }
 
-    # Log cockpit event
-    _log_indicator_update(indicators)
-    return indicators
 
+def compute_live_indicators(answers: dict, feature_cost: dict | None = None) -> dict:
+    """Compute live project indicators for cost, risk, and AI use.
 
-def _log_indicator_update(indicators: dict):
-    """Append indicator update to cockpit JSONL file."""
-    entry = {
-        "ts": indicators["ts"],
-        "event": "indicator.update",
-        "payload": indicators,
-    }
-    with LOG_FILE.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    When feature_cost is omitted the indicators come from the precomputed
+    lookup table (utils.lookup), falling back to the cost model directly.
+    Nothing is logged here; the Wizard logs through utils.coalescer.
+    """
+    if feature_cost is None:
+        from utils.lookup import lookup
+        indicators = dict(lookup(answers).indicators)
+    else:
+        indicators = derive_indicators(answers, feature_cost)
+    indicators["ts"] = datetime.now(timezone.utc).isoformat()
+    return indicators
@@ -0,0 +1,72 @@
+"""Deferred imports for heavy or optional dependencies.
+
+    openai = lazy_import("openai")      # nothing imported yet
+    if use_ai:
+        client = openai.OpenAI()        # first attribute access imports it
+
+available() answers "is it installed?" from the import system's metadata
+without executing the module, so pages can decide what to offer for free.
+"""
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+from typing import Dict
+
+_proxies: Dict[str, "LazyModule"] = {}
+_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in module that imports the real one on first attribute access or assignment."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        object.__setattr__(self, "_lazy_module", None)
+
+    def _load(self) -> types.ModuleType:
+        module = object.__getattribute__(self, "_lazy_module")
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            object.__setattr__(self, "_lazy_module", module)
+        return module
+
+    def __getattr__(self, attr: str):
+        # only called for attributes not found on the proxy itself
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if object.__getattribute__(self, "_lazy_module") is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """The module itself if it is already imported, otherwise a LazyModule proxy for it."""
+    if name in sys.modules:
+        return sys.modules[name]
+    with _lock:
+        proxy = _proxies.get(name)
+        if proxy is None:
+            proxy = _proxies[name] = LazyModule(name)
+    return proxy
+
+
+def available(name: str) -> bool:
+    """True if `name` can be imported (checked without importing it)."""
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def is_loaded(name: str) -> bool:
+    return name in sys.modules
@@ -0,0 +1,212 @@
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from utils.events import decode
+from utils.rotation import (load_manifest, manifest_path, parse_ts, read_segment, rotating_path,
+                            rotation_in_progress, segment_in_range)
+
+BLOCK_SIZE = 64 * 1024
+
+
+def _reverse_lines(path: Path, block_size: int = BLOCK_SIZE, end: Optional[int] = None) -> Iterator[bytes]:
+    """Yield the raw lines of a file last-to-first, reading fixed-size blocks from the end
+    (or from byte `end`)."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell() if end is None else min(end, f.tell())
+        tail = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step) + tail
+            lines = chunk.split(b"\n")
+            # first piece may be the end of a line that started in an earlier block
+            tail = lines[0]
+            for line in reversed(lines[1:]):
+                if line.strip():
+                    yield line
+        if tail.strip():
+            yield tail
+
+
+def _reverse_sources(path: Path, since: Optional[datetime], until: Optional[datetime],
+                     block_size: int, end: Optional[int] = None) -> Iterator[bytes]:
+    """Raw lines newest-first across the active file, a half-rotated file and gzip segments."""
+    yield from _reverse_lines(path, block_size, end)
+    yield from _reverse_lines(rotating_path(path), block_size)
+    for seg in reversed(load_manifest(path)):
+        # the manifest's time range lets us skip segments without opening them
+        if not segment_in_range(seg, since, until):
+            continue
+        try:
+            yield from reversed(read_segment(path, seg))
+        except OSError:
+            continue
+
+
+def _in_range(evt: dict, since: Optional[datetime], until: Optional[datetime]) -> bool:
+    if since is None and until is None:
+        return True
+    ts = parse_ts(evt.get("ts"))
+    if ts is None:
+        return False
+    return (since is None or ts >= since) and (until is None or ts <= until)
+
+
+def decode_lines(lines: Iterable[bytes], name: Optional[str] = None,
+                 since: Optional[datetime] = None, until: Optional[datetime] = None) -> Iterator[dict]:
+    """Decode raw JSONL lines (any record shape) into schema-v1 dicts, applying the filters.
+
+    `name` matches the event name whether the record stored it as "event" or "action".
+    """
+    needle = name.encode() if name else b""
+    for line in lines:
+        # cheap byte check before paying for json.loads
+        if needle and needle not in line:
+            continue
+        evt = decode(line)
+        if evt is None or (name is not None and evt.event != name):
+            continue
+        d = evt.to_dict()
+        if _in_range(d, since, until):
+            yield d
+
+
+def iter_events_reverse(path: Path | str, name: Optional[str] = None,
+                        since: datetime | str | None = None, until: datetime | str | None = None,
+                        block_size: int = BLOCK_SIZE) -> Iterator[dict]:
+    """Decoded cockpit events newest-first, optionally filtered by event name / time.
+
+    Reads rotated segments transparently once the active file is exhausted.
+    Only the blocks needed to satisfy the consumer are read, so cost depends
+    on how many events are taken, not on the size of the log.
+    """
+    path = Path(path)
+    since, until = parse_ts(since) if since else None, parse_ts(until) if until else None
+    lines = _reverse_sources(path, since, until, block_size)
+    yield from decode_lines(lines, name=name, since=since, until=until)
+
+
+def tail_events(path: Path | str, limit: int, name: Optional[str] = None,
+                since: datetime | str | None = None, until: datetime | str | None = None) -> List[dict]:
+    """The `limit` most recent matching events, newest-first."""
+    return list(islice(iter_events_reverse(path, name=name, since=since, until=until), limit))
+
+
+# ──────────────────────────────────────────────────────────────
+# Incremental tailing (process-wide)
+# ──────────────────────────────────────────────────────────────
+class LogTail:
+    """Follows one log by byte offset and keeps a bounded ring of recent events.
+
+    Each poll() costs one stat() plus parsing whatever was appended since the
+    previous poll. A rotation (new inode or new segment in the manifest) or a
+    file shorter than the saved offset (truncation) triggers a reseed from the
+    end of the log.
+    """
+
+    def __init__(self, path: Path | str, capacity: int = 200, name: Optional[str] = None):
+        self.path = Path(path)
+        self.name = name
+        self.ring: deque = deque(maxlen=capacity)
+        self.offset = 0
+        self.inode: Optional[int] = None
+        self.manifest_mtime: Optional[float] = None
+        self.reseeds = 0
+        self._lock = threading.Lock()
+
+    def _complete_end(self, size: int) -> int:
+        """Offset just past the last complete line at or before `size`."""
+        with open(self.path, "rb") as f:
+            pos = size
+            while pos > 0:
+                step = min(BLOCK_SIZE, pos)
+                f.seek(pos - step)
+                nl = f.read(step).rfind(b"\n")
+                if nl >= 0:
+                    return pos - step + nl + 1
+                pos -= step
+        return 0
+
+    def _seed(self, size: int):
+        size = self._complete_end(size)
+        lines = _reverse_sources(self.path, None, None, BLOCK_SIZE, end=size)
+        newest_first = islice(decode_lines(lines, name=self.name), self.ring.maxlen)
+        self.ring.clear()
+        self.ring.extendleft(newest_first)
+        self.offset = size
+        self.reseeds += 1
+
+    def _manifest_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(manifest_path(self.path)).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def poll(self) -> int:
+        """Pull in newly appended events. Returns how many were added."""
+        with self._lock:
+            if rotation_in_progress(self.path):
+                return 0
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                # not created yet (or removed): keep what we have
+                self.inode, self.offset = None, 0
+                return 0
+            manifest_mtime = self._manifest_mtime()
+            # a new segment means a rotation even if the new file reused the inode
+            if st.st_ino != self.inode or st.st_size < self.offset or manifest_mtime != self.manifest_mtime:
+                self.inode, self.manifest_mtime = st.st_ino, manifest_mtime
+                self._seed(st.st_size)
+                return len(self.ring)
+            if st.st_size == self.offset:
+                return 0
+
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                data = f.read(st.st_size - self.offset)
+            # only consume complete lines; a partial last line is re-read next poll
+            cut = data.rfind(b"\n") + 1
+            if cut == 0:
+                return 0
+            self.offset += cut
+            added = list(decode_lines(data[:cut].split(b"\n"), name=self.name))
+            self.ring.extend(added)
+            return len(added)
+
+    def recent(self, limit: int) -> List[dict]:
+        """The `limit` most recent events held in the ring, newest-first."""
+        with self._lock:
+            return list(islice(reversed(self.ring), limit))
+
+
+_tails: dict = {}
+_tails_lock = threading.Lock()
+
+
+def get_tail(path: Path | str, capacity: int = 200, name: Optional[str] = None) -> LogTail:
+    """Shared tailer for (path, filter); state survives Streamlit reruns and sessions."""
+    key = (Path(path).resolve(), name)
+    with _tails_lock:
+        tail = _tails.get(key)
+        if tail is None:
+            tail = _tails[key] = LogTail(path, capacity=capacity, name=name)
+    return tail
+
+
+def follow(path: Path | str, limit: int, name: Optional[str] = None) -> List[dict]:
+    """Near-real-time tail: poll the shared tailer and return the newest `limit` events."""
+    tail = get_tail(path, capacity=max(limit, 200), name=name)
+    tail.poll()
+    return tail.recent(limit)
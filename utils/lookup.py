@@ -0,0 +1,135 @@
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from utils.estimator import COST_MODEL, CostModel, compute_feature_cost
+from utils.indicators import RISK_RULES, RiskRules, derive_indicators
+
+# Wizard options that feed the cost model / risk indicators
+AI_OPTIONS = ("Chatbot", "OCR", "Recommendations", "None")
+INTEGRATION_OPTIONS = ("Supabase", "Stripe", "Google Sheets", "None")
+CONTENT_OPTIONS = ("Have copy", "Need copy", "Mixed")
+
+# ──────────────────────────────────────────────────────────────
+# Answer key layout (11 bits)
+#   bit 0      auth_needed
+#   bit 1      payments_needed
+#   bits 2-5   ai_features mask (AI_OPTIONS order)
+#   bits 6-9   integrations mask (INTEGRATION_OPTIONS order)
+#   bit 10     content_support == "Need copy"
+# ──────────────────────────────────────────────────────────────
+AUTH_BIT = 1 << 0
+PAYMENTS_BIT = 1 << 1
+AI_SHIFT = 2
+INTEGRATIONS_SHIFT = 6
+NEED_COPY_BIT = 1 << 10
+KEY_SPACE = 1 << 11
+
+
+class Entry(NamedTuple):
+    cost: Dict[str, Any]
+    indicators: Dict[str, Any]
+
+
+def _mask(selected, options) -> Optional[int]:
+    mask = 0
+    for item in selected or []:
+        if item not in options:
+            return None
+        mask |= 1 << options.index(item)
+    return mask
+
+
+def answer_key(answers: dict) -> Optional[int]:
+    """Bit-encode the price/risk-relevant answers. None if an answer is off-menu."""
+    ai = _mask(answers.get("ai_features"), AI_OPTIONS)
+    integrations = _mask(answers.get("integrations"), INTEGRATION_OPTIONS)
+    if ai is None or integrations is None:
+        return None
+    key = ai << AI_SHIFT | integrations << INTEGRATIONS_SHIFT
+    if answers.get("auth_needed"):
+        key |= AUTH_BIT
+    if answers.get("payments_needed"):
+        key |= PAYMENTS_BIT
+    if answers.get("content_support") == "Need copy":
+        key |= NEED_COPY_BIT
+    return key
+
+
+def decode_key(key: int) -> dict:
+    """Inverse of answer_key (content is reported as "Need copy" or "Have copy")."""
+    ai = key >> AI_SHIFT & 0xF
+    integrations = key >> INTEGRATIONS_SHIFT & 0xF
+    return {
+        "auth_needed": bool(key & AUTH_BIT),
+        "payments_needed": bool(key & PAYMENTS_BIT),
+        "ai_features": [o for i, o in enumerate(AI_OPTIONS) if ai >> i & 1],
+        "integrations": [o for i, o in enumerate(INTEGRATION_OPTIONS) if integrations >> i & 1],
+        "content_support": "Need copy" if key & NEED_COPY_BIT else "Have copy",
+    }
+
+
+def _compute(answers: dict, model: CostModel, rules: RiskRules) -> Entry:
+    cost = compute_feature_cost(
+        answers.get("auth_needed", False),
+        answers.get("payments_needed", False),
+        answers.get("ai_features", []),
+        answers.get("integrations", []),
+        answers.get("content_support", ""),
+        model=model,
+    )
+    return Entry(cost, derive_indicators(answers, cost, rules))
+
+
+# ──────────────────────────────────────────────────────────────
+# Table
+# ──────────────────────────────────────────────────────────────
+@lru_cache(maxsize=4)
+def get_table(model: CostModel = COST_MODEL, rules: RiskRules = RISK_RULES) -> Tuple[Entry, ...]:
+    """Every answer combination, indexed by answer_key.
+
+    Cached per (model, rules); both are frozen dataclasses, so a change to
+    any cost or risk rule produces a new key and the table is rebuilt.
+    """
+    return tuple(_compute(decode_key(k), model, rules) for k in range(KEY_SPACE))
+
+
+def lookup(answers: dict, model: CostModel = COST_MODEL, rules: RiskRules = RISK_RULES) -> Entry:
+    """O(1) cost + indicators for an answer set (computed directly if off-menu)."""
+    key = answer_key(answers)
+    if key is None:
+        return _compute(answers, model, rules)
+    return get_table(model, rules)[key]
+
+
+# ──────────────────────────────────────────────────────────────
+# What-if deltas
+# ──────────────────────────────────────────────────────────────
+def _toggles() -> List[Tuple[str, int]]:
+    toggles = [("Auth", AUTH_BIT), ("Payments", PAYMENTS_BIT)]
+    toggles += [(f"AI: {o}", 1 << (AI_SHIFT + i)) for i, o in enumerate(AI_OPTIONS)]
+    toggles += [(f"Integration: {o}", 1 << (INTEGRATIONS_SHIFT + i)) for i, o in enumerate(INTEGRATION_OPTIONS)]
+    toggles.append(("Need copy", NEED_COPY_BIT))
+    return toggles
+
+
+TOGGLES = _toggles()
+
+
+def what_if(answers: dict, model: CostModel = COST_MODEL, rules: RiskRules = RISK_RULES) -> List[dict]:
+    """Cost/risk change from flipping each option, read straight from the table."""
+    key = answer_key(answers)
+    if key is None:
+        return []
+    table = get_table(model, rules)
+    current = table[key]
+    rows = []
+    for label, bit in TOGGLES:
+        alt = table[key ^ bit]
+        rows.append({
+            "option": label,
+            "selected": bool(key & bit),
+            "cost_delta": alt.cost["total"] - current.cost["total"],
+            "risk_from": current.indicators["risk_level"],
+            "risk_to": alt.indicators["risk_level"],
+        })
+    return rows
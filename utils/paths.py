@@ -0,0 +1,17 @@
+"""Data locations shared by the app, the pages, the API and the cockpit tooling.
+
+Plain constants only: importing this module touches nothing on disk. Writers
+create the directories they need on first write.
+"""
+from pathlib import Path
+
+DATA_DIR = Path("data")
+COCKPIT_DIR = DATA_DIR / "cockpit"
+UPLOADS_DIR = DATA_DIR / "uploads"
+QR_DIR = DATA_DIR / "qr"  # content-addressed QR image cache (utils/qr.py)
+DRAFTS_DB = DATA_DIR / "drafts.db"  # resumable Wizard drafts (utils/drafts.py)
+
+LOG_EVENTS = COCKPIT_DIR / "events.jsonl"
+LOG_DREAM = COCKPIT_DIR / "dream_landing.jsonl"
+LOG_MILKBOT = COCKPIT_DIR / "milkbot_chat.jsonl"
+LOG_PERF = COCKPIT_DIR / "perf.jsonl"  # batched span histograms (utils/spans.py)
@@ -0,0 +1,281 @@
+"""Prompt -> response cache for Milkbot and AI Assist.
+
+    cache = get_prompt_cache()
+    stream = ChatStream(messages, cache=cache)   # hits replay the stored reply
+
+Keys are the SHA-256 of the model, the call parameters, the normalized
+system prompt and the last PROMPT_CACHE_WINDOW non-system messages
+(default 2: the previous assistant reply and the new user message), so
+"What do I need for a booking site?" and "what do i need for a booking
+site" share an entry, while follow-ups only hit in the same context.
+Text is normalized by case-folding, collapsing whitespace and dropping
+trailing punctuation.
+
+- tier 1: in-process LRU (PROMPT_CACHE_MEMORY_ITEMS, default 512)
+- tier 2: SQLite at PROMPT_CACHE_DB (default data/cockpit/prompt_cache.db),
+  entries expire after PROMPT_CACHE_TTL seconds (default 7 days) and the
+  least recently used beyond PROMPT_CACHE_MAX_ROWS (default 10,000) are
+  evicted; PROMPT_CACHE=0 disables the cache
+
+Warm it from past conversations with:
+
+    python -m utils.prompt_cache warm data/cockpit/milkbot_chat.jsonl
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from utils.paths import COCKPIT_DIR
+
+CACHE_PATH = Path(os.getenv("PROMPT_CACHE_DB", str(COCKPIT_DIR / "prompt_cache.db")))
+ENABLED = os.getenv("PROMPT_CACHE", "1") != "0"
+WINDOW = int(os.getenv("PROMPT_CACHE_WINDOW", "2"))
+MEMORY_ITEMS = int(os.getenv("PROMPT_CACHE_MEMORY_ITEMS", "512"))
+TTL = float(os.getenv("PROMPT_CACHE_TTL", str(7 * 24 * 3600)))
+MAX_ROWS = int(os.getenv("PROMPT_CACHE_MAX_ROWS", "10000"))
+EVICT_EVERY = 100  # puts between eviction passes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key      TEXT PRIMARY KEY,
+    model    TEXT,
+    prompt   TEXT,
+    response TEXT NOT NULL,
+    created  REAL NOT NULL,
+    last_hit REAL NOT NULL,
+    hits     INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_responses_created ON responses (created);
+CREATE INDEX IF NOT EXISTS idx_responses_last_hit ON responses (last_hit);
+"""
+
+_WS = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    return _WS.sub(" ", str(text or "")).strip().casefold().rstrip(" ?!.")
+
+
+def prompt_key(messages: List[Dict[str, str]], model: str, window: int = WINDOW, **params) -> str:
+    system = [normalize(m.get("content")) for m in messages if m.get("role") == "system"]
+    recent = [(m.get("role"), normalize(m.get("content"))) for m in messages if m.get("role") != "system"]
+    recent = recent[-window:] if window > 0 else recent
+    blob = json.dumps([model, sorted(params.items()), system, recent], ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class CachedReply(NamedTuple):
+    text: str
+    tier: str  # "memory" | "disk"
+
+
+class PromptCache:
+    def __init__(self, path: Path | str | None = CACHE_PATH, memory_items: int = MEMORY_ITEMS,
+                 ttl: float = TTL, max_rows: int = MAX_ROWS, window: int = WINDOW):
+        self.path = Path(path) if path else None
+        self.memory_items = memory_items
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.window = window
+        self._memory: "OrderedDict[str, tuple[str, float]]" = OrderedDict()  # key -> (response, created)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._puts = 0
+        self.stats: Dict[str, int] = {"memory": 0, "disk": 0, "miss": 0, "stored": 0, "evicted": 0}
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._conn() as conn:
+                conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def key(self, messages: List[Dict[str, str]], model: str, **params) -> str:
+        return prompt_key(messages, model, self.window, **params)
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        hits = self.stats["memory"] + self.stats["disk"]
+        total = hits + self.stats["miss"]
+        return hits / total if total else None
+
+    def counters(self) -> Dict[str, float]:
+        rate = self.hit_rate
+        return {**self.stats, "hit_rate": round(rate, 3) if rate is not None else None}
+
+    # ── reads ──
+    def get(self, key: str) -> Optional[CachedReply]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[1] < self.ttl:
+                    self._memory.move_to_end(key)
+                    self.stats["memory"] += 1
+                    return CachedReply(entry[0], "memory")
+                del self._memory[key]
+        row = None
+        if self.path:
+            with self._conn() as conn:
+                row = conn.execute("SELECT response, created FROM responses WHERE key = ? AND created > ?",
+                                   (key, now - self.ttl)).fetchone()
+                if row:
+                    conn.execute("UPDATE responses SET hits = hits + 1, last_hit = ? WHERE key = ?", (now, key))
+        with self._lock:
+            if row is None:
+                self.stats["miss"] += 1
+                return None
+            self.stats["disk"] += 1
+        self._remember(key, row[0], row[1])
+        return CachedReply(row[0], "disk")
+
+    # ── writes ──
+    def put(self, key: str, response: str, model: str = "", prompt: str = ""):
+        created = time.time()
+        self._remember(key, response, created)
+        with self._lock:
+            self.stats["stored"] += 1
+            self._puts += 1
+            evict = self._puts % EVICT_EVERY == 0
+        if self.path:
+            with self._conn() as conn:
+                conn.execute("INSERT OR REPLACE INTO responses (key, model, prompt, response, created, last_hit, hits) "
+                             "VALUES (?, ?, ?, ?, ?, ?, 0)", (key, model, prompt, response, created, created))
+            if evict:
+                self.evict()
+
+    def _remember(self, key: str, response: str, created: float):
+        with self._lock:
+            self._memory[key] = (response, created)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Drop expired rows, then the least recently used beyond max_rows."""
+        if not self.path:
+            return 0
+        now = now or time.time()
+        with self._conn() as conn:
+            n = conn.execute("DELETE FROM responses WHERE created <= ?", (now - self.ttl,)).rowcount
+            n += conn.execute("DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                              "ORDER BY last_hit DESC LIMIT -1 OFFSET ?)", (self.max_rows,)).rowcount
+        with self._lock:
+            self.stats["evicted"] += n
+        return n
+
+    def count(self) -> int:
+        if not self.path:
+            return len(self._memory)
+        return self._conn().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    # ── warm-up ──
+    def warm(self, path: Path | str, model: str, system_prompt: str, greeting: Optional[str] = None,
+             skip: Iterable[str] = (), gap: float = 1800, **params) -> int:
+        """Replay a Milkbot log: store each user.msg with the assistant.msg that answered it.
+
+        Conversations are rebuilt per `session`, starting from `greeting`;
+        older lines without a session start a new conversation after a
+        `gap`-second pause. Replies in `skip` (offline notices,
+        placeholders) and turns whose ai.stream event reported an error are
+        not stored. Warmed entries count as fresh: the TTL runs from now.
+        """
+        from utils.events import decode
+        from utils.rotation import parse_ts
+
+        def start() -> List[Dict[str, str]]:
+            return [{"role": "system", "content": system_prompt}] + (
+                [{"role": "assistant", "content": greeting}] if greeting else [])
+
+        skip = tuple(skip)
+        threads: Dict[Optional[str], List[Dict[str, str]]] = {}
+        pending: Dict[Optional[str], Optional[List[Dict[str, str]]]] = {}
+        last_seen: Optional[float] = None  # for session-less lines
+        stored = 0
+        with open(path, "rb") as f:
+            for line in f:
+                evt = decode(line) if line.strip() else None
+                if evt is None:
+                    continue
+                sid = evt.session
+                if sid is None:
+                    ts = parse_ts(evt.ts) if evt.ts else None
+                    if ts is not None:
+                        if last_seen is not None and ts.timestamp() - last_seen > gap:
+                            threads.pop(None, None)
+                            pending.pop(None, None)
+                        last_seen = ts.timestamp()
+                thread = threads.setdefault(sid, start())
+                msg = str((evt.payload or {}).get("msg", ""))
+                if evt.event == "user.msg":
+                    thread.append({"role": "user", "content": msg})
+                    pending[sid] = list(thread)
+                elif evt.event == "ai.stream" and (evt.payload or {}).get("error"):
+                    pending[sid] = None
+                elif evt.event == "assistant.msg":
+                    asked = pending.pop(sid, None)
+                    thread.append({"role": "assistant", "content": msg})
+                    if asked is None or not msg.strip() or msg.startswith(skip):
+                        continue
+                    self.put(self.key(asked, model, **params), msg, model, asked[-1]["content"])
+                    stored += 1
+        self.evict()
+        return stored
+
+
+_cache: Optional[PromptCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_prompt_cache() -> Optional[PromptCache]:
+    """Process-wide cache, or None when PROMPT_CACHE=0."""
+    global _cache
+    if not ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PromptCache()
+    return _cache
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m utils.prompt_cache")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    warm = sub.add_parser("warm", help="replay Milkbot logs into the cache")
+    warm.add_argument("paths", nargs="+")
+    warm.add_argument("--db", default=str(CACHE_PATH))
+    warm.add_argument("--model", default="gpt-4o-mini")
+    warm.add_argument("--temperature", type=float, default=0.4, help="must match the live call (Milkbot: 0.4)")
+    stats = sub.add_parser("stats", help="entry count; evicts expired rows first")
+    stats.add_argument("--db", default=str(CACHE_PATH))
+    args = parser.parse_args(argv)
+
+    cache = PromptCache(args.db)
+    if args.cmd == "warm":
+        from utils.milkbot import GREETING, OFFLINE_REPLY, SYSTEM_PROMPT
+        for p in args.paths:
+            n = cache.warm(p, args.model, SYSTEM_PROMPT, GREETING, skip=(OFFLINE_REPLY, "…"),
+                           temperature=args.temperature)
+            print(f"{p}: {n:,} replies stored")
+    else:
+        print(f"{cache.evict():,} rows evicted")
+    print(f"{cache.path}: {cache.count():,} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""QR rendering with a two-tier, content-addressed cache.
+
+    render_qr(text, "svg")   -> QRImage(key, fmt, data)
+
+Images are keyed by the SHA-256 of the encoded payload (plus the render
+settings), so identical summaries map to the same image across reruns,
+sessions and processes:
+
+- tier 1: in-process LRU (QR_MEMORY_ITEMS, default 256 images)
+- tier 2: files under data/qr/<key>.<ext>, written atomically and shared
+  by every worker; QR_DISK_CACHE=0 disables it. QR_DISK_ITEMS (default
+  4096) bounds it: a put that goes over prunes the least recently used
+  files (by mtime, refreshed on disk hits) down to 90% of the bound
+
+"svg" draws the module matrix straight into one <path> (no PIL drawing or
+PNG encoding, and no Pillow needed); "png" renders through PIL as before.
+"""
+import base64
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from utils.lazy import available, lazy_import
+from utils.paths import QR_DIR
+from utils.spans import span
+
+qrcode = lazy_import("qrcode")
+
+FORMATS = {"svg": "image/svg+xml", "png": "image/png"}
+MEMORY_ITEMS = int(os.getenv("QR_MEMORY_ITEMS", "256"))
+DISK_ITEMS = int(os.getenv("QR_DISK_ITEMS", "4096"))
+DISK_CACHE = os.getenv("QR_DISK_CACHE", "1") != "0"
+
+# qrcode defaults (ERROR_CORRECT_M, 10 px per module, 4-module quiet zone)
+BOX_SIZE = 10
+BORDER = 4
+
+
+class QRImage(NamedTuple):
+    key: str
+    fmt: str
+    data: bytes
+
+    @property
+    def mime(self) -> str:
+        return FORMATS[self.fmt]
+
+    @property
+    def filename(self) -> str:
+        return f"{self.key}.{self.fmt}"
+
+    def data_uri(self) -> str:
+        return f"data:{self.mime};base64,{base64.b64encode(self.data).decode()}"
+
+
+def qr_available(fmt: str = "png") -> bool:
+    return available("qrcode") and (fmt == "svg" or available("PIL"))
+
+
+def qr_key(payload: str | bytes, fmt: str) -> str:
+    """Content address: SHA-256 of the encoded payload and the render settings."""
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    h = hashlib.sha256(f"{fmt}:{BOX_SIZE}:{BORDER}\n".encode())
+    h.update(payload)
+    return h.hexdigest()
+
+
+# ──────────────────────────────────────────────────────────────
+# Renderers
+# ──────────────────────────────────────────────────────────────
+def _matrix(payload: str | bytes):
+    qr = qrcode.QRCode(box_size=BOX_SIZE, border=BORDER)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    return qr.get_matrix()  # includes the border
+
+
+def render_svg(payload: str | bytes) -> bytes:
+    matrix = _matrix(payload)
+    size = len(matrix)
+    parts = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < size:
+            if not row[x]:
+                x += 1
+                continue
+            run = x
+            while run < size and row[run]:
+                run += 1
+            parts.append(f"M{x} {y}h{run - x}v1h-{run - x}z")
+            x = run
+    px = size * BOX_SIZE
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{px}" height="{px}" viewBox="0 0 {size} {size}" '
+        f'shape-rendering="crispEdges"><rect width="{size}" height="{size}" fill="#fff"/>'
+        f'<path fill="#000" d="{"".join(parts)}"/></svg>'
+    ).encode("ascii")
+
+
+def render_png(payload: str | bytes) -> bytes:
+    from io import BytesIO
+    img = qrcode.make(payload, box_size=BOX_SIZE, border=BORDER)
+    buf = BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+RENDERERS = {"svg": render_svg, "png": render_png}
+
+
+# ──────────────────────────────────────────────────────────────
+# Cache
+# ──────────────────────────────────────────────────────────────
+class QRCache:
+    def __init__(self, directory: Path | str | None = QR_DIR, memory_items: int = MEMORY_ITEMS,
+                 disk_items: int = DISK_ITEMS):
+        self.directory = Path(directory) if directory else None
+        self.memory_items = memory_items
+        self.disk_items = disk_items
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_count: Optional[int] = None  # files on disk, counted on the first put
+        self.stats: Dict[str, int] = {"memory": 0, "disk": 0, "rendered": 0, "pruned": 0}
+
+    def _path(self, key: str, fmt: str) -> Optional[Path]:
+        return self.directory / f"{key}.{fmt}" if self.directory else None
+
+    def get(self, key: str, fmt: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory"] += 1
+                return data
+        path = self._path(key, fmt)
+        if path is None:
+            return None
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)  # recency for pruning
+        except OSError:
+            pass
+        self._remember(key, data)
+        with self._lock:
+            self.stats["disk"] += 1
+        return data
+
+    def put(self, key: str, fmt: str, data: bytes):
+        self._remember(key, data)
+        path = self._path(key, fmt)
+        if path is None or path.exists():
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:
+            return  # the disk tier is best-effort
+        with self._lock:
+            if self._disk_count is not None:
+                self._disk_count += 1
+            if self._disk_count is not None and self._disk_count <= self.disk_items:
+                return
+        self._prune()
+
+    def _prune(self):
+        """Drop the least recently used files once the disk tier is over disk_items.
+
+        The directory is shared by every worker, so the count kept here is only
+        a trigger; the scan below recounts what is actually on disk."""
+        files = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.rpartition(".")[2] in FORMATS:
+                        try:
+                            files.append((entry.stat().st_mtime, entry.path))
+                        except FileNotFoundError:
+                            pass  # pruned by another worker
+        except OSError:
+            return
+        removed = 0
+        if len(files) > self.disk_items:
+            files.sort()
+            for _, path in files[: len(files) - int(self.disk_items * 0.9)]:
+                try:
+                    os.unlink(path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        with self._lock:
+            self._disk_count = len(files) - removed
+            self.stats["pruned"] += removed
+
+    def _remember(self, key: str, data: bytes):
+        with self._lock:
+            self._memory[key] = data
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def render(self, payload: str | bytes, fmt: str = "svg") -> QRImage:
+        if fmt not in RENDERERS:
+            raise ValueError(f"fmt must be one of {tuple(RENDERERS)}, got {fmt!r}")
+        key = qr_key(payload, fmt)
+        data = self.get(key, fmt)
+        if data is None:
+            data = RENDERERS[fmt](payload)
+            with self._lock:
+                self.stats["rendered"] += 1
+            self.put(key, fmt, data)
+        return QRImage(key, fmt, data)
+
+    def load(self, filename: str) -> Optional[QRImage]:
+        """Look up an image by its content-addressed file name ("<key>.<fmt>")."""
+        key, _, fmt = filename.partition(".")
+        if fmt not in FORMATS or len(key) != 64 or any(c not in "0123456789abcdef" for c in key):
+            return None
+        data = self.get(key, fmt)
+        return QRImage(key, fmt, data) if data is not None else None
+
+
+_cache: Optional[QRCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_qr_cache() -> QRCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = QRCache(QR_DIR if DISK_CACHE else None)
+    return _cache
+
+
+@span("qr.render")
+def render_qr(payload: str | bytes, fmt: str = "svg") -> QRImage:
+    """Cached QR image for `payload` ("svg" or "png")."""
+    return get_qr_cache().render(payload, fmt)
@@ -0,0 +1,270 @@
+"""Incremental cockpit rollups.
+
+RollupEngine folds new cockpit events into three aggregates and checkpoints
+how far it has read in every log, so each refresh only parses what was
+appended (or rotated into a segment) since the last one:
+
+- hourly: event counts per name per UTC hour
+- costs:  per-day histogram of estimated costs from submit_wizard and
+          indicator states (exact percentiles, bounded size)
+- risk:   per-day indicator-state risk-level distribution
+
+Indicator states come from `indicator.update` snapshots and from
+`indicator.delta` records applied to their session's last state
+(utils.coalescer), which is kept in the checkpoint for the most recent
+MAX_SESSIONS sessions.
+"""
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.coalescer import DELTA_EVENT, SNAPSHOT_EVENT, apply_delta
+from utils.estimator import compute_feature_cost
+from utils.events import decode
+from utils.paths import COCKPIT_DIR, LOG_DREAM, LOG_EVENTS
+from utils.rotation import load_manifest, read_segment, rotation_in_progress
+
+CHECKPOINT_PATH = COCKPIT_DIR / "rollups.json"
+DEFAULT_LOGS = (LOG_EVENTS, LOG_DREAM)
+COST_EVENTS = ("submit_wizard", "indicator.update")
+READ_CHUNK = 8 * 1024 * 1024
+MAX_SESSIONS = 2000  # indicator states kept for applying deltas
+
+
+def _event_cost(name: str, payload: dict) -> Optional[float]:
+    if name == "indicator.update":
+        cost = payload.get("estimated_cost")
+    elif "est_cost" in payload:
+        cost = payload.get("est_cost")
+    elif "auth" in payload or "ai" in payload:
+        # older submit_wizard records carry the answers, not the price
+        cost = compute_feature_cost(payload.get("auth"), payload.get("payments"), payload.get("ai") or [],
+                                    payload.get("integrations") or [], payload.get("content"))["total"]
+    else:
+        cost = None
+    return float(cost) if isinstance(cost, (int, float)) else None
+
+
+def _merge(target: dict, counts: pd.Series):
+    """Add a (key1, key2, ...) -> n Series into nested dicts."""
+    for keys, n in counts.items():
+        keys = keys if isinstance(keys, tuple) else (keys,)
+        node = target
+        for k in keys[:-1]:
+            node = node.setdefault(str(k), {})
+        node[str(keys[-1])] = node.get(str(keys[-1]), 0) + int(n)
+
+
+def weighted_percentiles(hist: Dict[str, int], qs: Iterable[float]) -> Dict[str, Optional[float]]:
+    """Percentiles of a {value: count} histogram."""
+    if not hist:
+        return {f"p{int(q * 100)}": None for q in qs}
+    values = np.array([float(v) for v in hist], dtype=float)
+    counts = np.array(list(hist.values()), dtype=np.int64)
+    order = np.argsort(values)
+    values, cum = values[order], np.cumsum(counts[order])
+    total = cum[-1]
+    return {f"p{int(q * 100)}": float(values[np.searchsorted(cum, q * total, side="left")]) for q in qs}
+
+
+class RollupEngine:
+    def __init__(self, logs: Iterable[Path | str] = DEFAULT_LOGS, checkpoint: Path | str = CHECKPOINT_PATH):
+        self.logs = [Path(p) for p in logs]
+        self.checkpoint = Path(checkpoint)
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self.state = self._empty()
+        self._load()
+
+    @staticmethod
+    def _empty() -> dict:
+        return {"version": 1, "sources": {}, "hourly": {}, "costs": {}, "risk": {}, "events": 0, "indicators": {}}
+
+    # ── checkpoint ──
+    def _load(self):
+        try:
+            self.state = json.loads(self.checkpoint.read_text(encoding="utf-8"))
+            self._mtime = self.checkpoint.stat().st_mtime
+        except (OSError, json.JSONDecodeError):
+            self.state = self._empty()
+
+    def _save(self):
+        self.checkpoint.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.checkpoint.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.state), encoding="utf-8")
+        os.replace(tmp, self.checkpoint)
+        self._mtime = self.checkpoint.stat().st_mtime
+
+    def reset(self):
+        with self._lock:
+            self.state = self._empty()
+            self._save()
+
+    # ── ingestion ──
+    def _fold(self, lines: List[bytes]) -> int:
+        """Aggregate a batch of raw lines column-wise."""
+        rows = []
+        for line in lines:
+            evt = decode(line)
+            if evt is None:
+                continue
+            kind, payload = evt.event, evt.payload
+            if kind in (SNAPSHOT_EVENT, DELTA_EVENT):
+                kind, payload = SNAPSHOT_EVENT, self._indicator_state(evt)
+            cost = _event_cost(kind, payload) if kind in COST_EVENTS else None
+            risk = payload.get("risk_level") if kind == SNAPSHOT_EVENT else None
+            rows.append((evt.ts, evt.event, kind, cost, risk))
+        if not rows:
+            return 0
+
+        df = pd.DataFrame(rows, columns=["ts", "name", "kind", "cost", "risk"])
+        ts = pd.to_datetime(df["ts"], utc=True, errors="coerce", format="ISO8601")
+        df = df[ts.notna()].assign(hour=ts.dt.strftime("%Y-%m-%dT%H"), day=ts.dt.strftime("%Y-%m-%d"))
+
+        _merge(self.state["hourly"], df.groupby(["hour", "name"]).size())
+        priced = df.dropna(subset=["cost"])
+        if not priced.empty:
+            _merge(self.state["costs"], priced.groupby(["day", "kind", "cost"]).size())
+        risked = df.dropna(subset=["risk"])
+        if not risked.empty:
+            _merge(self.state["risk"], risked.groupby(["day", "risk"]).size())
+        self.state["events"] += len(df)
+        return len(df)
+
+    def _indicator_state(self, evt) -> dict:
+        """Full indicator state after a snapshot/delta, tracked per session."""
+        sessions = self.state.setdefault("indicators", {})
+        base = sessions.pop(evt.session, None) if evt.event == DELTA_EVENT else None
+        state = apply_delta(base, evt.payload)
+        if evt.session is not None:
+            sessions.pop(evt.session, None)
+            sessions[evt.session] = state  # re-inserted: dict order doubles as recency
+            if len(sessions) > MAX_SESSIONS:
+                del sessions[next(iter(sessions))]
+        return state
+
+    def _ingest_log(self, path: Path) -> int:
+        src = self.state["sources"].setdefault(
+            str(path), {"inode": None, "offset": 0, "lines": 0, "skip": 0, "segments": []})
+        added = 0
+        if rotation_in_progress(path):
+            return added
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            st = None
+
+        new_segments = [seg for seg in load_manifest(path) if seg["file"] not in src["segments"]]
+        if new_segments and src["inode"] is not None:
+            # the file we were reading was rotated (the new active file may
+            # even reuse its inode); the first new segment starts with lines
+            # we have already counted
+            src["skip"], src["inode"], src["offset"], src["lines"] = src["lines"], None, 0, 0
+        elif st is not None and (st.st_ino != src["inode"] or st.st_size < src["offset"]):
+            # replaced or truncated in place
+            src["offset"], src["lines"] = 0, 0
+
+        for seg in new_segments:
+            lines = read_segment(path, seg)[src["skip"]:]
+            src["skip"] = 0
+            added += self._fold(lines)
+            src["segments"].append(seg["file"])
+
+        if st is None:
+            return added
+        src["inode"] = st.st_ino
+
+        with path.open("rb") as f:
+            f.seek(src["offset"])
+            while src["offset"] < st.st_size:
+                data = f.read(min(READ_CHUNK, st.st_size - src["offset"]))
+                cut = data.rfind(b"\n") + 1
+                if cut == 0:
+                    break
+                lines = [line for line in data[:cut].split(b"\n") if line.strip()]
+                added += self._fold(lines)
+                src["offset"] += cut
+                src["lines"] += len(lines)
+                f.seek(src["offset"])
+        return added
+
+    def refresh(self) -> int:
+        """Process everything appended since the last checkpoint. Returns events added."""
+        with self._lock:
+            try:
+                if self.checkpoint.stat().st_mtime != self._mtime:
+                    # another process advanced the checkpoint
+                    self._load()
+            except FileNotFoundError:
+                pass
+            added = sum(self._ingest_log(p) for p in self.logs)
+            self._save()
+            return added
+
+    # ── queries ──
+    def summary(self, days: int = 7, now: Optional[datetime] = None) -> dict:
+        now = now or datetime.now(timezone.utc)
+        today = now.strftime("%Y-%m-%d")
+        window = {(now - timedelta(days=d)).strftime("%Y-%m-%d") for d in range(days)}
+
+        def hist(name: str, day_filter) -> Dict[str, int]:
+            out: Dict[str, int] = {}
+            for day, by_name in self.state["costs"].items():
+                if day_filter(day):
+                    for value, n in by_name.get(name, {}).items():
+                        out[value] = out.get(value, 0) + n
+            return out
+
+        risk: Dict[str, int] = {}
+        for day, levels in self.state["risk"].items():
+            if day in window:
+                for level, n in levels.items():
+                    risk[level] = risk.get(level, 0) + n
+
+        return {
+            "events_processed": self.state["events"],
+            "submissions_today": sum(
+                by_name.get("submit_wizard", 0) for hour, by_name in self.state["hourly"].items()
+                if hour[:10] == today
+            ),
+            "submissions_window": sum(
+                by_name.get("submit_wizard", 0) for hour, by_name in self.state["hourly"].items()
+                if hour[:10] in window
+            ),
+            "cost_percentiles": {
+                name: weighted_percentiles(hist(name, lambda d: d in window), (0.5, 0.9, 0.99))
+                for name in COST_EVENTS
+            },
+            "risk_distribution": risk,
+            "days": days,
+        }
+
+    def hourly_frame(self, days: int = 7, now: Optional[datetime] = None) -> pd.DataFrame:
+        """Counts per hour (rows) and event name (columns) for the last `days`."""
+        now = now or datetime.now(timezone.utc)
+        start = (now - timedelta(days=days)).strftime("%Y-%m-%dT%H")
+        data = {hour: names for hour, names in self.state["hourly"].items() if hour >= start}
+        if not data:
+            return pd.DataFrame()
+        df = pd.DataFrame.from_dict(data, orient="index").fillna(0).astype(int).sort_index()
+        df.index = pd.to_datetime(df.index, format="%Y-%m-%dT%H")
+        return df
+
+
+_engine: Optional[RollupEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> RollupEngine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = RollupEngine()
+    return _engine
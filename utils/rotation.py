@@ -0,0 +1,224 @@
+import gzip
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: rotation is only serialised within the process
+    fcntl = None
+
+# ──────────────────────────────────────────────────────────────
+# Rotation policy
+#   COCKPIT_ROTATE_MB    rotate once the active file reaches this size (0 = off)
+#   COCKPIT_ROTATE_DAYS  rotate once its first event is this old (0 = off)
+# Segments live in <cockpit dir>/segments/<stem>.<seq>.jsonl.gz next to a
+# <stem>.manifest.json listing each segment's time range and event count.
+# The API and the Streamlit app write (and rotate) the same logs, so appends
+# hold a shared flock on segments/<stem>.lock and rotation an exclusive one.
+# ──────────────────────────────────────────────────────────────
+ROTATE_BYTES = int(float(os.getenv("COCKPIT_ROTATE_MB", "64")) * 1024 * 1024)
+ROTATE_AGE = timedelta(days=float(os.getenv("COCKPIT_ROTATE_DAYS", "30")))
+
+_lock = threading.Lock()
+_first_ts: Dict[tuple, Optional[datetime]] = {}
+
+
+def parse_ts(value) -> Optional[datetime]:
+    """Parse a cockpit timestamp ("...Z", "+00:00" or naive UTC)."""
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        try:
+            dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def segments_dir(path: Path) -> Path:
+    return path.parent / "segments"
+
+
+def manifest_path(path: Path) -> Path:
+    return segments_dir(path) / f"{path.stem}.manifest.json"
+
+
+def rotating_path(path: Path) -> Path:
+    return path.with_name(path.name + ".rotating")
+
+
+def rotation_in_progress(path: Path | str) -> bool:
+    """True while a rotated file is waiting to be compressed into its segment."""
+    return rotating_path(Path(path)).exists()
+
+
+def load_manifest(path: Path | str) -> List[dict]:
+    """Segments for a log, oldest first."""
+    mf = manifest_path(Path(path))
+    if not mf.exists():
+        return []
+    try:
+        return json.loads(mf.read_text(encoding="utf-8")).get("segments", [])
+    except (OSError, json.JSONDecodeError):
+        return []
+
+
+def _save_manifest(path: Path, segments: List[dict]):
+    mf = manifest_path(path)
+    tmp = mf.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"log": path.name, "segments": segments}, indent=2), encoding="utf-8")
+    os.replace(tmp, mf)
+
+
+def segment_in_range(seg: dict, since: Optional[datetime], until: Optional[datetime]) -> bool:
+    first, last = parse_ts(seg.get("first_ts")), parse_ts(seg.get("last_ts"))
+    if since and last and last < since:
+        return False
+    if until and first and first > until:
+        return False
+    return True
+
+
+def _read_first_ts(path: Path) -> Optional[datetime]:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    return parse_ts(json.loads(line).get("ts"))
+    except (OSError, ValueError, AttributeError):
+        # unreadable, not UTF-8 (UnicodeDecodeError) or not a JSON object
+        pass
+    return None
+
+
+def should_rotate(path: Path, max_bytes: Optional[int] = None, max_age: Optional[timedelta] = None) -> bool:
+    max_bytes = ROTATE_BYTES if max_bytes is None else max_bytes
+    max_age = ROTATE_AGE if max_age is None else max_age
+    try:
+        st = path.stat()
+    except OSError:
+        return False
+    if st.st_size == 0:
+        return False
+    if max_bytes and st.st_size >= max_bytes:
+        return True
+    if max_age:
+        key = (path, st.st_ino)
+        if key not in _first_ts:
+            _first_ts[key] = _read_first_ts(path)
+        if not _is_old(_first_ts[key], max_age):
+            return False
+        # the file may have been rotated by another process and recreated on
+        # the same inode: confirm against its current first line
+        _first_ts[key] = _read_first_ts(path)
+        return _is_old(_first_ts[key], max_age)
+    return False
+
+
+def _is_old(first: Optional[datetime], max_age: timedelta) -> bool:
+    return bool(first and datetime.now(timezone.utc) - first >= max_age)
+
+
+def _compress(src: Path, path: Path, segments: List[dict]) -> dict:
+    """gzip `src` into the next immutable segment and describe it."""
+    seq = (segments[-1]["seq"] + 1) if segments else 1
+    out_dir = segments_dir(path)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    dest = out_dir / f"{path.stem}.{seq:06d}.jsonl.gz"
+    # written under a temp name and moved into place before the manifest is
+    # saved: a crash leaves at most a writable temp file or an unlisted
+    # segment, and both are overwritten when the rotation is retried
+    tmp = dest.with_name(dest.name + ".tmp")
+
+    count, first, last = 0, None, None
+    with src.open("rb") as fin, gzip.open(tmp, "wb") as fout:
+        for line in fin:
+            if not line.strip():
+                continue
+            fout.write(line if line.endswith(b"\n") else line + b"\n")
+            count += 1
+            try:
+                ts = parse_ts(json.loads(line).get("ts"))
+            except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+                ts = None
+            if ts:
+                first = ts if first is None or ts < first else first
+                last = ts if last is None or ts > last else last
+    os.replace(tmp, dest)
+    os.chmod(dest, 0o444)
+    return {
+        "seq": seq,
+        "file": dest.name,
+        "first_ts": first.isoformat() if first else None,
+        "last_ts": last.isoformat() if last else None,
+        "count": count,
+        "bytes": dest.stat().st_size,
+    }
+
+
+def _flock(path: Path, mode: int):
+    lock_file = segments_dir(path) / f"{path.stem}.lock"
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    f = lock_file.open("a")
+    if fcntl is not None:
+        fcntl.flock(f, mode)  # released when the file is closed
+    return f
+
+
+@contextmanager
+def append_lock(path: Path | str):
+    """Hold while appending to a log, so no process renames it mid-write."""
+    with _flock(Path(path), fcntl.LOCK_SH if fcntl else 0):
+        yield
+
+
+@contextmanager
+def _rotation_lock(path: Path):
+    with _lock, _flock(path, fcntl.LOCK_EX if fcntl else 0):
+        yield
+
+
+def _rotate_locked(path: Path) -> Optional[dict]:
+    pending = rotating_path(path)
+    if not pending.exists():
+        if not path.exists() or path.stat().st_size == 0:
+            return None
+        # rename is atomic: new appends start a fresh active file
+        os.replace(path, pending)
+    segments = load_manifest(path)
+    seg = _compress(pending, path, segments)
+    segments.append(seg)
+    _save_manifest(path, segments)
+    pending.unlink()
+    for key in [k for k in _first_ts if k[0] == path]:
+        del _first_ts[key]
+    return seg
+
+
+def rotate(path: Path | str) -> Optional[dict]:
+    """Move the active log aside, compress it into a segment and record it in the manifest."""
+    path = Path(path)
+    with _rotation_lock(path):
+        return _rotate_locked(path)
+
+
+def maybe_rotate(path: Path | str) -> Optional[dict]:
+    path = Path(path)
+    if not (rotating_path(path).exists() or should_rotate(path)):
+        return None
+    with _rotation_lock(path):
+        # another process may have rotated it while we waited for the lock
+        if rotating_path(path).exists() or should_rotate(path):
+            return _rotate_locked(path)
+    return None
+
+
+def read_segment(path: Path | str, seg: dict) -> List[bytes]:
+    """All raw lines of one segment, oldest first."""
+    with gzip.open(segments_dir(Path(path)) / seg["file"], "rb") as f:
+        return [line.rstrip(b"\n") for line in f if line.strip()]
@@ -0,0 +1,279 @@
+"""Sampled timing spans, aggregated in memory and flushed to the cockpit in batches.
+
+    @span("wizard.update_answers")
+    def update_answers(): ...
+
+    with span("cockpit.write"):
+        ...
+
+    observe("api GET /estimate", elapsed_s)   # a duration measured elsewhere
+
+Each span name gets a log-bucketed histogram (about 9% resolution from
+1 µs to 100 s), so p50/p95/p99 come out of at most ~110 counters per span
+whatever the traffic. Spans nested inside a sampled span are always
+recorded, so a sampled rerun is profiled as a whole; an unsampled span
+costs one context-variable lookup and one random().
+
+Every PERF_FLUSH_INTERVAL seconds the counts added since the previous
+flush go to data/cockpit/perf.jsonl as one `perf.spans` event per
+process; load_flushed() merges them back. The Performance page shows both.
+
+    PERF_SAMPLE_RATE      share of root spans recorded (default 0.1; 0 turns spans off)
+    PERF_FLUSH_INTERVAL   seconds between flushes to the cockpit (default 60)
+"""
+import atexit
+import contextvars
+import functools
+import math
+import os
+import random
+import socket
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils.paths import LOG_PERF
+
+SAMPLE_RATE = float(os.getenv("PERF_SAMPLE_RATE", "0.1"))
+FLUSH_INTERVAL = float(os.getenv("PERF_FLUSH_INTERVAL", "60"))
+
+MIN_S = 1e-6
+GROWTH = 2 ** 0.25
+N_BUCKETS = math.ceil(math.log(100 / MIN_S, GROWTH)) + 1  # last bucket: >= 100 s
+_LOG_GROWTH = math.log(GROWTH)
+
+# True inside a sampled span; unset (None) otherwise.
+_sampled: contextvars.ContextVar[Optional[bool]] = contextvars.ContextVar("span_sampled", default=None)
+
+
+def bucket_of(seconds: float) -> int:
+    if seconds <= MIN_S:
+        return 0
+    return min(int(math.log(seconds / MIN_S) / _LOG_GROWTH) + 1, N_BUCKETS - 1)
+
+
+def bucket_mid(index: int) -> float:
+    """Representative value (geometric middle) of a bucket, in seconds."""
+    if index == 0:
+        return MIN_S
+    return MIN_S * GROWTH ** (index - 0.5)
+
+
+class SpanHistogram:
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        i = bucket_of(seconds)
+        self.counts[i] = self.counts.get(i, 0) + 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "SpanHistogram"):
+        for i, n in other.counts.items():
+            self.counts[i] = self.counts.get(i, 0) + n
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for i in sorted(self.counts):
+            seen += self.counts[i]
+            if seen >= rank:
+                return min(bucket_mid(i), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"n": self.count, "sum_s": round(self.sum, 7), "max_s": round(self.max, 7),
+                "b": {str(i): n for i, n in sorted(self.counts.items())}}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "SpanHistogram":
+        h = cls()
+        h.counts = {int(i): int(n) for i, n in (d.get("b") or {}).items()}
+        h.count, h.sum, h.max = int(d.get("n", 0)), float(d.get("sum_s", 0.0)), float(d.get("max_s", 0.0))
+        return h
+
+
+class Profiler:
+    """Per-span histograms for this process: cumulative ones for live display,
+    plus the counts since the last flush for the cockpit."""
+
+    def __init__(self, sample_rate: float = SAMPLE_RATE, flush_interval: float = FLUSH_INTERVAL,
+                 path: Optional[Path] = LOG_PERF):
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.path = path
+        self.process = f"{socket.gethostname()}:{os.getpid()}"
+        self.started = time.time()
+        self._total: Dict[str, SpanHistogram] = {}
+        self._pending: Dict[str, SpanHistogram] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def sampled(self) -> bool:
+        """Whether a span starting now is recorded (nested spans follow a sampled root)."""
+        if _sampled.get():
+            return True
+        return self.sample_rate > 0 and (self.sample_rate >= 1 or random.random() < self.sample_rate)
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            for table in (self._total, self._pending):
+                hist = table.get(name)
+                if hist is None:
+                    hist = table[name] = SpanHistogram()
+                hist.observe(seconds)
+        if self._thread is None and self.path is not None:
+            self._start_flusher()
+
+    def snapshot(self) -> Dict[str, SpanHistogram]:
+        """Cumulative histograms since the process started (copies)."""
+        with self._lock:
+            out = {}
+            for name, hist in self._total.items():
+                out[name] = SpanHistogram()
+                out[name].merge(hist)
+            return out
+
+    def reset(self):
+        with self._lock:
+            self._total.clear()
+            self._pending.clear()
+
+    # ── batched flush ──
+    def _start_flusher(self):
+        from utils.cockpit import get_writer
+        with self._lock:
+            if self._thread is not None:
+                return
+            get_writer()  # register the writer's exit hook before ours, so ours runs first
+            self._thread = threading.Thread(target=self._run, name="span-flusher", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self) -> int:
+        """Append the counts since the last flush as one perf.spans event. Returns spans written."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending or self.path is None:
+            return 0
+        from utils.cockpit import log_event
+        log_event(self.path, "perf.spans", {
+            "process": self.process,
+            "sample_rate": self.sample_rate,
+            "spans": {name: hist.to_dict() for name, hist in pending.items()},
+        })
+        return len(pending)
+
+
+_profiler: Optional[Profiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> Profiler:
+    """Process-wide profiler."""
+    global _profiler
+    if _profiler is None:
+        with _profiler_lock:
+            if _profiler is None:
+                _profiler = Profiler()
+    return _profiler
+
+
+class span:
+    """Time a block (`with span(name):`) or every call of a function (`@span(name)`)."""
+
+    __slots__ = ("name", "_start", "_token")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._start = None
+        self._token = None
+
+    def __enter__(self):
+        if _sampled.get():
+            self._start = time.perf_counter()
+        elif get_profiler().sampled():
+            self._token = _sampled.set(True)
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self._start is not None:
+            get_profiler().record(self.name, time.perf_counter() - self._start)
+            self._start = None
+        if self._token is not None:
+            _sampled.reset(self._token)
+            self._token = None
+        return False
+
+    def __call__(self, fn):
+        name = self.name
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not get_profiler().sampled():
+                return fn(*args, **kwargs)  # unsampled: skip the span object entirely
+            # sampled: mark it so the span below records without rolling again
+            token = _sampled.set(True)
+            try:
+                with span(name):  # a fresh instance per call: safe across threads and recursion
+                    return fn(*args, **kwargs)
+            finally:
+                _sampled.reset(token)
+        return wrapper
+
+
+def observe(name: str, seconds: float):
+    """Record a duration measured elsewhere, subject to the same sampling."""
+    profiler = get_profiler()
+    if profiler.sampled():
+        profiler.record(name, seconds)
+
+
+# ──────────────────────────────────────────────────────────────
+# Reading
+# ──────────────────────────────────────────────────────────────
+def load_flushed(path: Path | str = LOG_PERF, since: Optional[datetime] = None) -> Dict[str, SpanHistogram]:
+    """Merge the perf.spans events flushed by every process (optionally only recent ones)."""
+    from utils.logreader import iter_events_reverse
+    merged: Dict[str, SpanHistogram] = {}
+    if not Path(path).exists():
+        return merged
+    for evt in iter_events_reverse(path, name="perf.spans", since=since):
+        for name, d in (evt["payload"].get("spans") or {}).items():
+            merged.setdefault(name, SpanHistogram()).merge(SpanHistogram.from_dict(d))
+    return merged
+
+
+def summarize(hists: Dict[str, SpanHistogram]) -> List[Dict[str, Any]]:
+    """One row per span (milliseconds), slowest p95 first."""
+    rows = []
+    for name, h in hists.items():
+        if not h.count:
+            continue
+        rows.append({
+            "span": name, "count": h.count,
+            "p50_ms": round(h.percentile(0.50) * 1e3, 4), "p95_ms": round(h.percentile(0.95) * 1e3, 4),
+            "p99_ms": round(h.percentile(0.99) * 1e3, 4), "max_ms": round(h.max * 1e3, 4),
+            "mean_ms": round(h.sum / h.count * 1e3, 4), "total_s": round(h.sum, 3),
+        })
+    return sorted(rows, key=lambda r: r["p95_ms"], reverse=True)